@@ -0,0 +1,68 @@
+"""
+    Memory used by the elements of each ring.
+    Builds N random elements and reports the bytes allocated per element,
+    measured with tracemalloc (the element and everything it owns: boxed
+    coefficients, tuples, ints). Values are chosen outside the interned
+    small constants, so nothing is shared between elements.
+    Usage:
+        python -m benchmarks.memory
+"""
+
+import gc
+import random
+import tracemalloc
+
+from python_alcp.examples.rings import Z, Zi
+from python_alcp.examples.more_rings import Q
+from python_alcp.examples.finite_fields import FiniteField
+
+N = 5000
+DEGREE = 16
+P = 1000003
+
+
+def bytes_per_element(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    elems = [build() for _ in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del elems
+    return (after - before) / N
+
+
+def big():
+    return random.randint(2**20, 2**30)
+
+
+def poly(R, coef):
+    return lambda: R([coef() for _ in range(DEGREE + 1)])
+
+
+def rings():
+    Zp = Z/(P*Z)
+    F = FiniteField(3, [2,1,0,0,1])
+    G = FiniteField(3, [2,1,0,0,1], table=True)
+    ZXY = Z["x"]["y"]
+    return [
+        ("Z", lambda: Z(big())),
+        ("Q", lambda: Q(big(), big())),
+        ("Z[i]", lambda: Zi(big(), big())),
+        (f"Z/{P}Z", lambda: Zp(big())),
+        ("GF(3^4)", lambda: F([random.randrange(3) for _ in range(4)])),
+        ("GF(3^4), Zech", lambda: G.from_log(random.randrange(80))),
+        (f"Z[x], degree {DEGREE}", poly(Z["x"], big)),
+        (f"Q[x], degree {DEGREE}", poly(Q["x"], lambda: Q(big(), big()))),
+        (f"(Z/{P}Z)[x], degree {DEGREE}", poly(Zp["x"], lambda: random.randrange(P))),
+        (f"(Z/2Z)[x], degree {DEGREE}", poly((Z/(2*Z))["x"], lambda: random.randrange(2))),
+        ("Z[x,y], 4 terms", lambda: ZXY([Z(big()) for _ in range(4)],
+            [ZXY.monomial((i, 3-i)) for i in range(4)])),
+    ]
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    print(f"{'ring':<28} {'bytes/element':>14}")
+    for name, build in rings():
+        print(f"{name:<28} {bytes_per_element(build):>14.1f}")
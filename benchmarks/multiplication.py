@@ -0,0 +1,85 @@
+"""
+    Crossover benchmark for the polynomial multiplication algorithms.
+    For each coefficient ring and size n, compares the schoolbook product
+    against one level of Karatsuba (schoolbook below it). The crossover is the
+    first size where Karatsuba wins, and is a good value for
+    multiplication.KARATSUBA_THRESHOLD. The same is done for Toom-3 and NTT
+    on integer coefficients (TOOM3_THRESHOLD and ntt.NTT_THRESHOLD).
+    Usage:
+        python -m benchmarks.multiplication
+"""
+
+import random
+from timeit import timeit
+
+from python_alcp.examples.rings import Z
+from python_alcp.examples.more_rings import Q
+from python_alcp.algorithms.multiplication import (
+        schoolbook_mul,
+        karatsuba_mul,
+        toom3_mul
+)
+from python_alcp.algorithms.ntt import ntt_mul
+
+SIZES = [8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256]
+
+
+def best_time(f, repeat = 3):
+    number = 1
+    while timeit(f, number=number) < 0.05:
+        number *= 2
+    return min(timeit(f, number=number) for _ in range(repeat)) / number
+
+
+def crossover(name, R, coef):
+    print(f"\n{name}")
+    print(f"{'n':>6} {'schoolbook':>12} {'karatsuba':>12}")
+    found = None
+    for n in SIZES:
+        a = [R(coef()) for _ in range(n)]
+        b = [R(coef()) for _ in range(n)]
+        ts = best_time(lambda: schoolbook_mul(a, b, R.zero))
+        tk = best_time(lambda: karatsuba_mul(a, b, R.zero, threshold=n//2+1))
+        print(f"{n:>6} {ts*1000:>10.3f}ms {tk*1000:>10.3f}ms")
+        if found is None and tk < ts:
+            found = n
+    print(f"crossover: {found}")
+
+
+def toom_crossover():
+    print("\nint lists (Z coefficients), Karatsuba vs Toom-3")
+    print(f"{'n':>6} {'karatsuba':>12} {'toom3':>12}")
+    found = None
+    for n in SIZES + [384, 512]:
+        a = [random.randint(-2**32, 2**32) for _ in range(n)]
+        b = [random.randint(-2**32, 2**32) for _ in range(n)]
+        tk = best_time(lambda: karatsuba_mul(a, b, 0))
+        tt = best_time(lambda: toom3_mul(a, b, threshold=n//3+1))
+        print(f"{n:>6} {tk*1000:>10.3f}ms {tt*1000:>10.3f}ms")
+        if found is None and tt < tk:
+            found = n
+    print(f"crossover: {found}")
+
+
+def ntt_crossover():
+    print("\nint lists (Z coefficients), Toom-3 vs NTT")
+    print(f"{'n':>6} {'toom3':>12} {'ntt':>12}")
+    found = None
+    for n in [512, 1024, 2048, 4096, 8192]:
+        a = [random.randint(-2**32, 2**32) for _ in range(n)]
+        b = [random.randint(-2**32, 2**32) for _ in range(n)]
+        tt = best_time(lambda: toom3_mul(a, b), repeat=1)
+        tn = best_time(lambda: ntt_mul(a, b), repeat=1)
+        print(f"{n:>6} {tt*1000:>10.3f}ms {tn*1000:>10.3f}ms")
+        if found is None and tn < tt:
+            found = n
+    print(f"crossover: {found}")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    crossover("Z", Z, lambda: random.randint(-2**32, 2**32))
+    crossover("Q", Q, lambda: (random.randint(-100, 100), random.randint(1, 100)))
+    crossover("Z/pZ, p = 1000003", Z/(1000003*Z), lambda: random.randrange(1000003))
+    toom_crossover()
+    ntt_crossover()
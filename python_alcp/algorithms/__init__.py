@@ -8,5 +8,12 @@ from . import (
     root,
     zx_factorization,
     discrete_log,
-    grobner
+    grobner,
+    multiplication,
+    ntt,
+    fast_division,
+    powmod,
+    linear_algebra,
+    composition,
+    subproduct_tree
 )
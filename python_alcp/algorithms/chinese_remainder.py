@@ -34,9 +34,10 @@ def chinese_remainder(eqs,mods):
     if len(eqs) != len(mods):
         raise Exception('Not a proper equation representation')
     L = len(eqs)
-    for i,j in zip(range(L),range(L)):
-        if i != j and gcd(mods[i].mods[j]) != mods[i].ring.one:
-            raise ValueError('The moduli are not pairwise coprime')
+    for i in range(L):
+        for j in range(i+1, L):
+            if not gcd(mods[i], mods[j]).is_unit():
+                raise ValueError('The moduli are not pairwise coprime')
 
     N = reduce((lambda x,y:x*y), mods)
     r = reduce((lambda x,y:x+y), [eqs[i]*(N//mods[i])*modinv(N//mods[i],mods[i]) for i in range(L)])
@@ -0,0 +1,115 @@
+from math import isqrt
+
+from python_alcp.algorithms.fast_division import ModulusContext
+from python_alcp.algorithms.linear_algebra import FqMatrix
+from python_alcp.structures.polynomials import (
+        GF2PolynomialElement,
+        ModularPolynomialElement
+)
+from python_alcp.utils import external
+
+"""
+    Modular composition g(h) mod f, with the baby step giant step algorithm
+    of Brent and Kung.
+    The powers 1, h, ..., h^(m-1) mod f are computed once. g is cut in blocks
+    of m coefficients, g = sum g_i(y) y^(mi), each g_i(h) is a combination of
+    the powers (all of them together are a single matrix product), and
+    g(h) = sum g_i(h) H^i with H = h^m is evaluated with Horner. That is
+    about m + deg(g)/m products mod f instead of deg(g) for Horner on g.
+    Usage:
+        compose_mod(g, h, f)                # g(h) % f
+        compose_mod_many([g1, g2], h, f)    # [g1(h) % f, g2(h) % f]
+        table = CompositionTable(h, f)      # to compose many times with h
+        table(g)
+"""
+
+
+def _sqrt_ceil(k):
+    return isqrt(k - 1) + 1 if k > 1 else 1
+
+
+@external
+class CompositionTable():
+    """
+        The powers h^i mod f, i < m, to compute g(h) % f for any g.
+        m defaults to about sqrt(deg f), the best choice when g has degree
+        below deg f. ctx can be a ModulusContext of f
+    """
+
+    def __init__(self, h, f, m=None, ctx=None):
+        self.ctx = ctx = ctx if ctx is not None else ModulusContext(f)
+        self.ring = R = ctx.ring
+        self.n = n = f.deg()
+        self.m = m = m if m is not None else _sqrt_ceil(n)
+
+        h = ctx.reduce(h)
+        powers = [ctx.reduce(R.one)]
+        for _ in range(m - 1):
+            powers.append(ctx.mulmod(powers[-1], h))
+        self.powers = powers
+        # Giant step h^m
+        self.giant = ctx.mulmod(powers[-1], h)
+        self._matrix = FqMatrix.from_polynomials(R.coefRing, powers, n)
+
+    def _blocks(self, g):
+        """ g_0, g_1, ... with g = sum g_i(y) y^(mi), deg g_i < m """
+        m, k = self.m, g.deg() + 1
+        if isinstance(g, GF2PolynomialElement):
+            bits, mask = g.bits, (1 << m) - 1
+            return [type(g).from_bits((bits >> i) & mask) for i in range(0, k, m)]
+        if isinstance(g, ModularPolynomialElement):
+            cs = g.ints
+            return [type(g).from_ints(list(cs[i:i+m])) for i in range(0, k, m)]
+        cs = g.coefs
+        return [type(g)(list(cs[i:i+m])) for i in range(0, k, m)]
+
+    def __call__(self, g):
+        """ g(h) % f """
+        return self.compose_many([g])[0]
+
+    def compose_many(self, gs):
+        """ [g(h) % f for g in gs], with one matrix product for all of them """
+        ctx = self.ctx
+        zero = ctx.reduce(self.ring.zero)
+
+        blocks, counts = [], []
+        for g in gs:
+            bs = self._blocks(g)
+            blocks += bs
+            counts.append(len(bs))
+        if not blocks:
+            return [zero] * len(gs)
+
+        A = FqMatrix.from_polynomials(self.ring.coefRing, blocks, self.m)
+        vals = (A * self._matrix).to_polynomials(self.ring)
+
+        res = []
+        i = 0
+        for k in counts:
+            if k == 0:
+                res.append(zero)
+                continue
+            acc = vals[i+k-1]
+            for b in reversed(vals[i:i+k-1]):
+                acc = ctx.mulmod(acc, self.giant) + b
+            res.append(acc)
+            i += k
+        return res
+
+
+@external
+def compose_mod(g, h, f, ctx=None):
+    """
+        g(h) % f, for polynomials over a field. ctx can be a ModulusContext
+        of f, to share it between calls
+    """
+    return CompositionTable(h, f, _sqrt_ceil(g.deg() + 1), ctx)(g)
+
+
+@external
+def compose_mod_many(gs, h, f, ctx=None):
+    """ [g(h) % f for g in gs], sharing the powers of h """
+    # k polynomials of degree < d cost about m + k*d/m products mod f
+    d = max((g.deg() + 1 for g in gs), default=1)
+    m = min(d, _sqrt_ceil(len(gs) * d))
+    return CompositionTable(h, f, m, ctx).compose_many(gs)
@@ -1,29 +1,192 @@
-from math import ceil, sqrt
+from math import ceil, gcd, isqrt
+import random
 
-from python_alcp.utils import external
+from python_alcp.algorithms.chinese_remainder import chinese_remainder
+from python_alcp.examples.rings import Z
+from python_alcp.utils import external, int_modinv, prime_factors
 
-def _incustom(elem, l):
-    for i in range(len(l)):
-        if(l[i]==elem):
-            return True,i
-    return False,-1
+# In Pohlig-Hellman, prime subgroups of at least this order are solved
+# with Pollard's rho instead of baby-step giant-step
+RHO_THRESHOLD = 1 << 32
+
+
+def _key(e):
+    """
+        Canonical hashable representation of an element of a finite ring,
+        so that lookups don't go through the (costly) ring equality
+    """
+    return e if isinstance(e, int) else e.key()
+
+
+def _baby_steps(a, N):
+    """
+        Baby-step table {a^j: j} for j < m = ceil(sqrt(N)), and a^-m.
+        Cached in the ring of a, by base and N
+    """
+    R = a.ring
+    tables = R.__dict__.get("_dl_tables")
+    if tables is None:
+        tables = {}
+        R._dl_tables = tables
+
+    k = (_key(a), N)
+    if k not in tables:
+        m = max(isqrt(N - 1) + 1, 1)
+        table = {}
+        e = R.one
+        for j in range(m):
+            table.setdefault(_key(e), j)
+            e *= a
+        # order of an element divides order of the (multiplicative) group
+        tables[k] = (m, table, a**(N-m))
+    return tables[k]
+
+
+def _bsgs(a, h, N):
+    """ Baby-step giant-step, N is a multiple of the order of a """
+    m, alpha, a_inv_m = _baby_steps(a, N)
 
-""" Returns the discrete logarithm with base a of h using Shanks 
-algorithm (baby-step giant-step)."""
-@external
-def discrete_log(a,h):
-    if a.ring != h.ring:
-        raise ValueError('Both elements must belong to the same ring') 
-    N = a.ring.order()-1 # Order of the multiplicative group
-    m = int(ceil(sqrt(N)))
-    
-    alpha = [a**j for j in range(m)]
-    # order of an element divides order of the (multiplicative) group
-    a_inv_m = a**(N-m)
     g = h
     for i in range(m):
-        found,j = _incustom(g,alpha)
-        if found:
+        j = alpha.get(_key(g))
+        if j is not None:
             return i*m+j
         g *= a_inv_m
     return None
+
+
+def _rho(a, h, n):
+    """
+        Pollard's rho with Floyd's cycle detection, in O(1) memory.
+        n is the order of a, returns x mod n with a^x = h or None
+    """
+    R = a.ring
+    if h == R.one:
+        return 0
+
+    def step(x, u, v):
+        # x = a^u h^v, the next point depends on a partition of the group
+        s = hash(_key(x)) % 3
+        if s == 0:
+            return x*x, 2*u % n, 2*v % n
+        elif s == 1:
+            return x*a, (u + 1) % n, v
+        else:
+            return x*h, u, (v + 1) % n
+
+    for _ in range(20):
+        u, v = random.randrange(n), random.randrange(n)
+        x = a**u * h**v
+        y, uy, vy = x, u, v
+        while True:
+            x, u, v = step(x, u, v)
+            y, uy, vy = step(*step(y, uy, vy))
+            if _key(x) == _key(y):
+                break
+
+        # a^u h^v = a^uy h^vy  =>  (v - vy) log(h) = uy - u  (mod n)
+        b, c = (v - vy) % n, (uy - u) % n
+        d = gcd(b, n)
+        if b == 0 or c % d != 0:
+            continue
+        x0 = c // d * int_modinv(b // d, n // d) % (n // d)
+        for k in range(d):
+            x = x0 + k * (n // d)
+            if a**x == h:
+                return x
+
+    # Only reached in very small groups, where the walk degenerates
+    return _bsgs(a, h, n)
+
+
+def _order_factors(R):
+    """ Factorization of the order of the multiplicative group of R, cached """
+    if "_dl_order_factors" not in R.__dict__:
+        R._dl_order_factors = dict(prime_factors(R.order() - 1))
+    return R._dl_order_factors
+
+
+def _element_order(a, factors):
+    """ Order of a and its factorization, given the factors of a multiple of it """
+    n = 1
+    for q,e in factors.items():
+        n *= q**e
+    res = {}
+    for q,e in factors.items():
+        n //= q**e
+        b = a**n
+        k = 0
+        while b != a.ring.one:
+            b = b**q
+            k += 1
+        n *= q**k
+        if k > 0:
+            res[q] = k
+    return n, res
+
+
+def _pohlig_hellman(a, h, solve):
+    """
+        Pohlig-Hellman reduction to subgroups of prime order, where
+        the logarithms are found with solve(base, target, order).
+        Returns the smallest solution, or None
+    """
+    n, factors = _element_order(a, _order_factors(a.ring))
+    if h**n != a.ring.one:
+        return None
+
+    rems, mods = [], []
+    for q,e in factors.items():
+        # Solve a_q^x = h_q in the subgroup of order q^e, digit by digit
+        a_q = a**(n // q**e)
+        h_q = h**(n // q**e)
+        gamma = a_q**(q**(e-1))
+        a_q_inv = a_q.inverse()
+        x = 0
+        for k in range(e):
+            h_k = (a_q_inv**x * h_q)**(q**(e-1-k))
+            d = solve(gamma, h_k, q)
+            if d is None:
+                return None
+            x += d * q**k
+        rems.append(Z(x))
+        mods.append(Z(q**e))
+
+    if len(mods) == 0:
+        return 0
+    x = (chinese_remainder(rems, mods) % Z(n)).val
+    return x if a**x == h else None
+
+
+""" Returns the discrete logarithm with base a of h.
+The result is the smallest x >= 0 such that a^x = h, or None if h is
+not a power of a.
+
+:method  "bsgs" for Shanks algorithm (baby-step giant-step),
+         "rho" for Pollard's rho,
+         "pohlig_hellman" to split the problem in subgroups of prime
+         order, each solved with BSGS or rho depending on its size,
+         "auto" (default) is pohlig_hellman"""
+@external
+def discrete_log(a,h,method="auto"):
+    if a.ring != h.ring:
+        raise ValueError('Both elements must belong to the same ring') 
+    if h == h.ring.zero:
+        return None
+    N = a.ring.order()-1 # Order of the multiplicative group
+
+    if method == "bsgs":
+        return _bsgs(a, h, N)
+    elif method == "rho":
+        n, _ = _element_order(a, _order_factors(a.ring))
+        if h**n != a.ring.one:
+            return None
+        return _rho(a, h, n)
+    elif method in ("auto", "pohlig_hellman"):
+        def solve(g, t, q):
+            if q < RHO_THRESHOLD:
+                return _bsgs(g, t, q)
+            return _rho(g, t, q)
+        return _pohlig_hellman(a, h, solve)
+    else:
+        raise ValueError(f"Unknown discrete logarithm method {method}")
@@ -1,8 +1,12 @@
 from collections import defaultdict
 import random
-from math import log2
+from math import isqrt, log2
 
+from python_alcp.algorithms.composition import CompositionTable, compose_mod_many
 from python_alcp.algorithms.divisibility import gcd
+from python_alcp.algorithms.fast_division import ModulusContext
+from python_alcp.algorithms.linear_algebra import FqMatrix
+from python_alcp.algorithms.powmod import powmod, frobenius_map, has_frobenius_map
 
 
 def squarefree_decomposition(f):
@@ -46,15 +50,25 @@ def squarefree_decomposition(f):
 
     L2 = list_pow(squarefree_decomposition(g), p)
     result = dict()
-    for k,val in L:
-        if k in L2:
-            result[k] = (val*L2[k]).normal()
-        else:
-            result[k] = (val).normal()
+    for k in set(L) | set(L2):
+        result[k] = (L.get(k, R.one) * L2.get(k, R.one)).normal()
 
     return result
 
 
+def _random_element(F):
+    """ Uniformly random element of the finite field F """
+    p, q = F.char(), F.order()
+    if p == q:
+        return F(random.randrange(p))
+    k = 1
+    while p**k < q:
+        k += 1
+    # Fq is a quotient of (Z/pZ)[x], Zech fields are built over one
+    Quot = getattr(F, "quotient", F)
+    return F(Quot.baseRing([random.randrange(p) for _ in range(k)]))
+
+
 def distinct_degree_factorization(f):
     """
         f must be a squarefree polynomial in Fq[x]
@@ -72,7 +86,7 @@ def distinct_degree_factorization(f):
 
     while d <= g[d].deg()/2 - 1:
         d += 1
-        h.append(h[d-1]**q % g[d-1])
+        h.append(powmod(h[d-1], q, g[d-1]))
         fact = gcd(g[d-1], h[d] - x).normal()
         if fact != R.one:
             result[d] = fact
@@ -84,6 +98,102 @@ def distinct_degree_factorization(f):
     return result
 
 
+def kaltofen_shoup_ddf(f):
+    """
+        Distinct degree factorization of a squarefree polynomial f in Fq[x],
+        with the baby step giant step algorithm of Kaltofen and Shoup.
+        Same result as distinct_degree_factorization, with about sqrt(n)
+        gcds instead of n/2
+    """
+
+    # Baby steps h_i = x^(q^i) mod f for i < l, giant steps
+    # H_j = x^(q^(lj)) mod f. An irreducible factor of degree d in
+    # (l(j-1), lj] divides H_j - h_i for i = lj - d, so it divides the
+    # interval product I_j = prod (H_j - h_i), and one gcd per j finds
+    # all the factors of degree in that interval
+
+    R = f.ring
+    CoefR = R.coefRing      # coefficient ring
+
+    result = defaultdict(lambda: R.one)
+    n = f.deg()
+    if n <= 1:
+        if n == 1:
+            result[1] = f
+        return result
+
+    l = max(1, isqrt(n // 2))
+    q = CoefR.order()
+    # If q < n, x^q mod f is a monomial and the Frobenius matrix is cheap
+    # to build, otherwise it costs n products and composition is faster
+    use_frob = q < n or has_frobenius_map(f)
+    ctx = frobenius_map(f).ctx if use_frob else ModulusContext(f)
+    x = ctx.reduce(R.build([CoefR.zero, CoefR.one]))
+
+    h = [x]
+    if use_frob:
+        frob = frobenius_map(f)
+        for i in range(1, l+1):
+            h.append(frob(h[i-1]))
+    else:
+        # h_(k+i) = h_i(h_k), doubling the known steps with each composition
+        h.append(powmod(x, q, f, ctx))
+        while len(h) <= l:
+            k = len(h) - 1
+            h += compose_mod_many(h[1:min(k, l-k)+1], h[k], f, ctx)
+    H1 = H = h.pop()
+
+    # H_j = H_(j-1)^(q^l) = H_(j-1)(H_1), by modular composition with
+    # the powers of H_1, built on the first giant step that needs them.
+    # There are up to n/2l giant steps, and the table has about
+    # sqrt(n * n/2l) powers to balance its cost with the steps
+    table = None
+    m = min(n, isqrt(n * (n // (2*l))) + 1)
+
+    g = f
+    j = 1
+    # The factors left in g have degree > l(j-1), if deg g < 2(l(j-1)+1)
+    # g is irreducible
+    while g.deg() >= 2*(l*(j-1) + 1):
+        if j > 1:
+            if table is None:
+                table = CompositionTable(H1, f, m, ctx)
+            H = table(H)
+
+        I = R.one
+        for hi in h:
+            I = ctx.mulmod(I, H - hi)
+        F = gcd(g, I).normal()
+
+        if F != R.one:
+            g = g // F
+            # Fine step, smallest degrees first, so each gcd only takes the
+            # factors of degree exactly lj - i
+            for i in reversed(range(l)):
+                if F.deg() == 0:
+                    break
+                fact = gcd(F, (H - h[i]) % F).normal()
+                if fact != R.one:
+                    result[l*j - i] = fact
+                    F = F // fact
+
+        j += 1
+
+    if g.deg() > 0:
+        result[g.deg()] = g.normal()
+
+    return result
+
+
+DDF_STRATEGIES = {
+    "naive": distinct_degree_factorization,
+    "kaltofen_shoup": kaltofen_shoup_ddf
+}
+
+# multistage_factorization uses Kaltofen-Shoup from this degree on
+KALTOFEN_SHOUP_THRESHOLD = 64
+
+
 def berlekamp_splitting(f, hs):
     """
         f must be squarefree and monic
@@ -125,8 +235,8 @@ def ker_phi_basis(f):
     """
 
     # Implements Remark 2.3.22
-    # Computes the matrix of Phi_f and then applies
-    # gaussian elimination to find independent zeroes of Phi_f
+    # Computes the matrix of Phi_f and then finds its
+    # kernel with the linear algebra over Fq
 
 
     # R = ring of coefficients, RX = polynomial ring
@@ -134,28 +244,13 @@ def ker_phi_basis(f):
     RX = f.ring
 
     d = f.deg()
-    q = R.order()
-
-    x = RX.build([R.zero,R.one])
 
-    # B is a basis of R, M is the matrix of Phi_f in that basis
-    # Initialize B as the standard basis and M accordingly
-    B = [[R.zero]*i + [R.one] + [R.zero]*(d-1-i) for i in range(d)]
-    M = [list(((x**(i*q) - x**i) % f).coefs) for i in range(d)]
-
-    # M is build as a vector of polynomials, so we need
-    # to add leading zero coefficients if the degree is
-    # not high enough
-    for i in range(d):
-        if len(M[i]) < d:
-            M[i] += [R.zero] * (d-len(M[i]))
-
-    # Modifies B and M in-place
-    _gaussian_elimination(B,M,R)
-
-    # If M[i] = 0, then Phi_f(B[i]) = 0
-    zeros = [i for i in range(d) if M[i] == [R.zero]*d]
-    return [RX.build(B[i]) for i in zeros]
+    # Row i of Q is x^(iq) mod f, each row is the previous one times
+    # x^q mod f (see FrobeniusMap). The matrix of Phi_f is Q - I, acting on
+    # row vectors, so the kernel is the nullspace of its transpose
+    Q = FqMatrix.from_polynomials(R, frobenius_map(f).rows, d)
+    M = (Q - FqMatrix.identity(R, d)).transpose()
+    return M.nullspace().to_polynomials(RX)
 
 
 def berlekamp_factorization(f):
@@ -206,12 +301,19 @@ def berlekamp_cantor_zassenhaus(f):
     
     # There is one operation which is different in characteristic 2
     if q % 2 == 0:
+        # Trace of Fq over Z/2Z, x + x^2 + ... + x^(2^(r-1)), it is 0 on half
+        # of the elements of each factor Fq[x]/(g_i) of Ker(Phi)
         r = int(log2(q))
-        def op(x):
-            return sum([x**(2*i) for i in range(r-1)], x.ring.zero)
+        def op(x, g):
+            x = x % g
+            acc = x
+            for _ in range(r-1):
+                x = x*x % g
+                acc += x
+            return acc
     else:
-        def op(x):
-            return x**((q-1)//2) - x.ring.one
+        def op(x, g):
+            return powmod(x, (q-1)//2, g) - x.ring.one
 
 
     # Compute a basis of Ker(Phi_f)
@@ -232,10 +334,10 @@ def berlekamp_cantor_zassenhaus(f):
         # Construct a random element of Ker(Phi)
         h = RX.zero
         while h == RX.zero:
-            cs = random.sample(list(R.elements()), s)
+            cs = [_random_element(R) for _ in range(s)]
             h = sum([RX.build([a])*b for a,b in zip(cs,hs)], RX.zero)
 
-        w = gcd(g, op(h)).normal()
+        w = gcd(g, op(h, g)).normal()
 
         if w != RX.one and w != g:
             # w is a nontrivial factor of g
@@ -250,101 +352,75 @@ def berlekamp_cantor_zassenhaus(f):
 
 def equal_degree_factorization(f, e):
     """
-        Factorizes a product of irreducible polynomials of degree e
+        Factorizes a squarefree product of irreducible polynomials of degree e
+        (Cantor-Zassenhaus)
     """
 
-    # Implements Remark 2.3.27
+    # Implements Remark 2.3.27, with random polynomials of degree < deg(g)
+    # instead of random elements of Ker(Phi_g), so no matrix is built
 
     # R = ring of coefficients, RX = polynomial ring
     R = f.ring.coefRing
     RX = f.ring
 
     q = R.order()
-    
+
     # There is one operation which is different in characteristic 2
     if q % 2 == 0:
-        r = int(log2(q))
-        def op(x):
-            return sum([x**(2*i*e) for i in range(r-1)], x.ring.zero)
+        # Trace of F_(q^e) over Z/2Z, h + h^2 + ... + h^(2^(re-1)) for q = 2^r,
+        # it is 0 on half of the elements of each factor RX/(g_i)
+        m = int(log2(q)) * e
+        def op(h, g, ctx):
+            h = ctx.reduce(h)
+            acc = h
+            for _ in range(m-1):
+                h = ctx.mulmod(h, h)
+                acc += h
+            return acc
     else:
-        def op(x):
-            return x**((q**e-1)//2) - x.ring.one
-
-
-    # Compute a basis of Ker(Phi_f)
-    hs = ker_phi_basis(f)
-
-    # s must be the number of factors
-    s = len(hs)
-
-    # Store factors in result
-    result = [f]
-
-    # Look for factors until we have found all
-    while len(result) < s:
-        g = random.choice(result)
-        while g.deg() <= 1:
-            g = random.choice(result)
-
-        # Construct a random element of Ker(Phi)
-        h = RX.zero
-        while h == RX.zero:
-            cs = random.sample(list(R.elements()), s)
-            h = sum([RX.build([a])*b for a,b in zip(cs,hs)], RX.zero)
+        # h^((q^e-1)/2) is 1 on half of the units of each factor RX/(g_i)
+        def op(h, g, ctx):
+            return powmod(h, (q**e-1)//2, g, ctx) - RX.one
+
+    # Split each pending factor in two until they have degree e
+    result = []
+    pending = [f.normal()]
+    while pending:
+        g = pending.pop()
+        n = g.deg()
+        if n <= e:
+            result.append(g)
+            continue
 
-        w = gcd(g, op(h)).normal()
+        ctx = ModulusContext(g)
+        w = g
+        while w.deg() in (0, n):
+            h = RX([_random_element(R) for _ in range(n)])
+            w = gcd(g, op(h, g, ctx)).normal()
 
-        if w != RX.one and w != g:
-            # w is a nontrivial factor of g
-            result.remove(g)
-            result.append(w.primitive_part())
-            result.append((g//w).primitive_part())
+        pending.append(w)
+        pending.append((g // w).normal())
 
     return result
 
 
-def multistage_factorization(f):
+def multistage_factorization(f, ddf=None):
     """
         Factorizes a polynomial with coefficients in Fq
         by applying SDF -> DDF -> EDF
+        ddf is the DDF strategy, "naive" or "kaltofen_shoup" (see
+        DDF_STRATEGIES), by default chosen by the degree
     """
 
     res = {}
     sdf = squarefree_decomposition(f)
 
     for k,v in sdf.items():
-        ddf = distinct_degree_factorization(v)
-        for e,p in ddf.items():
+        strategy = ddf or ("kaltofen_shoup" if v.deg() >= KALTOFEN_SHOUP_THRESHOLD else "naive")
+        ddf_result = DDF_STRATEGIES[strategy](v)
+        for e,p in ddf_result.items():
             factors = equal_degree_factorization(p,e)
             for f in factors:
                 res[f] = k
 
     return res
-
-
-def _gaussian_elimination(B, M, R):
-    """
-        Note: modifies B and M in place
-    """
-
-    l = len(M)
-
-    for i in range(l):
-        # find pivot
-        pivots = [j for j in range(i,l) if M[j][i] != R.zero]
-        if len(pivots) == 0:
-            continue
-        else:
-            p = pivots[0]
-            # swap rows
-            M[p], M[i] = M[i], M[p]
-            B[p], B[i] = B[i], B[p]
-
-            # eliminate
-            for j in pivots[1:]:
-                c = M[j][i] // M[i][i]
-                for k in range(i):
-                    B[j][k] -= c*B[i][k]
-                for k in range(i, l):
-                    M[j][k] -= c*M[i][k]
-                    B[j][k] -= c*B[i][k]
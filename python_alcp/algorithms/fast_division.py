@@ -0,0 +1,102 @@
+from python_alcp.structures.polynomials import (
+        GF2PolynomialElement,
+        ModularPolynomialElement,
+        SparsePolynomialElement
+)
+from python_alcp.utils import assuming, external
+
+# Long division is used while (quotient length)*(divisor degree) is below this
+NEWTON_DIVISION_THRESHOLD = 1024
+
+
+def _coefs(p):
+    # Coefficient list, avoiding boxed coefficients when possible
+    return p.ints if isinstance(p, ModularPolynomialElement) else p.val
+
+def _zero(p):
+    return 0 if isinstance(p, ModularPolynomialElement) else type(p).coefRing.zero
+
+
+@external
+class ModulusContext():
+    """
+        Precomputed data to divide by a fixed polynomial f.
+        Keeps the inverse of rev(f) = x^n * f(1/x) as a power series, computed
+        with Newton iteration and extended when needed, so that the quotient
+        of a // f is rev(rev(a) * rev(f)^-1 mod x^k), and a division costs two
+        multiplications instead of a long division.
+        The leading coefficient of f must be a unit.
+        Usage:
+            ctx = ModulusContext(f)
+            r = ctx.reduce(a)       # a % f
+            r = ctx.mulmod(a, b)    # a*b % f
+    """
+
+    def __init__(self, f):
+        assuming(f != type(f).zero, "Can't divide polynomial by 0")
+        lc = f.coefs[-1]
+        if not lc.is_unit():
+            # Only format f on failure, contexts are built in hot loops
+            assuming(False, f"The leading coefficient of {f} is not a unit")
+
+        R = type(f)
+        self.f = f
+        self.ring = R
+        self.n = f.deg()
+        self._zero = _zero(f)
+        self._rev = R(list(reversed(_coefs(f))))
+        self._inv = R([lc.inverse()])
+        self._prec = 1
+
+    def _truncate(self, p, k):
+        cs = _coefs(p)
+        return p if len(cs) <= k else self.ring(list(cs[:k]))
+
+    def _reverse(self, p, k):
+        # x^(k-1) * p(1/x), p must have less than k coefficients
+        cs = list(_coefs(p))
+        cs += [self._zero] * (k - len(cs))
+        cs.reverse()
+        return self.ring(cs)
+
+    def inverse(self, k):
+        """ rev(f)^-1 mod x^k """
+        R = self.ring
+        while self._prec < k:
+            prec = 2*self._prec
+            g = self._inv
+            # g <- g - g*(rev(f)*g - 1)  mod x^prec
+            e = self._truncate(self._truncate(self._rev, prec) * g, prec) - R.one
+            self._inv = self._truncate(g - g*e, prec)
+            self._prec = prec
+        return self._truncate(self._inv, k)
+
+    def divmod(self, a):
+        """ Returns (a // f, a % f) """
+        R = self.ring
+        if not isinstance(a, R):
+            a = R(a)
+        m = a.deg()
+        n = self.n
+        if m < n:
+            return R.zero, a
+
+        k = m - n + 1
+        if k*n < NEWTON_DIVISION_THRESHOLD or isinstance(a, GF2PolynomialElement):
+            # Shift and XOR division over Z/2Z is already faster than Newton
+            return divmod(a, self.f)
+        if isinstance(self.f, SparsePolynomialElement):
+            # Long division only goes through the few terms of f
+            return divmod(a, self.f)
+
+        top = R(list(reversed(_coefs(a)[n:])))
+        q = self._reverse(self._truncate(top * self.inverse(k), k), k)
+        return q, a - q*self.f
+
+    def reduce(self, a):
+        """ a % f """
+        return self.divmod(a)[1]
+
+    def mulmod(self, a, b):
+        """ a*b % f """
+        return self.reduce(a*b)
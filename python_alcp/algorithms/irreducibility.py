@@ -1,6 +1,13 @@
+from itertools import combinations, product
+import json
+import os
+
 from python_alcp.utils import prime_factors, external, assuming
 from python_alcp.algorithms.divisibility import gcd
-from python_alcp.structures.ideals import GetQuotient, GetRingQuotient
+from python_alcp.algorithms.fast_division import ModulusContext
+from python_alcp.algorithms.powmod import frobenius_map, powmod
+from python_alcp.examples.rings import Z
+from python_alcp.structures.polynomials import GetPolynomials
 
 @external
 def rabin_test(pol):
@@ -12,20 +19,209 @@ def rabin_test(pol):
     R = PR.coefRing         # coefficient ring (field)
     assuming(R.is_finite())
 
-    p = R.order()
     n = pol.deg()
+    if n <= 0:
+        return False
+
+    # x^(q^i) mod pol is computed once for every i <= n, iterating the
+    # Frobenius map, and checked at i = n/r for each prime r | n
+    frob = frobenius_map(pol)
+    x = frob.ctx.reduce(PR.build([R.zero,R.one]))
+    checks = sorted(n//r for r in prime_factors(n).keys())
 
-    quotRing = GetRingQuotient(PR,(PR*pol))
+    h = x
+    for i in range(1, n+1):
+        h = frob(h)
+        if checks and i == checks[0]:
+            checks.pop(0)
+            if not gcd(pol, h-x).is_unit():
+                return False
 
-    x = quotRing.build([R.zero,R.one])
+    return h == x
+
+
+@external
+def ben_or_test(pol):
+    """
+        Ben-Or's test of irreducibility for polynomials with coefficients in a finite field.
+        Checks gcd(pol, x^(q^i) - x) = 1 for i <= n/2, so it stops at the
+        smallest degree of a factor. Faster than Rabin's test on random
+        polynomials, which are usually reducible with a small factor
+    """
+
+    PR = pol.ring       # polinomial ring
+    R = PR.coefRing         # coefficient ring (field)
+    assuming(R.is_finite())
 
-    if (x**(p**n)-x) != quotRing.zero:
+    n = pol.deg()
+    if n <= 0:
         return False
 
-    factors = set(prime_factors(n).keys())
-    for f in factors:
-        ni = n//f
-        if not gcd(pol, (x**(p**ni)-x).val).is_unit():
+    # Most candidates fail in the first steps, so the Frobenius map is only
+    # built by powmod when q is big enough to pay for it
+    q = R.order()
+    ctx = ModulusContext(pol)
+    x = ctx.reduce(PR.build([R.zero,R.one]))
+
+    h = x
+    for i in range(1, n//2 + 1):
+        h = powmod(h, q, pol, ctx)
+        if not gcd(pol, h-x).is_unit():
             return False
 
     return True
+
+
+def _default_cache():
+    directory = os.environ.get("PYTHON_ALCP_CACHE")
+    return os.path.join(directory, "irreducible.json") if directory else None
+
+
+# On disk cache of the polynomials found by find_irreducible, as a JSON
+# object "p,n,primitive,sparse" -> coefficients. Only used if set, by
+# default to irreducible.json in the directory PYTHON_ALCP_CACHE
+IRREDUCIBLE_CACHE = _default_cache()
+
+# Polynomials found or read in this process, and the keys of the ones
+# already checked (those read from the file are checked to be
+# irreducible before their first use)
+_irreducible_cache = None
+_checked = set()
+
+
+def _load_irreducible_cache():
+    global _irreducible_cache
+    if _irreducible_cache is None:
+        _irreducible_cache = {}
+        _checked.clear()
+        if IRREDUCIBLE_CACHE is not None:
+            try:
+                with open(IRREDUCIBLE_CACHE) as fh:
+                    _irreducible_cache = json.load(fh)
+            except (OSError, ValueError):
+                pass
+    return _irreducible_cache
+
+
+def _save_irreducible_cache():
+    if IRREDUCIBLE_CACHE is None:
+        return
+    # Write and rename, so concurrent readers never see half a file
+    tmp = f"{IRREDUCIBLE_CACHE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(IRREDUCIBLE_CACHE), exist_ok=True)
+        with open(tmp, "w") as fh:
+            json.dump(_irreducible_cache, fh, sort_keys=True)
+        os.replace(tmp, IRREDUCIBLE_CACHE)
+    except OSError:
+        pass
+
+
+def _cached_polynomial(entry, p, n):
+    """ Coefficients of a monic polynomial of degree n from a cache entry, or None """
+    # Stored as [exponent, coefficient] pairs
+    pol = [0] * (n+1)
+    try:
+        for e,c in entry:
+            if not (type(e) is int and type(c) is int and 0 <= e <= n and 0 <= c < p):
+                return None
+            pol[e] = c
+    except (TypeError, ValueError):
+        return None
+    return pol if pol[n] == 1 else None
+
+
+def _bounded(b, k):
+    """ Tuples of k coefficients in 1..b, with at least one equal to b """
+    for cs in product(range(1, b+1), repeat=k):
+        if b in cs:
+            yield cs
+
+
+def _low_weight_candidates(p, n):
+    """
+        Monic polynomials x^n + ... + c, c != 0, as coefficient lists.
+        By increasing b + w, where b bounds the coefficients and w is the
+        number of middle terms, so that binomials, trinomials, ... with
+        small coefficients come first. Over big fields there are plenty of
+        candidates with small coefficients, and over small ones, with
+        few terms
+    """
+    for s in range(1, p + n):
+        for b in range(max(1, s-n+1), min(s, p-1) + 1):
+            w = s - b
+            # Over Z/2Z an even number of terms means 1 is a root
+            if p == 2 and w % 2 == 0 and n > 1:
+                continue
+            for exps in combinations(range(1, n), w):
+                for cs in _bounded(b, w+1):
+                    pol = [0] * (n+1)
+                    pol[0], pol[n] = cs[0], 1
+                    for e,c in zip(exps, cs[1:]):
+                        pol[e] = c
+                    yield pol
+
+
+def _dense_candidates(p, n):
+    """
+        Monic polynomials with nonzero constant term, as coefficient lists,
+        by the size of the coefficients
+    """
+    for b in range(1, p):
+        for cs in product(range(b+1), repeat=n-1):
+            for c in range(1, b+1):
+                if b == c or b in cs:
+                    yield [c] + list(reversed(cs)) + [1]
+
+
+@external
+def find_irreducible(p, n, primitive=False, sparse=True, cache=True):
+    """
+        Irreducible polynomial of degree n in (Z/pZ)[x], p prime.
+        With primitive=True, x also generates the multiplicative group of
+        the field (Z/pZ)[x]/(pol). With sparse=True, the candidates with
+        less terms (binomials, trinomials, pentanomials...) are tried first,
+        and the result is an element of the sparse polynomial ring.
+        The search is deterministic, so the same p, n give the same
+        polynomial. With cache=True the results are kept for the process,
+        and in the file IRREDUCIBLE_CACHE if it is set
+    """
+    assuming(n >= 1, "The degree must be positive")
+    # Candidates are tested in the dense ring, the sparse one is slower on small degrees
+    D = GetPolynomials(Z/(p*Z))
+    R = GetPolynomials(Z/(p*Z), sparse=sparse)
+
+    key = f"{p},{n},{int(primitive)},{int(sparse)}"
+    known = _load_irreducible_cache() if cache else {}
+    pol = _cached_polynomial(known.get(key), p, n)
+    if pol is not None:
+        # Only irreducibility is checked again, which is cheap: checking the
+        # primitivity would factor p^n - 1, as long as a new search
+        if key in _checked or rabin_test(D(pol)):
+            _checked.add(key)
+            return R(pol)
+        # A reducible entry is searched again, and replaced
+
+    if primitive:
+        O = p**n - 1
+        cofactors = [O//r for r in prime_factors(O).keys()]
+        x = D([0, 1])
+        # The norm (-1)^n f(0) of x must generate (Z/pZ)*
+        roots = [(p-1)//r for r in prime_factors(p-1).keys()] if p > 2 else []
+        sign = -1 if n % 2 else 1
+
+    for pol in (_low_weight_candidates(p, n) if sparse else _dense_candidates(p, n)):
+        if primitive and any(pow(sign*pol[0], e, p) == 1 for e in roots):
+            continue
+        f = D(pol)
+        if not ben_or_test(f):
+            continue
+        # x has order p^n - 1 in D/(f) if no x^(O/r) is 1
+        if not primitive or all(powmod(x, e, f) != D.one for e in cofactors):
+            break
+
+    if cache:
+        known[key] = [[e, c] for e,c in enumerate(pol) if c]
+        _checked.add(key)
+        _save_irreducible_cache()
+    return R(pol)
@@ -0,0 +1,364 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from python_alcp.structures.ideals import ZmodField
+from python_alcp.structures.polynomials import GF2PolynomialElement, ModularPolynomialElement
+from python_alcp.utils import assuming, external, int_modinv
+
+"""
+    Dense linear algebra over a finite field Fq.
+    FqMatrix keeps its rows packed according to the field:
+        Z/2Z: each row is a python int, bit j is the column j
+        Z/pZ: an int64 numpy array if numpy is available and p < 2^31,
+              and lists of python ints in [0, p) otherwise
+        other finite fields: lists of elements
+    Rank, nullspace, solve and determinant all come from the reduced row
+    echelon form.
+    Usage:
+        M = FqMatrix(F, [[1, 2], [3, 4]])
+        M.rank(), M.det(), M.solve([1, 0])
+        K = M.nullspace()       # basis of {v : M*v = 0}, as rows
+"""
+
+# numpy is used for Z/pZ while products of two coefficients fit in an int64
+NUMPY_MAX_PRIME = 2**31
+
+
+def _kind(F):
+    if isinstance(F, ZmodField):
+        if F.modulus == 2:
+            return "gf2"
+        if np is not None and F.modulus < NUMPY_MAX_PRIME:
+            return "numpy"
+        return "prime"
+    return "generic"
+
+
+@external
+class FqMatrix():
+    """
+        Matrix over the finite field F, given as a list of rows. The entries
+        can be elements of F or python ints
+    """
+
+    def __init__(self, F, rows, ncols=None):
+        self.field = F
+        self.kind = _kind(F)
+        self.nrows = len(rows)
+        self.ncols = ncols if ncols is not None else (len(rows[0]) if rows else 0)
+        self.data = self._pack(rows)
+        self._packed = None
+
+    @classmethod
+    def _from_data(cls, F, data, nrows, ncols):
+        M = cls.__new__(cls)
+        M.field = F
+        M.kind = _kind(F)
+        M.nrows, M.ncols = nrows, ncols
+        M.data = data
+        M._packed = None
+        return M
+
+    def _int(self, c):
+        return c % self.field.modulus if type(c) is int else c.rep
+
+    def _pack(self, rows):
+        F = self.field
+        if self.kind == "gf2":
+            return [sum(1 << j for j,c in enumerate(row) if self._int(c)) for row in rows]
+        if self.kind == "generic":
+            return [[c if isinstance(c, F) else F.constant(c) for c in row] for row in rows]
+        ints = [[self._int(c) for c in row] for row in rows]
+        if self.kind == "numpy":
+            return np.array(ints, dtype=np.int64).reshape(self.nrows, self.ncols)
+        return ints
+
+    def _unpack_row(self, row):
+        # Row of the packed data as a list of python ints (or elements)
+        if self.kind == "gf2":
+            return [(row >> j) & 1 for j in range(self.ncols)]
+        if self.kind == "numpy":
+            return row.tolist()
+        return list(row)
+
+    def _elem(self, c):
+        return c if self.kind == "generic" else self.field.from_int(c)
+
+    @classmethod
+    def identity(cls, F, n):
+        zero, one = F.zero, F.one
+        return cls(F, [[one if i == j else zero for j in range(n)] for i in range(n)], n)
+
+    @classmethod
+    def from_polynomials(cls, F, pols, ncols):
+        """ Matrix whose row i has the coefficients of pols[i], of degree < ncols """
+        rows = []
+        for pol in pols:
+            if isinstance(pol, GF2PolynomialElement):
+                rows.append(pol.bits)
+                continue
+            cs = list(pol.ints if isinstance(pol, ModularPolynomialElement) else pol.coefs)
+            rows.append(cs + [0 if isinstance(pol, ModularPolynomialElement) else F.zero] * (ncols - len(cs)))
+        kind = _kind(F)
+        if kind == "gf2" and all(type(r) is int for r in rows):
+            return cls._from_data(F, rows, len(rows), ncols)
+        return cls(F, rows, ncols)
+
+    def to_polynomials(self, RX):
+        """ The rows as polynomials of RX, with coefficients in F """
+        if self.kind == "gf2" and hasattr(RX, "from_bits"):
+            return [RX.from_bits(row) for row in self.data]
+        if self.kind != "generic" and hasattr(RX, "from_ints"):
+            return [RX.from_ints(self._unpack_row(row)) for row in self.data]
+        return [RX(row) for row in self.rows()]
+
+    def rows(self):
+        """ The rows as lists of elements of F """
+        return [[self._elem(c) for c in self._unpack_row(row)] for row in self.data]
+
+    def __getitem__(self, ij):
+        i, j = ij
+        if self.kind == "gf2":
+            return self._elem((self.data[i] >> j) & 1)
+        return self._elem(int(self.data[i][j]) if self.kind == "numpy" else self.data[i][j])
+
+    def __eq__(self, other):
+        return (isinstance(other, FqMatrix) and self.field == other.field
+                and (self.nrows, self.ncols) == (other.nrows, other.ncols)
+                and [self._unpack_row(r) for r in self.data] == [other._unpack_row(r) for r in other.data])
+
+    def __str__(self):
+        return "\n".join("[" + ", ".join(map(str, row)) + "]" for row in self.rows())
+
+    def __repr__(self):
+        return f"FqMatrix({self.field}, {self.rows()})"
+
+    def _binary(self, other, op):
+        assuming((self.nrows, self.ncols) == (other.nrows, other.ncols), "The matrices must have the same shape")
+        F = self.field
+        if self.kind == "gf2":
+            # + and - are both XOR
+            data = [a ^ b for a,b in zip(self.data, other.data)]
+        elif self.kind == "numpy":
+            data = op(self.data, other.data) % F.modulus
+        elif self.kind == "prime":
+            p = F.modulus
+            data = [[op(a, b) % p for a,b in zip(ra, rb)] for ra,rb in zip(self.data, other.data)]
+        else:
+            data = [[op(a, b) for a,b in zip(ra, rb)] for ra,rb in zip(self.data, other.data)]
+        return self._from_data(F, data, self.nrows, self.ncols)
+
+    def __add__(self, other):
+        return self._binary(other, lambda a, b: a + b)
+
+    def __sub__(self, other):
+        return self._binary(other, lambda a, b: a - b)
+
+    def __mul__(self, other):
+        assuming(self.ncols == other.nrows, "The matrices can't be multiplied")
+        F = self.field
+        if self.kind == "gf2":
+            data = []
+            for row in self.data:
+                acc = 0
+                while row:
+                    low = row & -row
+                    acc ^= other.data[low.bit_length() - 1]
+                    row ^= low
+                data.append(acc)
+        elif self.kind == "numpy" and self.ncols * (F.modulus-1)**2 < 2**63:
+            data = (self.data @ other.data) % F.modulus
+        elif self.kind == "generic":
+            a = [self._unpack_row(r) for r in self.data]
+            cols = list(zip(*[other._unpack_row(r) for r in other.data]))
+            data = [[sum((x*y for x,y in zip(r, c)), F.zero) for c in cols] for r in a]
+        else:
+            # The rows of other are packed in python ints, with slots wide
+            # enough for the sums, and each row of the product is a
+            # combination of them
+            p, m = F.modulus, other.ncols
+            size, packed = other._packed_rows()
+            data = []
+            for r in self.data:
+                acc = 0
+                for c,row in zip(self._unpack_row(r), packed):
+                    if c:
+                        acc += c * row
+                bs = acc.to_bytes(m * size, "little")
+                data.append([int.from_bytes(bs[i:i+size], "little") % p for i in range(0, m * size, size)])
+            if self.kind == "numpy":
+                data = np.array(data, dtype=np.int64).reshape(self.nrows, m)
+        return self._from_data(F, data, self.nrows, other.ncols)
+
+    def _packed_rows(self):
+        """
+            (size, rows) with the rows packed in python ints, size bytes per
+            entry, enough for sums of nrows products. Kept for the next products
+        """
+        if self._packed is None:
+            size = ((self.nrows * (self.field.modulus-1)**2).bit_length() + 8) // 8
+            self._packed = (size, [int.from_bytes(b"".join(c.to_bytes(size, "little") for c in self._unpack_row(r)), "little")
+                                   for r in self.data])
+        return self._packed
+
+    def transpose(self):
+        F = self.field
+        if self.kind == "gf2":
+            data = [sum(((row >> j) & 1) << i for i,row in enumerate(self.data)) for j in range(self.ncols)]
+        elif self.kind == "numpy":
+            data = self.data.T.copy()
+        else:
+            data = [list(c) for c in zip(*self.data)] if self.nrows else [[] for _ in range(self.ncols)]
+        return self._from_data(F, data, self.ncols, self.nrows)
+
+    def _rref(self):
+        """
+            Reduced row echelon form.
+            Returns (rows, pivots, det) where rows are the packed rows, pivots
+            the pivot columns of the first rows and det the product of the
+            pivots with the sign of the row swaps (the determinant, if the
+            matrix is square and has full rank)
+        """
+        rows = self.data.copy() if self.kind == "numpy" else [r if type(r) is int else list(r) for r in self.data]
+        n, m = self.nrows, self.ncols
+        F = self.field
+        pivots = []
+        r = 0
+
+        if self.kind == "gf2":
+            for j in range(m):
+                if r == n:
+                    break
+                bit = 1 << j
+                i = next((i for i in range(r, n) if rows[i] & bit), None)
+                if i is None:
+                    continue
+                rows[r], rows[i] = rows[i], rows[r]
+                pr = rows[r]
+                for i in range(n):
+                    if i != r and rows[i] & bit:
+                        rows[i] ^= pr
+                pivots.append(j)
+                r += 1
+            return rows, pivots, 1
+
+        if self.kind == "numpy":
+            p = F.modulus
+            det = 1
+            for j in range(m):
+                if r == n:
+                    break
+                nz = np.flatnonzero(rows[r:, j])
+                if len(nz) == 0:
+                    continue
+                i = r + int(nz[0])
+                if i != r:
+                    rows[[r, i]] = rows[[i, r]]
+                    det = -det
+                c = int(rows[r, j])
+                det = det * c % p
+                rows[r, j:] = rows[r, j:] * int_modinv(c, p) % p
+                col = rows[:, j].copy()
+                col[r] = 0
+                nzr = np.flatnonzero(col)
+                if len(nzr):
+                    # Entries below p^2 < 2^62, the difference fits in an int64
+                    rows[nzr, j:] = (rows[nzr, j:] - np.outer(col[nzr], rows[r, j:])) % p
+                pivots.append(j)
+                r += 1
+            return rows, pivots, det % p
+
+        # Lists of python ints mod p, or of elements of F. Rows from r on are
+        # zero before column j, so only the columns from j on change
+        prime = self.kind == "prime"
+        p = F.modulus if prime else None
+        zero = 0 if prime else F.zero
+        det = 1 if prime else F.one
+        for j in range(m):
+            if r == n:
+                break
+            i = next((i for i in range(r, n) if rows[i][j] != zero), None)
+            if i is None:
+                continue
+            if i != r:
+                rows[r], rows[i] = rows[i], rows[r]
+                det = -det
+            c = rows[r][j]
+            det = det * c % p if prime else det * c
+            if prime:
+                inv = int_modinv(c, p)
+                pr = rows[r][:j] + [a * inv % p for a in rows[r][j:]]
+            else:
+                inv = c.inverse()
+                pr = rows[r][:j] + [a * inv for a in rows[r][j:]]
+            rows[r] = pr
+            tail = pr[j:]
+            for i in range(n):
+                c = rows[i][j]
+                if i != r and c != zero:
+                    row = rows[i]
+                    if prime:
+                        row[j:] = [(a - c*b) % p for a,b in zip(row[j:], tail)]
+                    else:
+                        row[j:] = [a - c*b for a,b in zip(row[j:], tail)]
+            pivots.append(j)
+            r += 1
+        return rows, pivots, (det % p if prime else det)
+
+    def rank(self):
+        return len(self._rref()[1])
+
+    def det(self):
+        assuming(self.nrows == self.ncols, "The determinant needs a square matrix")
+        _, pivots, det = self._rref()
+        if len(pivots) < self.nrows:
+            return self.field.zero
+        return self._elem(det)
+
+    def nullspace(self):
+        """ Basis of {v : M*v = 0}, as the rows of a matrix """
+        rows, pivots, _ = self._rref()
+        F, m = self.field, self.ncols
+        free = [j for j in range(m) if j not in set(pivots)]
+
+        if self.kind == "gf2":
+            data = []
+            for j in free:
+                bit = 1 << j
+                v = bit
+                for k,pj in enumerate(pivots):
+                    if rows[k] & bit:
+                        v |= 1 << pj
+                data.append(v)
+            return self._from_data(F, data, len(free), m)
+
+        prime = self.kind != "generic"
+        basis = []
+        for j in free:
+            v = [0 if prime else F.zero] * m
+            v[j] = 1 if prime else F.one
+            for k,pj in enumerate(pivots):
+                c = int(rows[k][j]) if prime else rows[k][j]
+                v[pj] = -c % F.modulus if prime else -c
+            basis.append(v)
+        return FqMatrix(F, basis, m)
+
+    def solve(self, b):
+        """
+            A vector x with M*x = b, given as a list. Raises ValueError if
+            there is no solution
+        """
+        assuming(len(b) == self.nrows, "The vector must have one entry per row")
+        F, m = self.field, self.ncols
+        rows = [self._unpack_row(r) + [c] for r,c in zip(self.data, b)]
+        aug = FqMatrix(F, rows, m + 1)
+        rref, pivots, _ = aug._rref()
+        if pivots and pivots[-1] == m:
+            raise ValueError("The system has no solution")
+
+        x = [F.zero] * m
+        for k,pj in enumerate(pivots):
+            x[pj] = aug._elem(aug._unpack_row(rref[k])[m])
+        return x
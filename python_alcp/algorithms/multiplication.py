@@ -0,0 +1,181 @@
+from python_alcp.utils import external
+from python_alcp.algorithms import ntt
+
+"""
+    Polynomial multiplication on coefficient lists.
+    Coefficients are given in increasing degree order, and the result has
+    length len(a) + len(b) - 1 (no trailing zeros are removed).
+
+    The thresholds are the minimum length of the shortest operand for which
+    the recursive algorithms are used, below them the schoolbook product is
+    faster. They can be tuned at runtime, see benchmarks/multiplication.py
+"""
+
+KARATSUBA_THRESHOLD = 24
+TOOM3_THRESHOLD = 96
+
+
+@external
+def schoolbook_mul(a, b, zero):
+    """ Quadratic convolution of the coefficient lists a and b """
+
+    if len(a) == 0 or len(b) == 0:
+        return []
+
+    res = [zero] * (len(a) + len(b) - 1)
+    for i,v in enumerate(a):
+        for j,w in enumerate(b):
+            res[i+j] += v*w
+
+    return res
+
+
+def _add(a, b):
+    # Sum of two coefficient lists of possibly different lengths
+    if len(a) < len(b):
+        a, b = b, a
+    return [x+y for x,y in zip(b,a)] + a[len(b):]
+
+
+def _sub_into(res, a, shift):
+    # res[shift:] -= a
+    for i,x in enumerate(a):
+        res[shift+i] -= x
+
+
+def _add_into(res, a, shift):
+    # res[shift:] += a
+    for i,x in enumerate(a):
+        res[shift+i] += x
+
+
+def _unbalanced_mul(a, b, zero, mul):
+    """
+        Product when b is much shorter than a.
+        Splits a into chunks of the length of b
+    """
+    res = [zero] * (len(a) + len(b) - 1)
+    k = len(b)
+    for i in range(0, len(a), k):
+        _add_into(res, mul(a[i:i+k], b), i)
+    return res
+
+
+@external
+def karatsuba_mul(a, b, zero, threshold = None):
+    """
+        Karatsuba multiplication of the coefficient lists a and b.
+        Only uses ring operations (+, -, *), so it works for any
+        coefficient ring
+    """
+
+    if threshold is None:
+        threshold = KARATSUBA_THRESHOLD
+    threshold = max(threshold, 2)
+
+    def mul(a, b):
+        if len(a) < len(b):
+            a, b = b, a
+        if len(b) < threshold:
+            return schoolbook_mul(a, b, zero)
+
+        k = (len(a) + 1) // 2
+        if len(b) <= k:
+            return _unbalanced_mul(a, b, zero, mul)
+
+        a0, a1 = a[:k], a[k:]
+        b0, b1 = b[:k], b[k:]
+
+        z0 = mul(a0, b0)
+        z2 = mul(a1, b1)
+        z1 = mul(_add(a0, a1), _add(b0, b1))
+        _sub_into(z1, z0, 0)
+        _sub_into(z1, z2, 0)
+
+        res = [zero] * (len(a) + len(b) - 1)
+        _add_into(res, z0, 0)
+        _add_into(res, z1, k)
+        _add_into(res, z2, 2*k)
+        return res
+
+    if len(a) == 0 or len(b) == 0:
+        return []
+
+    return mul(list(a), list(b))
+
+
+@external
+def toom3_mul(a, b, threshold = None):
+    """
+        Toom-Cook 3-way multiplication of lists of python ints.
+        The interpolation divides by 2 and 3, so unlike karatsuba_mul
+        it is only available for integer coefficients.
+        Uses the evaluation points 0, 1, -1, -2, inf and Bodrato's
+        interpolation sequence.
+    """
+
+    if threshold is None:
+        threshold = TOOM3_THRESHOLD
+    threshold = max(threshold, 3)
+
+    def lin(x, y, z, cx, cy, cz):
+        # cx*x + cy*y + cz*z for lists
+        n = max(len(x), len(y), len(z))
+        x = x + [0]*(n-len(x))
+        y = y + [0]*(n-len(y))
+        z = z + [0]*(n-len(z))
+        return [cx*u + cy*v + cz*w for u,v,w in zip(x,y,z)]
+
+    def mul(a, b):
+        if len(a) < len(b):
+            a, b = b, a
+        if len(b) < threshold:
+            return karatsuba_mul(a, b, 0)
+
+        k = (len(a) + 2) // 3
+        if len(b) <= k:
+            return _unbalanced_mul(a, b, 0, mul)
+
+        a0, a1, a2 = a[:k], a[k:2*k], a[2*k:]
+        b0, b1, b2 = b[:k], b[k:2*k], b[2*k:]
+
+        r0 = mul(a0, b0)
+        r1 = mul(lin(a0,a1,a2,1,1,1), lin(b0,b1,b2,1,1,1))
+        rm1 = mul(lin(a0,a1,a2,1,-1,1), lin(b0,b1,b2,1,-1,1))
+        rm2 = mul(lin(a0,a1,a2,1,-2,4), lin(b0,b1,b2,1,-2,4))
+        rinf = mul(a2, b2)
+
+        n = max(len(r1), len(rm1), len(rm2))
+        r0, r1, rm1, rm2, rinf = [r + [0]*(n-len(r)) for r in (r0, r1, rm1, rm2, rinf)]
+
+        # Interpolation (all divisions are exact)
+        c3 = [(x - y) // 3 for x,y in zip(rm2, r1)]
+        c1 = [(x - y) // 2 for x,y in zip(r1, rm1)]
+        c2 = [x - y for x,y in zip(rm1, r0)]
+        c3 = [(x - y) // 2 + 2*z for x,y,z in zip(c2, c3, rinf)]
+        c2 = [x + y - z for x,y,z in zip(c2, c1, rinf)]
+        c1 = [x - y for x,y in zip(c1, c3)]
+
+        res = [0] * (len(a) + len(b) - 1 + 4*k)
+        for i,c in enumerate((r0, c1, c2, c3, rinf)):
+            _add_into(res, c, i*k)
+        return res[:len(a) + len(b) - 1]
+
+    if len(a) == 0 or len(b) == 0:
+        return []
+
+    return mul(list(a), list(b))
+
+
+@external
+def int_poly_mul(a, b):
+    """
+        Product of polynomials with python int coefficients,
+        choosing the algorithm by the size of the operands
+    """
+
+    if min(len(a), len(b)) >= ntt.NTT_THRESHOLD:
+        res = ntt.ntt_mul(a, b)
+        if res is not None:
+            return res
+    return toom3_mul(a, b)
@@ -0,0 +1,188 @@
+from python_alcp.utils import external, int_modinv
+
+"""
+    Number theoretic transform (NTT) multiplication of polynomials given as
+    lists of python ints.
+    The convolution is computed modulo several NTT friendly primes
+    (p = c*2^k + 1) and the coefficients are recovered with the chinese
+    remainder theorem, so it works for any modulus and for integer
+    coefficients of any sign, as long as enough primes are available.
+"""
+
+# NTT friendly primes p = c*2^k + 1 < 2^31, with a primitive root
+# and the largest k such that 2^k divides p-1
+NTT_PRIMES = [
+    (2130706433, 3, 24),
+    (2113929217, 5, 25),
+    (2088763393, 5, 23),
+    (2013265921, 31, 27),
+    (1811939329, 13, 26),
+    (1711276033, 29, 25),
+    (1484783617, 5, 23),
+    (1300234241, 3, 23),
+    (1224736769, 3, 24),
+    (1107296257, 10, 25),
+    (998244353, 3, 23),
+    (897581057, 3, 23),
+]
+
+# Minimum length of both operands to use NTT multiplication
+NTT_THRESHOLD = 4096
+
+_roots = {}
+
+
+def _root_table(p, g, n, invert):
+    """
+        Powers of a primitive n-th root of unity modulo p (or of its
+        inverse), cached by (p, n, invert)
+    """
+    key = (p, n, invert)
+    if key not in _roots:
+        w = pow(g, (p - 1) // n, p)
+        if invert:
+            w = int_modinv(w, p)
+        table = [1] * (n // 2)
+        for i in range(1, n // 2):
+            table[i] = table[i-1] * w % p
+        _roots[key] = table
+    return _roots[key]
+
+
+def ntt(a, p, g, invert = False):
+    """
+        In place iterative NTT of a modulo p, len(a) must be a power of 2
+        dividing p-1. g is a primitive root modulo p.
+    """
+
+    n = len(a)
+
+    # Bit reversal permutation
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+
+    table = _root_table(p, g, n, invert)
+    length = 2
+    while length <= n:
+        half = length // 2
+        ws = table[::n // length]
+        if half < n // length:
+            # Many short blocks, process the k-th butterfly of all blocks at once
+            for k in range(half):
+                w = ws[k]
+                lo = a[k::length]
+                hi = [x*w % p for x in a[k+half::length]]
+                a[k::length] = [(u + v) % p for u,v in zip(lo, hi)]
+                a[k+half::length] = [(u - v) % p for u,v in zip(lo, hi)]
+        else:
+            for start in range(0, n, length):
+                lo = a[start:start+half]
+                hi = [x*w % p for x,w in zip(a[start+half:start+length], ws)]
+                a[start:start+half] = [(u + v) % p for u,v in zip(lo, hi)]
+                a[start+half:start+length] = [(u - v) % p for u,v in zip(lo, hi)]
+        length *= 2
+
+    if invert:
+        inv_n = int_modinv(n, p)
+        for i in range(n):
+            a[i] = a[i] * inv_n % p
+
+    return a
+
+
+def ntt_convolution(a, b, prime):
+    """ Cyclic-free convolution of a and b modulo one of NTT_PRIMES """
+
+    p, g, k = prime
+    l = len(a) + len(b) - 1
+    n = 1
+    while n < l:
+        n *= 2
+    assert n <= 2**k, "Polynomials too long for NTT"
+
+    fa = ntt([x % p for x in a] + [0] * (n - len(a)), p, g)
+    fb = ntt([x % p for x in b] + [0] * (n - len(b)), p, g)
+    fc = [x*y % p for x,y in zip(fa, fb)]
+    return ntt(fc, p, g, invert=True)[:l]
+
+
+def _crt(residues, primes):
+    """
+        Garner's algorithm, combines the residues of each coefficient
+        into its value modulo the product of the primes
+    """
+
+    invs = []
+    for i,pi in enumerate(primes):
+        m = 1
+        for pj in primes[:i]:
+            m = m * pj % pi
+        invs.append(int_modinv(m, pi))
+
+    res = []
+    for rs in zip(*residues):
+        x = rs[0]
+        m = 1
+        for i in range(1, len(primes)):
+            m *= primes[i-1]
+            t = (rs[i] - x) * invs[i] % primes[i]
+            x += t * m
+        res.append(x)
+    return res
+
+
+def primes_for_bound(bound):
+    """
+        Minimal list of NTT_PRIMES whose product exceeds bound.
+        Returns None if there are not enough primes
+    """
+    res = []
+    prod = 1
+    for prime in NTT_PRIMES:
+        res.append(prime)
+        prod *= prime[0]
+        if prod > bound:
+            return res
+    return None
+
+
+@external
+def ntt_mul(a, b, modulus = None):
+    """
+        Product of the polynomials a and b, given as lists of ints.
+        If modulus is given, the coefficients are assumed to be in
+        [0, modulus) and the result is reduced modulo modulus.
+        Otherwise the coefficients are arbitrary integers.
+        Returns None if the coefficients are too big for the available primes
+    """
+
+    if len(a) == 0 or len(b) == 0:
+        return []
+
+    if modulus is not None:
+        bound = min(len(a), len(b)) * (modulus - 1)**2
+    else:
+        bound = 2 * min(len(a), len(b)) * max(map(abs, a)) * max(map(abs, b))
+
+    primes = primes_for_bound(bound)
+    if primes is None:
+        return None
+
+    residues = [ntt_convolution(a, b, prime) for prime in primes]
+    ps = [p for p,_,_ in primes]
+    res = _crt(residues, ps)
+
+    if modulus is not None:
+        return [x % modulus for x in res]
+
+    M = 1
+    for p in ps:
+        M *= p
+    return [x - M if 2*x > M else x for x in res]
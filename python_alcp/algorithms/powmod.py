@@ -0,0 +1,211 @@
+from python_alcp.algorithms.fast_division import ModulusContext
+from python_alcp.structures.polynomials import (
+        GF2PolynomialElement,
+        ModularPolynomialElement
+)
+from python_alcp.utils import assuming, external
+
+"""
+    Modular exponentiation of polynomials.
+    powmod(a, e, f) reduces modulo f after every product and uses sliding
+    window exponentiation. Over a finite field Fq, the Frobenius map
+    a -> a^q mod f is linear, so it is precomputed as a matrix (the rows
+    are x^(iq) mod f) and a^(q^k) mod f costs k vector by matrix products.
+    Usage:
+        powmod(x, (q**d - 1)//2, f)
+        frob = frobenius_map(f)
+        frob(a)             # a^q % f
+        frob.power(a, k)    # a^(q^k) % f
+"""
+
+# (bit length of the exponent, window size) pairs, the window is the first
+# one whose bound is not smaller than the bit length
+WINDOW_SIZES = [(8, 1), (24, 2), (80, 3), (240, 4), (672, 5)]
+MAX_WINDOW = 6
+
+
+def _window_size(bits):
+    for bound, k in WINDOW_SIZES:
+        if bits <= bound:
+            return k
+    return MAX_WINDOW
+
+
+def _sliding_window(a, e, ctx):
+    """ a^e % f, with a already reduced and e > 0 """
+
+    k = _window_size(e.bit_length())
+
+    # Odd powers a, a^3, ..., a^(2^k - 1)
+    odd = [a]
+    if k > 1:
+        a2 = ctx.mulmod(a, a)
+        for _ in range((1 << (k-1)) - 1):
+            odd.append(ctx.mulmod(odd[-1], a2))
+
+    res = None
+    i = e.bit_length() - 1
+    while i >= 0:
+        if not (e >> i) & 1:
+            res = ctx.mulmod(res, res)
+            i -= 1
+            continue
+        # Longest window e[j..i] of at most k bits ending in a 1
+        j = max(i - k + 1, 0)
+        while not (e >> j) & 1:
+            j += 1
+        w = (e >> j) & ((1 << (i - j + 1)) - 1)
+        if res is None:
+            res = odd[w >> 1]
+        else:
+            for _ in range(i - j + 1):
+                res = ctx.mulmod(res, res)
+            res = ctx.mulmod(res, odd[w >> 1])
+        i = j - 1
+
+    return res
+
+
+def _field_power(R, e):
+    """ k such that e = q^k, q the order of the coefficients of R, or None """
+    C = R.coefRing
+    if not (C.is_field() and C.is_finite()):
+        return None
+    q = C.order()
+    k = 0
+    while e > 1 and e % q == 0:
+        e //= q
+        k += 1
+    return k if e == 1 and k > 0 else None
+
+
+@external
+def powmod(base, exp, modulus, ctx=None):
+    """
+        base^exp % modulus, for polynomials.
+        The leading coefficient of modulus must be a unit. ctx can be a
+        ModulusContext of modulus, to share it between calls
+    """
+    assuming(exp >= 0, "The exponent must be non negative")
+
+    R = type(modulus)
+    n = modulus.deg()
+
+    k = _field_power(R, exp)
+    if k is not None:
+        q = R.coefRing.order()
+        # The matrix costs about n products, the powers k*log2(q) squarings
+        if k * q.bit_length() >= n or has_frobenius_map(modulus):
+            return frobenius_map(modulus).power(base, k)
+
+    if ctx is None:
+        ctx = ModulusContext(modulus)
+    if exp == 0:
+        return ctx.reduce(R.one)
+    return _sliding_window(ctx.reduce(base), exp, ctx)
+
+
+def _pack(cs, size):
+    return int.from_bytes(b"".join(c.to_bytes(size, "little") for c in cs), "little")
+
+
+@external
+class FrobeniusMap():
+    """
+        The map a -> a^q of Fq[x]/(f), for q the order of the coefficient
+        field. rows[i] = x^(iq) mod f, and the image of a is the combination
+        of the rows given by its coefficients.
+        Over Z/pZ the rows are also packed in python ints (one slot per
+        coefficient, wide enough for the sums), and over Z/2Z they are
+        combined with XOR
+    """
+
+    def __init__(self, f):
+        R = type(f)
+        self.f = f
+        self.ring = R
+        self.q = R.coefRing.order()
+        self.n = n = f.deg()
+        self.ctx = ctx = ModulusContext(f)
+
+        x = ctx.reduce(R([0, 1]))
+        xq = _sliding_window(x, self.q, ctx)
+        rows = [ctx.reduce(R.one)]
+        for _ in range(n - 1):
+            rows.append(ctx.mulmod(rows[-1], xq))
+        self.rows = rows
+
+        if isinstance(f, GF2PolynomialElement):
+            self._bits = [r.bits for r in rows]
+        elif isinstance(f, ModularPolynomialElement):
+            p = R.modulus
+            self._size = ((n * (p-1)**2).bit_length() + 8) // 8
+            self._packed = [_pack(r.ints, self._size) for r in rows]
+
+    def __call__(self, a):
+        """ a^q % f """
+        R = self.ring
+        a = self.ctx.reduce(a)
+
+        if isinstance(a, GF2PolynomialElement):
+            acc = 0
+            bits = a.bits
+            rows = self._bits
+            while bits:
+                low = bits & -bits
+                acc ^= rows[low.bit_length() - 1]
+                bits ^= low
+            return R.from_bits(acc)
+
+        if isinstance(a, ModularPolynomialElement):
+            size, p = self._size, R.modulus
+            acc = 0
+            for c,row in zip(a.ints, self._packed):
+                if c:
+                    acc += c * row
+            bs = acc.to_bytes(self.n * size, "little")
+            return R.from_ints([int.from_bytes(bs[i:i+size], "little") % p for i in range(0, self.n * size, size)])
+
+        zero = R.coefRing.zero
+        cs = [zero] * self.n
+        for c,row in zip(a.coefs, self.rows):
+            if c != zero:
+                for j,v in enumerate(row.coefs):
+                    cs[j] += c*v
+        return R(cs)
+
+    def power(self, a, k):
+        """ a^(q^k) % f """
+        a = self.ctx.reduce(a)
+        for _ in range(k):
+            a = self(a)
+        return a
+
+    def matrix(self):
+        """ The rows x^(iq) mod f as lists of n coefficients """
+        zero = self.ring.coefRing.zero
+        return [list(r.coefs) + [zero] * (self.n - len(r.coefs)) for r in self.rows]
+
+
+_frobenius_maps = {}
+FROBENIUS_CACHE_SIZE = 16
+
+
+@external
+def frobenius_map(f):
+    """ FrobeniusMap of f, the last FROBENIUS_CACHE_SIZE ones are cached """
+    # Keyed by the ring too, equal coefficient lists may come from different rings
+    key = (type(f), f)
+    frob = _frobenius_maps.pop(key, None)
+    if frob is None:
+        frob = FrobeniusMap(f)
+        if len(_frobenius_maps) >= FROBENIUS_CACHE_SIZE:
+            del _frobenius_maps[next(iter(_frobenius_maps))]
+    _frobenius_maps[key] = frob
+    return frob
+
+
+@external
+def has_frobenius_map(f):
+    """ Whether frobenius_map(f) is cached, so that using it costs nothing """
+    return (type(f), f) in _frobenius_maps
@@ -1,8 +1,19 @@
 from python_alcp.algorithms.divisibility import gcd
 from python_alcp.algorithms.discrete_log import discrete_log
+from python_alcp.algorithms.powmod import powmod
 from python_alcp.examples.rings import Z
-from python_alcp.utils import *
+from python_alcp.structures.polynomials import GetPolynomials
+from python_alcp.utils import (
+        assuming,
+        external,
+        miller_rabin,
+        mr_bases,
+        primes_up_to
+)
 from random import randint
+from bisect import bisect_left
+from functools import reduce
+from math import isqrt
 import math
 
 
@@ -57,50 +68,147 @@ def is_prime_aks(n):
     
     #test (X+a)^n = X^n+a in Z_n[X] (mod X^r-1)
     sqrt_phi_r = math.sqrt(euler_phi(r))
-    R = (Z/(Z*n))["X"]
-    x_n = R.build([0 for _ in range(n.val)]+[1])
+    R = GetPolynomials(Z/(Z*n), "X", sparse=True)
+    M = R({r: 1, 0: -1}) # x^r-1
+    x_n = R({n.val % r: 1}) # x^n
     for i in range(1,int(sqrt_phi_r*L)):
-        P1 = R.build([i,1])**n.val # (x+i)^n
-        P2 = x_n+R.build([i]) # x^n+i
-        M = x_n-R.build([1]) # x^r-1
-        if P1 % M != P2 % M:
+        P1 = powmod(R({1: 1, 0: i}), n.val, M) # (x+i)^n
+        P2 = x_n+R(i) # x^n+i
+        if P1 != P2 % M:
             return False
     return True
-    
+
 
 """
 Returns True if it is a possible prime and False otherwise.
+Without k, the test is deterministic for n < 3.3*10^24, using the known
+sets of bases for each range, and larger n are checked with the
+Baillie-PSW test instead. With k, k random bases are tried.
 
 :n  the input number, larger than 1
-:k  the number of tests to run
-"""                                                     
-def is_prime_miller_rabin(n,k=500):
-    if type(n) == int:
-        n = Z.build(n)
-    
-    if n.val < 2:
+:k  the number of random bases to test, or None
+"""
+@external
+def is_prime_miller_rabin(n,k=None):
+    if not isinstance(n, int):
+        n = n.val
+
+    if n < 2:
         raise ValueError("Input integer must be larger than 2.")
-    if n.val == 2 or n.val == 3:
+    if n < 4:
         return True
-    if n.val % 2 == 0:
+    if n % 2 == 0:
         return False
-        
-    # Factor the integer as 2^r*d+1
-    r,d = 0,n.val-1
+
+    if k is None:
+        bases = mr_bases(n)
+        if bases is None:
+            return is_prime_bpsw(n)
+        return miller_rabin(n, [a % n for a in bases if a % n != 0])
+
+    return miller_rabin(n, [randint(2, n-2) for _ in range(k)])
+
+
+"""
+Jacobi symbol (a/n) for odd n > 0.
+"""
+def jacobi(a, n):
+    a %= n
+    res = 1
+    while a != 0:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                res = -res
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            res = -res
+        a %= n
+    return res if n == 1 else 0
+
+
+"""
+Strong Lucas probable prime test with Selfridge's parameters
+(D the first of 5, -7, 9, -11, ... with (D/n) = -1, P = 1, Q = (1-D)/4).
+
+:n  odd integer, larger than 2 and not a perfect square
+"""
+def is_strong_lucas_prp(n):
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
     while d % 2 == 0:
-        r,d = r+1,d//2
-    # Run test k times
-    R = Z/(Z*n)
-    one,minus_one = R.build(1),R.build(n.val-1)
-    for _ in range(k):
-        # Miller Test
-        a = R.build(randint(2,n.val-2))**d
-        if a != one and a != minus_one:
-            witness,i = True,0
-            while witness and i<r-1:
-                a,i = a*a,i+1
-                if a == minus_one:
-                    witness = False
-            if witness:
-                return False     
-    return True
+        d, s = d // 2, s + 1
+
+    # U_d, V_d and Q^d with the binary method
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U*V % n, (V*V - 2*Qk) % n, Qk*Qk % n
+        if bit == '1':
+            U, V = P*U + V, D*U + P*V
+            U = (U + n if U % 2 else U) // 2 % n
+            V = (V + n if V % 2 else V) // 2 % n
+            Qk = Qk*Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V*V - 2*Qk) % n, Qk*Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+"""
+Baillie-PSW primality test: a strong probable prime test to base 2
+followed by a strong Lucas test. No counterexample is known.
+
+:n  integer
+"""
+@external
+def is_prime_bpsw(n):
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if not miller_rabin(n, (2,)):
+        return False
+    if isqrt(n)**2 == n:
+        return False
+    return is_strong_lucas_prp(n)
+
+
+# Primes removed by the gcd filter of is_prime_many
+SMALL_PRIMES = primes_up_to(1000)
+_SMALL_PRIMORIAL = reduce(int.__mul__, SMALL_PRIMES, 1)
+
+"""
+Primality of many integers at once, returns a list of booleans.
+Candidates with a small factor are discarded with a single gcd against
+the product of the primes below 1000, and the rest are tested with
+is_prime_miller_rabin.
+
+:ns  iterable of integers
+"""
+def is_prime_many(ns):
+    res = []
+    for n in ns:
+        if not isinstance(n, int):
+            n = n.val
+        if n <= SMALL_PRIMES[-1]:
+            res.append(n > 1 and SMALL_PRIMES[bisect_left(SMALL_PRIMES, n)] == n)
+        elif math.gcd(n, _SMALL_PRIMORIAL) != 1:
+            res.append(False)
+        else:
+            bases = mr_bases(n)
+            res.append(miller_rabin(n, bases) if bases is not None else is_prime_bpsw(n))
+    return res
@@ -0,0 +1,148 @@
+from python_alcp.algorithms.chinese_remainder import modinv
+from python_alcp.algorithms.fast_division import ModulusContext
+from python_alcp.structures.polynomials import GetPolynomials
+from python_alcp.utils import assuming, external
+
+"""
+    Subproduct trees of polynomials m_0, ..., m_(k-1): the leaves are the
+    m_i and each node is the product of its two children, so the root is
+    m = m_0 * ... * m_(k-1).
+    Going down the tree gives f mod m_i for all i with a division per node,
+    and going up gives sum c_i * m/m_i with two products per node, both in
+    O(M(n) log n) with the divisions done by ModulusContext.
+    With the leaves x - a_i these are multipoint evaluation and Lagrange
+    interpolation, and in general they give the Chinese remainder theorem.
+    Usage:
+        multi_eval(f, [1, 2, 3])                # [f(1), f(2), f(3)]
+        interpolate(points, values)             # g with g(points[i]) = values[i]
+        fast_chinese_remainder(eqs, mods)       # x with x = eqs[i] mod mods[i]
+        tree = SubproductTree.from_points(points, R)
+        tree.evaluate(f), tree.interpolate(values)
+"""
+
+# multi_eval stops going down the tree at nodes of at most this many points,
+# and evaluates the remainders there with Horner
+MULTI_EVAL_LEAF_SIZE = 8
+
+
+@external
+class SubproductTree():
+    """
+        Subproduct tree of the polynomials moduli, over a field.
+        levels[0] are the moduli and levels[k+1][i] = levels[k][2i] * levels[k][2i+1],
+        with the last node carried up when a level has an odd length
+    """
+
+    def __init__(self, moduli, points=None):
+        assuming(len(moduli) > 0, "The tree needs at least one modulus")
+        levels = [list(moduli)]
+        while len(levels[-1]) > 1:
+            nodes = levels[-1]
+            up = [nodes[i] * nodes[i+1] for i in range(0, len(nodes)-1, 2)]
+            if len(nodes) % 2:
+                up.append(nodes[-1])
+            levels.append(up)
+        self.levels = levels
+        self.root = levels[-1][0]
+        self.points = points
+        self._contexts = {}
+        self._weights = None
+
+    @classmethod
+    def from_points(cls, points, R):
+        """ Tree of the x - a, a in points, in the polynomial ring R """
+        K = R.coefRing
+        points = [K(a) for a in points]
+        return cls([R([-a, K.one]) for a in points], points)
+
+    def _reduce(self, k, i, a):
+        # a % levels[k][i], the division data of the node is kept
+        node = self.levels[k][i]
+        if a.deg() < node.deg():
+            return a
+        ctx = self._contexts.get((k, i))
+        if ctx is None:
+            ctx = self._contexts[(k, i)] = ModulusContext(node)
+        return ctx.reduce(a)
+
+    def remainders(self, f, level=0):
+        """ [f % node for node in levels[level]] """
+        rs = [self._reduce(len(self.levels)-1, 0, f)]
+        for k in reversed(range(level, len(self.levels)-1)):
+            rs = [self._reduce(k, i, rs[i // 2]) for i in range(len(self.levels[k]))]
+        return rs
+
+    def combine(self, cs):
+        """ sum cs[i] * root/moduli[i] """
+        assuming(len(cs) == len(self.levels[0]), "One value per modulus is needed")
+        for nodes in self.levels[:-1]:
+            up = [cs[i] * nodes[i+1] + cs[i+1] * nodes[i] for i in range(0, len(cs)-1, 2)]
+            if len(cs) % 2:
+                up.append(cs[-1])
+            cs = up
+        return cs[0]
+
+    def evaluate(self, f):
+        """ [f(a) for a in points] """
+        assuming(self.points is not None, "The tree was not built from points")
+        # Level k has nodes of 2^k points
+        level = min(MULTI_EVAL_LEAF_SIZE.bit_length() - 1, len(self.levels) - 1)
+        size = 1 << level
+        zero = type(self.root).coefRing.zero
+        res = []
+        for i,r in enumerate(self.remainders(f, level)):
+            pts = self.points[i*size:(i+1)*size]
+            res += [r.eval(a) for a in pts] if r.deg() >= 0 else [zero] * len(pts)
+        return res
+
+    def interpolate(self, values):
+        """ The polynomial g of degree < len(points) with g(points[i]) = values[i] """
+        if self._weights is None:
+            # Lagrange weights 1/m'(a_i), m the root
+            K = type(self.root).coefRing
+            ws = self.evaluate(self.root.der())
+            assuming(all(w != K.zero for w in ws), "The points must be distinct")
+            self._weights = [w.inverse() for w in ws]
+        R = type(self.root)
+        K = R.coefRing
+        return self.combine([R([K(v) * w]) for v,w in zip(values, self._weights)])
+
+
+@external
+def multi_eval(f, points):
+    """ [f(a) for a in points], for f a polynomial over a field """
+    if not points:
+        return []
+    return SubproductTree.from_points(points, type(f)).evaluate(f)
+
+
+@external
+def interpolate(points, values, R=None):
+    """
+        The polynomial g of degree < len(points) with g(points[i]) = values[i].
+        The points must be distinct elements of a field, and R is the
+        polynomial ring of the result (by default over the ring of the points)
+    """
+    assuming(len(points) == len(values), "One value per point is needed")
+    if R is None:
+        R = GetPolynomials(type(points[0]))
+    return SubproductTree.from_points(points, R).interpolate(values)
+
+
+@external
+def fast_chinese_remainder(eqs, mods):
+    """
+        The polynomial x of degree < deg(prod mods) with x = eqs[i] mod mods[i].
+        The moduli must be pairwise coprime polynomials over a field
+    """
+    if len(eqs) != len(mods):
+        raise Exception('Not a proper equation representation')
+
+    tree = SubproductTree(mods)
+    # m mod m_i^2 = m_i * ((m/m_i) mod m_i), for the root m
+    squares = SubproductTree([g*g for g in mods])
+    cs = []
+    for e,g,r in zip(eqs, mods, squares.remainders(tree.root)):
+        # modinv raises ValueError if m/m_i and m_i are not coprime
+        cs.append(e * modinv(r // g, g) % g)
+    return tree.combine(cs)
@@ -8,7 +8,8 @@ from python_alcp.examples.rings import Z
 from python_alcp.examples.more_rings import Q
 from python_alcp.algorithms.factorization import berlekamp_cantor_zassenhaus
 from python_alcp.algorithms.divisibility import eea, gcd
-from python_alcp.utils import assuming, primes, all_factors
+from python_alcp.algorithms.subproduct_tree import SubproductTree, multi_eval
+from python_alcp.utils import assuming, next_prime, all_factors
 
 
 def kronecker(f):
@@ -23,24 +24,29 @@ def kronecker(f):
     #random.shuffle(a)
     f = QX(f)
 
-    if f(a[0]) == Q.zero:
+    # f(a[e]) for every point used below, evaluated together
+    fa = multi_eval(f, a[:max(2, f.deg()//2+1)])
+
+    if fa[0] == Q.zero:
         return QX(-a[0], 1)
-    elif f(a[1]) == Q.zero:
+    elif fa[1] == Q.zero:
         return QX(-a[1], 1)
 
-    M = all_factors(f(a[0]).num).union({1, f(a[0]).num})
+    M = all_factors(fa[0].num).union({1, fa[0].num})
     M = M.union({-x for x in M})
     for e in range(1, f.deg()//2+1):
-        Me = all_factors(f(a[e]).num).union({1, f(a[e]).num})
+        Me = all_factors(fa[e].num).union({1, fa[e].num})
         Me = Me.union({-x for x in Me})
         M = {(a,b) if isinstance(a,int) else (*a,b) for a,b in itertools.product(M, Me)}
         Mp = list(M)
 
+        # Every candidate interpolates at the same points, so the tree
+        # (and its Lagrange weights) is shared
+        tree = SubproductTree.from_points(a[:e+1], QX)
         while len(Mp) > 0:
             ci = random.choice(Mp)
             c = [Q(x) for x in ci]
-            b = _solve_vandermonde(a[:e+1], c)
-            g = QX(b).primitive_part()
+            g = tree.interpolate(c).primitive_part()
             if g.deg() == e and f % g == QX.zero:
                 return g
             Mp.remove(ci)
@@ -49,31 +55,6 @@ def kronecker(f):
 
     return f
 
-def _solve_vandermonde(alpha, b):
-    # Solves the vandermonde system Ax = b, where A is
-    # the vandermonde matrix generated by the vector alpha
-
-    # Dark magic, use forbidden to neophytes
-
-    assert len(alpha) == len(b)
-    n = len(b)
-
-    x = b.copy()
-
-    for k in range(1, n):
-        for i in range(n-1,k-1,-1):
-            x[i] -= x[i-1]
-        for i in range(k,n):
-            x[i] /= alpha[i] - alpha[i-k]
-
-    for k in range(n - 1, 0, -1):
-        for i in range(k-1, n-1):
-            x[i] -= alpha[k-1] * x[i+1]
-
-    return x
-
-            
-
 
 def hensel_lifting(f, g, h, s, t):
     """
@@ -183,15 +164,13 @@ def zx_factorization(f):
 
     L = f.coefs[f.deg()]
 
-    prim = primes()
-    next(prim)
-    p = next(prim)
+    p = next_prime(2)
     while True:
         RX = (Z/(p*Z))["x"]
         f_ = RX.build([a.val for a in f.coefs])
         if L.val % p != 0 and f_.der() != RX.zero and gcd(f_, f_.der()).is_unit():
             break
-        p = next(prim)
+        p = next_prime(p)
 
     factors = berlekamp_cantor_zassenhaus(f_)
 
@@ -1,15 +1,31 @@
 from python_alcp.structures.ideals import GetQuotient
 from python_alcp.structures.polynomials import GetPolynomials
+from python_alcp.structures.zech import GetZechField
 from python_alcp.examples.rings import Z
-from python_alcp.utils import assuming
+from python_alcp.utils import assuming, externals
 
 
-def FiniteField(p, pol = None, var = None):
-    if pol is None:
+def FiniteField(p, pol = None, var = None, table = False, degree = None):
+    """
+        Finite field Z/pZ, or (Z/pZ)[var]/(pol) if pol is given.
+        With degree=n instead of pol, the field of p^n elements is built from
+        a primitive polynomial given by find_irreducible, which needs no
+        checks and is cached.
+        With table=True, pol must be primitive and the elements are
+        stored as logarithms (see structures.zech)
+    """
+    if pol is None and degree is None:
         return GetQuotient(Z, p*Z)
+    Pols = GetPolynomials(Z/(p*Z), var)
+    if pol is None:
+        # Low weight only speeds up the search, the field is built over the dense ring
+        f = Pols(externals.find_irreducible(p, degree, primitive=True).ints)
     else:
-        Pols = GetPolynomials(Z/(p*Z), var)
-        assuming(Pols(pol).is_prime(), f"{Pols(pol)} is not irreducible on {Pols}")
-        if not Pols(pol).is_primitive_field():
-            print(f"Warning: building FF{p**(len(pol)-1)} with a non-primitive polynomial")
-        return GetQuotient(Pols, Pols*Pols(pol))
+        f = Pols(pol)
+        assuming(f.is_prime(), f"{f} is not irreducible on {Pols}")
+        if not table and not f.is_primitive_field(irreducible=True):
+            print(f"Warning: building FF{p**f.deg()} with a non-primitive polynomial")
+
+    if table:
+        return GetZechField(GetQuotient(Pols, Pols*f))
+    return GetQuotient(Pols, Pols*f)
@@ -17,6 +17,8 @@ from python_alcp.structures.rings import Field, FieldElement
 
 class RationalElement(FieldElement):
 
+    __slots__ = ("num", "den")
+
     def __init__(self,num,den = 1):
 
 
@@ -35,7 +37,10 @@ class RationalElement(FieldElement):
 
         self.num = num//g
         self.den = den//g
-        self.val = (self.num, self.den)
+
+    @property
+    def val(self):
+        return (self.num, self.den)
 
     def __repr__(self):
         return self.__str__()
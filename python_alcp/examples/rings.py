@@ -1,10 +1,10 @@
 from math import floor, sqrt
+import operator
 
 from python_alcp.utils import (
     assuming,
-    try_op,
     external,
-    primes,
+    is_probable_prime,
     prime_factors,
     op_typecheck
 )
@@ -22,63 +22,94 @@ from python_alcp.structures.rings import EuclideanDomain, EuclideanDomainElement
         i2 = Z.one + Z.one
 """
 
+def _new_int(cls, val):
+    # Builds an element from a python int, skipping the checks of __init__
+    elem = object.__new__(cls)
+    elem.val = val
+    return elem
+
+
 class IntElement(EuclideanDomainElement):
 
+    # Arithmetic takes a fast path when both operands are elements of the
+    # same ring (or python ints). Other operands are unwrapped through their
+    # val attribute, and errors are reported like try_op does
+
+    __slots__ = ("val",)
+
     def __init__(self,val):
 
+        if type(val) is int:
+            self.val = val
+            return
+
         while hasattr(val, "val"):
             val = val.val
 
         assuming(hasattr(val, "__int__"), f"Can't build an integer from {val}")
         self.val = int(val)
 
+    def _slow_op(self, op, other, op_name):
+        try:
+            o = other
+            while hasattr(o, 'val'):
+                o = o.val
+            return type(self)(op(self.val, o))
+        except (AssertionError, TypeError) as e:
+            raise ValueError(f"Can't {op_name} {self} and {other}: {e}")
+
     def __repr__(self):
         return str(self.val)
 
     def __str__(self):
         return str(self.val)
 
-    @try_op()
     def __add__(self,other):
-        while hasattr(other, 'val'):
-            other = other.val
-        return type(self)(self.val + other)
+        if type(other) is type(self):
+            return _new_int(type(self), self.val + other.val)
+        return self._slow_op(operator.add, other, "add")
 
-    @try_op()
     def __sub__(self,other):
-        while hasattr(other, 'val'):
-            other = other.val
-        return type(self)(self.val - other)
-    
-    @try_op("multiply")
+        if type(other) is type(self):
+            return _new_int(type(self), self.val - other.val)
+        return self._slow_op(operator.sub, other, "sub")
+
+    def __mul__(self,other):
+        if type(other) is type(self) or type(other) is int:
+            return _new_int(type(self), self.val * int(other))
+        return super().__mul__(other)
+
     def inner_mul(self,other):
-        while hasattr(other, 'val'):
-            other = other.val
-        return type(self)(self.val * other)
-    
+        if type(other) is type(self):
+            return _new_int(type(self), self.val * other.val)
+        return self._slow_op(operator.mul, other, "multiply")
+
+    def __pow__(self,other):
+        if type(other) is int and other >= 0:
+            return _new_int(type(self), self.val ** other)
+        return super().__pow__(other)
+
     def __eq__(self,other):
         return isinstance(other, type(self)) and self.val==other.val
 
-    @try_op("divide")
     def __floordiv__(self,other):
-        while hasattr(other, 'val'):
-            other = other.val
-        return type(self)(self.val // other)
+        if type(other) is type(self):
+            return _new_int(type(self), self.val // other.val)
+        return self._slow_op(operator.floordiv, other, "divide")
 
-    @try_op("divide")
     def __truediv__(self,other):
-        while hasattr(other, 'val'):
-            other = other.val
-        return type(self)(self.val / other)
+        return self._slow_op(operator.truediv, other, "divide")
 
-    @try_op("calculate remainder")
     def __mod__(self,other):
-        while hasattr(other, 'val'):
-            other = other.val
-        return type(self)(self.val % other)
-        
+        if type(other) is type(self):
+            return _new_int(type(self), self.val % other.val)
+        return self._slow_op(operator.mod, other, "calculate remainder")
+
     def __neg__(self):
-        return type(self)(-self.val)
+        return _new_int(type(self), -self.val)
+
+    def __int__(self):
+        return self.val
 
     def normal(self):
         if(self.val < 0):
@@ -86,23 +117,18 @@ class IntElement(EuclideanDomainElement):
         else:
             return self 
 
-    def __str__(self):
-        return str(self.val)
-
     def __hash__(self):
         return hash((type(self).__name__, self.val))
 
     def __lt__(self,other):
+        if type(other) is type(self):
+            return self.val < other.val
         while hasattr(other, 'val'):
             other = other.val
         return self.val < other
 
     def is_prime(self):
-        for p in primes():
-            if p**2 > self:
-                return True
-            if self.val % p == 0:
-                return False
+        return is_probable_prime(abs(self.val))
 
     def is_unit(self):
         return self.val == 1 or self.val == -1
@@ -143,7 +169,7 @@ class Integers(EuclideanDomain):
 
 
 
-Z = Integers("\N{DOUBLE-STRUCK CAPITAL Z}", (IntElement,), {})
+Z = Integers("\N{DOUBLE-STRUCK CAPITAL Z}", (IntElement,), {"__slots__": ()})
 external(Z, name="Z")
 
 
@@ -181,6 +207,8 @@ class GaussianIntegers(EuclideanDomain):
 
 class GaussianIntegerElement(EuclideanDomainElement):
 
+    __slots__ = ("a", "b")
+
     def __init__(self,a,b = None, *args, **kw):
         op_typecheck(a,allowed=[int])
         self.a=a
@@ -247,6 +275,9 @@ class GaussianIntegerElement(EuclideanDomainElement):
     
     def __hash__(self):
         return hash((type(self).__name__, self.a, self.b))
+
+    def key(self):
+        return (self.a, self.b)
     
     def is_unit(self):
         return (self.a == 0 and self.b in [-1,1]) or (self.a in [-1,1] and self.b == 0)
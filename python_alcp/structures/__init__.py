@@ -3,4 +3,5 @@ from . import (
     polynomials,
     ideals,
     multipoly,
+    zech,
 )
@@ -2,8 +2,8 @@ from functools import reduce
 from abc import ABC, abstractmethod
 import random
 
-from python_alcp.utils import assuming
-from python_alcp.structures.rings import Ring, RingElement, FieldElement, Field
+from python_alcp.utils import assuming, int_gcd, int_modinv
+from python_alcp.structures.rings import Ring, RingElement, FieldElement, Field, cached_ring
 from python_alcp.utils import external, externals
 
 class Ideal(ABC):
@@ -91,9 +91,8 @@ class Quotient(Ring):
 
     """ Abstract superclass for quotients """
 
-    def __eq__(cls,other):
-        return (hasattr(other, "baseRing") and hasattr(other, "ideal")
-                and cls.baseRing == other.baseRing and cls.ideal == other.ideal)
+    def structure(cls):
+        return ("quotient", cls.baseRing._id, tuple(g.key() for g in cls.ideal.generators))
 
     def __str__(cls):
         return f"({cls.baseRing}/{cls.ideal})"
@@ -150,8 +149,12 @@ class RingQuotientElement(RingElement):
 
     """ A quotient which has a ring structure """
 
+    # val, the representative in baseRing. Declared by the ring (see
+    # GetRingQuotient), Z/nZ stores an int instead
+    __slots__ = ()
+
     def __init__(self, val):
-        while hasattr(val, "val"):
+        while hasattr(val, "val") and not isinstance(val, self.baseRing):
             val = val.val
         return super().__init__(self.reduce_rep(self.baseRing(val)))
     
@@ -190,11 +193,28 @@ class RingQuotientElement(RingElement):
 
     @classmethod
     def reduce_rep(cls, rep):
+        if cls.baseRing.is_polynomial():
+            ctx = cls.modulus_context()
+            if ctx is not None:
+                return ctx.reduce(rep)
         if hasattr(rep, "__mod__"):
             return rep % cls.ideal.generator
         else:
             return rep
 
+    @classmethod
+    def modulus_context(cls):
+        """
+            ModulusContext for the generator of the ideal, built on first use.
+            None if the generator can't be used (non-unit leading coefficient)
+        """
+        if "_modctx" not in cls.__dict__:
+            try:
+                cls._modctx = externals.ModulusContext(cls.ideal.generator)
+            except AssertionError:
+                cls._modctx = None
+        return cls._modctx
+
     def is_unit(self):
         return externals.gcd(self.ring.ideal.generator, self.val).is_unit()
 
@@ -208,6 +228,8 @@ class RingQuotientElement(RingElement):
 class FieldQuotientElement(RingQuotientElement, FieldElement):
     """ A quotient which has a field structure """
 
+    __slots__ = ()
+
     def __truediv__(self, other):
         return self * other.inverse()
 
@@ -248,20 +270,170 @@ class FieldQuotientElement(RingQuotientElement, FieldElement):
     def is_prime(self):
         raise NotImplementedError()
 
+class Zmod(Quotient):
+
+    """ Integers modulo n, Z/nZ """
+
+    def char(cls):
+        return cls.modulus
+
+    def order(cls):
+        return cls.modulus
+
+    def is_finite(cls):
+        return True
+
+    def units(cls):
+        return {cls(k) for k in range(cls.modulus) if int_gcd(k, cls.modulus) == 1}
+
+    def elements(cls):
+        for k in range(cls.modulus):
+            yield cls(k)
+
+class ZmodField(Zmod, FieldQuotient):
+    pass
+
+class ZmodElement(RingQuotientElement):
+
+    """
+        Element of Z/nZ, stored as a python int in [0, n).
+        The arithmetic is done directly on the ints, the quotient of
+        the generic RingQuotientElement is only used for val
+    """
+
+    __slots__ = ("rep",)
+
+    def __init__(self, val):
+        while hasattr(val, "val"):
+            val = val.val
+        self.rep = (val if type(val) is int else int(val)) % self.modulus
+
+    @classmethod
+    def from_int(cls, rep):
+        """ Builds an element from an int already in [0, n) """
+        elem = cls.__new__(cls)
+        elem.rep = rep
+        return elem
+
+    @property
+    def val(self):
+        return self.baseRing(self.rep)
+
+    def _other_rep(self, other):
+        if isinstance(other, ZmodElement):
+            return other.rep
+        elif type(other) is int:
+            return other
+        else:
+            return type(self)(other).rep
+
+    def __add__(self, other):
+        return self.from_int((self.rep + self._other_rep(other)) % self.modulus)
+
+    def __sub__(self, other):
+        return self.from_int((self.rep - self._other_rep(other)) % self.modulus)
+
+    def __neg__(self):
+        return self.from_int(-self.rep % self.modulus)
+
+    def __mul__(self, other):
+        if type(other) is int:
+            return self.from_int(self.rep * other % self.modulus)
+        return super().__mul__(other)
+
+    def inner_mul(self, other):
+        return self.from_int(self.rep * self._other_rep(other) % self.modulus)
+
+    def __pow__(self, other):
+        if type(other) == int:
+            if other < 0:
+                return self.inverse() ** (-other)
+            return self.from_int(pow(self.rep, other, self.modulus))
+
+    def __floordiv__(self, other):
+        return type(self)(self.rep // self._other_rep(other))
+
+    def __mod__(self, other):
+        return type(self)(self.rep % self._other_rep(other))
+
+    def inverse(self):
+        return self.from_int(int_modinv(self.rep, self.modulus))
+
+    def is_unit(self):
+        return int_gcd(self.rep, self.modulus) == 1
+
+    def __eq__(self, other):
+        return isinstance(other, ZmodElement) and self.rep == other.rep and self.modulus == other.modulus
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.rep))
+
+    def key(self):
+        return self.rep
+
+    def __lt__(self, other):
+        return self.rep < self._other_rep(other)
+
+    def __int__(self):
+        return self.rep
+
+    def __str__(self):
+        if self.ring.repr == "reduced":
+            return str(self.rep)
+        else:
+            return f"[{self.rep}]"
+
+class ZmodFieldElement(ZmodElement, FieldQuotientElement):
+
+    __slots__ = ()
+
+    def __floordiv__(self, other):
+        return self.__truediv__(other)
+
+    def __mod__(self, other):
+        return self.ring.zero
+
+    def croot(self):
+        # The Frobenius map is the identity on Z/pZ
+        return self
+
+
+def _is_zmod(ring, ideal):
+    return ring is externals.Z and ideal.generator.val != 0
+
+def _zmod_attrs(ideal):
+    return {'baseRing': ideal.ring, 'ideal': ideal, 'modulus': abs(ideal.generator.val), '__slots__': ()}
+
+def _ideal_key(ring, ideal):
+    # id(ring) and not ring._id: structurally equal rings can still differ in
+    # the variable or the representation, and the quotient keeps ring alive
+    return (id(ring), tuple(g.key() for g in ideal.generators))
+
 @external
 def GetQuotient(ring, ideal):
-    if ring.is_euclidean() and ideal.is_maximal():
-        return GetFieldQuotient(ring, ideal)
-    else:
-        return GetRingQuotient(ring, ideal)
+    # Cached, as deciding whether the ideal is maximal can be costly
+    def build():
+        if ring.is_euclidean() and ideal.is_maximal():
+            return GetFieldQuotient(ring, ideal)
+        else:
+            return GetRingQuotient(ring, ideal)
+    return cached_ring(("quotient", *_ideal_key(ring, ideal)), build)
 
 @external
 def GetRingQuotient(ring, ideal):
-    bases = (RingQuotientElement,)
-    return Quotient(f"{ring}/{ideal}", bases, {'baseRing': ring, 'ideal': ideal})
+    def build():
+        if _is_zmod(ring, ideal):
+            return Zmod(f"{ring}/{ideal}", (ZmodElement,), _zmod_attrs(ideal))
+        bases = (RingQuotientElement,)
+        return Quotient(f"{ring}/{ideal}", bases, {'baseRing': ring, 'ideal': ideal, '__slots__': ("val",)})
+    return cached_ring(("ring_quotient", *_ideal_key(ring, ideal)), build)
 
 @external
 def GetFieldQuotient(ring, ideal):
-    bases = (FieldQuotientElement,)
-    return FieldQuotient(f"{ring}/{ideal}", bases, {'baseRing': ring, 'ideal': ideal})
+    def build():
+        if _is_zmod(ring, ideal):
+            return ZmodField(f"{ring}/{ideal}", (ZmodFieldElement,), _zmod_attrs(ideal))
+        bases = (FieldQuotientElement,)
+        return FieldQuotient(f"{ring}/{ideal}", bases, {'baseRing': ring, 'ideal': ideal, '__slots__': ("val",)})
+    return cached_ring(("field_quotient", *_ideal_key(ring, ideal)), build)
 
@@ -5,7 +5,8 @@ from python_alcp.structures.rings import (
         IntegralDomain,
         EuclideanDomain,
         RingElement,
-        EuclideanDomainElement
+        EuclideanDomainElement,
+        cached_ring
 )
 from python_alcp.utils import (
         assuming,
@@ -85,6 +86,9 @@ def lt_graded_reverse_lex(m1,m2):
 Class representing a Monomial over a set of variables.
 """
 class Monomial():
+
+    __slots__ = ("deg", "vars")
+
     def __init__(self, deg, vars):
         # TYPECHECKING    
         self.deg = tuple(deg)
@@ -174,7 +178,9 @@ def div_poly_RNF(p,F):
 Class representing a multivariate polynomial.
 """
 class MultivariatePolynomial(RingElement):
-    
+
+    __slots__ = ("coefs",)
+
     def __init__(self,coefs,monomials=[],is_dict=False):
         # TYPECHECKING IS IMPORTANT HERE
         if not is_dict:
@@ -297,15 +303,17 @@ class MultivariatePolynomial(RingElement):
     def __hash__(self):
         return hash((type(self).__name__, str(self.coefs)))
 
+    def key(self):
+        return tuple((m.deg, c.key()) for m,c in self.coefs.items())
+
 # Polynomials over integral domains
 """
 Class representing a multivariate polynomial ring.
 """
 class MultivariatePolynomialRing(Ring):
     
-    def __eq__(cls, other):
-        return hasattr(other, "coefRing") and cls.coefRing == other.coefRing and ...
-        hasattr(other, "vars") and cls.vars == other.vars
+    def structure(cls):
+        return ("multipoly", cls.coefRing._id, tuple(cls.vars))
 
     def char(cls):
         return cls.coefRing.char()
@@ -330,11 +338,11 @@ class MultivariatePolynomialRing(Ring):
     
     def monomial(cls,deg):
         return Monomial(deg,cls.vars)
-        
-    def __hash__(cls):
-        return hash((type(cls).__name__, type(cls.coefRing).__name__, str(cls.vars)))
-        
+
+
 @external
 def GetMultiPoly(ring, vars):
-    attrs = {"coefRing": ring, "vars": vars}
-    return MultivariatePolynomialRing(f"{ring}[{vars}]", (MultivariatePolynomial,), attrs)
+    def build():
+        attrs = {"coefRing": ring, "vars": vars}
+        return MultivariatePolynomialRing(f"{ring}[{vars}]", (MultivariatePolynomial,), attrs)
+    return cached_ring(("multipoly", id(ring), tuple(vars)), build)
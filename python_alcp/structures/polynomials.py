@@ -1,3 +1,4 @@
+from heapq import heapify, heappop, heappush
 from itertools import zip_longest
 
 from python_alcp.structures.rings import (
@@ -5,14 +6,17 @@ from python_alcp.structures.rings import (
         IntegralDomain,
         EuclideanDomain,
         RingElement,
-        EuclideanDomainElement
+        EuclideanDomainElement,
+        cached_ring
 )
 from python_alcp.utils import (
         assuming,
         print_superscript,
         external,
         externals,
-        prime_factors
+        prime_factors,
+        int_gcd,
+        int_modinv
 )
 
 VARS = ["X","Y","Z","T","U","V"] # Could be extended arbitrarily with sub indexing
@@ -27,8 +31,9 @@ def addAll(l,neutral):
 # Polynomials over integral domains
 class PolynomialRing(Ring):
 
-    def __eq__(cls, other):
-        return hasattr(other, "coefRing") and cls.coefRing == other.coefRing
+    def structure(cls):
+        # The variable is not part of the structure
+        return ("polynomials", cls.coefRing._id)
 
     def char(cls):
         return cls.coefRing.char()
@@ -67,6 +72,11 @@ class PolynomialED(PolynomialRing, EuclideanDomain):
 
 class PolynomialRingElement(RingElement):
 
+    # val, the coefficients as a tuple in increasing degree order. The
+    # slots are declared by each ring (see _build_polynomials), so the
+    # other representations don't keep an unused val
+    __slots__ = ()
+
     def __init__(self,*val):
         R = type(self).coefRing
 
@@ -78,14 +88,17 @@ class PolynomialRingElement(RingElement):
             while hasattr(val, "val") and hasattr(val.val, "__iter__"):
                 val = val.val
 
-        cs = [c if isinstance(c,R) else R(c) for c in val]
+        cs = [c if isinstance(c,R) else R.constant(c) if type(c) is int else R(c) for c in val]
 
         while len(cs) > 0 and cs[-1] == R.zero:
             cs.pop()
 
         self.val = tuple(cs)
-        self.coefs = tuple(cs)
-    
+
+    @property
+    def coefs(self):
+        return self.val
+
     def deg(self):
         return len(self.val)-1
     
@@ -104,10 +117,11 @@ class PolynomialRingElement(RingElement):
         if not hasattr(other, "val") or not hasattr(other.val, "__iter__"):
             other = type(self)(other)
         R = type(self).coefRing
-        newcs = [R.zero] * (self.deg() + other.deg() + 1)
-        for i,v in enumerate(self.val):
-            for j,w in enumerate(other.val):
-                newcs[i+j] += v*w
+        if R is externals.Z:
+            # Integer coefficients, multiply the python ints directly
+            newcs = externals.int_poly_mul([c.val for c in self.val], [c.val for c in other.val])
+        else:
+            newcs = externals.karatsuba_mul(self.val, other.val, R.zero)
 
         return type(self)(newcs)
 
@@ -126,6 +140,11 @@ class PolynomialRingElement(RingElement):
         quot, rem = polynomial_division(self, other)
         return rem
 
+    def __divmod__(self, other):
+        if not hasattr(other, "val") or not hasattr(other.val, "__iter__"):
+            other = type(self)(other)
+        return polynomial_division(self, other)
+
                 
     def __eq__(self,other):
         return hasattr(other, "val") and self.val == other.val
@@ -225,6 +244,8 @@ class PolynomialRingElement(RingElement):
 
 class PolynomialEDElement(PolynomialRingElement, EuclideanDomainElement):
 
+    __slots__ = ()
+
     def __floordiv__(self, other):
         if not hasattr(other, "val") or not hasattr(other.val, "__iter__"):
             other = type(self)(other)
@@ -257,25 +278,839 @@ class PolynomialEDElement(PolynomialRingElement, EuclideanDomainElement):
 
         return R.build(newc)
 
-    def is_primitive_field(self):
-        if not self.is_prime():
+    def is_primitive_field(self, irreducible=False):
+        """ Whether x generates the multiplicative group of R[x]/(self), irreducible skips that check """
+        R = type(self)
+        if not R.coefRing.is_finite():
             return False
-        if not type(self).coefRing.is_finite():
+        if not (irreducible or self.is_prime()):
             return False
 
-        F = externals.GetFieldQuotient(type(self), type(self)*self)
-        O = F.order()-1
+        O = R.coefRing.order()**self.deg()-1
         factors = prime_factors(O)
-        x = F.generator()
+        x = R.build([R.coefRing.zero, R.coefRing.one])
 
         for f in factors.keys():
-            if x**(O//f) == F.one:
+            if externals.powmod(x, O//f, self) == R.one:
                 return False
 
         return True
 
 
 
+class ModularPolynomialElement(PolynomialRingElement):
+    """
+        Polynomial with coefficients in Z/nZ.
+        The coefficients are kept as a tuple of python ints in [0, n), so
+        operations work on plain integers and reduce modulo n once per pass.
+        The boxed coefficients (val, coefs) are only built when requested.
+    """
+
+    # ints and _boxed, declared by the ring
+    __slots__ = ()
+
+    def __init__(self, *val):
+        n = type(self).modulus
+
+        if len(val) == 1:
+            val = val[0]
+            if isinstance(val, ModularPolynomialElement):
+                val = val.ints
+            elif hasattr(val, "coefs"):
+                val = val.coefs
+            elif not hasattr(val, "__iter__"):
+                val = (val,)
+
+        cs = [(c if type(c) is int else int(c)) % n for c in val]
+
+        while len(cs) > 0 and cs[-1] == 0:
+            cs.pop()
+
+        self.ints = tuple(cs)
+        self._boxed = None
+
+    @classmethod
+    def from_ints(cls, cs):
+        """
+            Builds a polynomial from a list of ints already reduced modulo n.
+            Note: modifies cs in place
+        """
+        while len(cs) > 0 and cs[-1] == 0:
+            cs.pop()
+        pol = cls.__new__(cls)
+        pol.ints = tuple(cs)
+        pol._boxed = None
+        return pol
+
+    @property
+    def val(self):
+        if self._boxed is None:
+            R = type(self).coefRing
+            self._boxed = tuple(map(R.constant, self.ints))
+        return self._boxed
+
+    @property
+    def coefs(self):
+        return self.val
+
+    def _coerce(self, other):
+        if isinstance(other, ModularPolynomialElement) and other.modulus == self.modulus:
+            return other
+        return type(self)(other)
+
+    def deg(self):
+        return len(self.ints)-1
+
+    def __add__(self, other):
+        a, b = self.ints, self._coerce(other).ints
+        n = self.modulus
+        if len(a) < len(b):
+            a, b = b, a
+        cs = list(a)
+        for i,c in enumerate(b):
+            cs[i] = (cs[i] + c) % n
+        return type(self).from_ints(cs)
+
+    def __sub__(self, other):
+        a, b = self.ints, self._coerce(other).ints
+        n = self.modulus
+        cs = list(a) + [0] * (len(b) - len(a))
+        for i,c in enumerate(b):
+            cs[i] = (cs[i] - c) % n
+        return type(self).from_ints(cs)
+
+    def __neg__(self):
+        n = self.modulus
+        return type(self).from_ints([(n - c) % n for c in self.ints])
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            n = self.modulus
+            return type(self).from_ints([c*other % n for c in self.ints])
+        return super().__mul__(other)
+
+    def inner_mul(self, other):
+        n = self.modulus
+        cs = _mul_ints(self.ints, self._coerce(other).ints)
+        return type(self).from_ints([c % n for c in cs])
+
+    def __divmod__(self, other):
+        other = self._coerce(other)
+        if other.ints == ():
+            raise ValueError("Can't divide polynomial by 0")
+        try:
+            quot, rem = _divmod_ints(self.ints, other.ints, self.modulus)
+        except ValueError:
+            # Leading coefficient is not a unit, use the generic algorithm
+            return polynomial_division(self, other)
+        return type(self).from_ints(quot), type(self).from_ints(rem)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def __eq__(self, other):
+        if isinstance(other, ModularPolynomialElement):
+            return self.modulus == other.modulus and self.ints == other.ints
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.ints))
+
+    def key(self):
+        return self.ints
+
+    def der(self):
+        n = self.modulus
+        return type(self).from_ints([i*c % n for i,c in enumerate(self.ints) if i > 0])
+
+    def eval(self, elem):
+        n = self.modulus
+        x = int(type(self).coefRing(elem))
+        res = 0
+        for c in reversed(self.ints):
+            res = (res*x + c) % n
+        return type(self).coefRing(res)
+
+    def is_unit(self):
+        return self.deg() == 0 and int_gcd(self.ints[0], self.modulus) == 1
+
+    def monic(self):
+        """ Divides the polynomial by its leading coefficient """
+        n = self.modulus
+        inv = int_modinv(self.ints[-1], n)
+        return type(self).from_ints([c*inv % n for c in self.ints])
+
+
+class ModularPolynomialEDElement(ModularPolynomialElement, PolynomialEDElement):
+    """ Polynomial with coefficients in Z/pZ, p prime """
+
+    __slots__ = ()
+
+    def is_unit(self):
+        return self.deg() == 0
+
+    def normal(self):
+        if len(self.ints) == 0 or self.ints[-1] == 1:
+            return self
+        return self.monic()
+
+    def croot(self):
+        # The Frobenius map is the identity on Z/pZ
+        p = self.modulus
+        return type(self).from_ints(list(self.ints[::p]))
+
+
+class GF2PolynomialElement(ModularPolynomialEDElement):
+    """
+        Polynomial over Z/2Z, stored as a single python int whose bit i
+        is the coefficient of x^i. Addition is XOR, multiplication is a
+        carry-less product and division is done with shifts and XORs.
+        ints (and the boxed val, coefs) are built on demand
+    """
+
+    # bits and _boxed, declared by the ring
+    __slots__ = ()
+
+    def __init__(self, *val):
+        if len(val) == 1 and isinstance(val[0], GF2PolynomialElement):
+            self.bits = val[0].bits
+            self._boxed = None
+        else:
+            super().__init__(*val)
+
+    @property
+    def ints(self):
+        b = self.bits
+        return tuple(map(int, reversed(bin(b)[2:]))) if b else ()
+
+    @ints.setter
+    def ints(self, cs):
+        self.bits = int("".join(map(str, reversed(cs))), 2) if cs else 0
+        self._boxed = None
+
+    @classmethod
+    def from_ints(cls, cs):
+        pol = cls.__new__(cls)
+        pol.ints = [c & 1 for c in cs]
+        return pol
+
+    @classmethod
+    def from_bits(cls, bits):
+        """ Builds a polynomial from its bit representation """
+        pol = cls.__new__(cls)
+        pol.bits = bits
+        pol._boxed = None
+        return pol
+
+    def _coerce(self, other):
+        if isinstance(other, GF2PolynomialElement):
+            return other
+        return type(self)(other)
+
+    def deg(self):
+        return self.bits.bit_length() - 1
+
+    def __add__(self, other):
+        return self.from_bits(self.bits ^ self._coerce(other).bits)
+
+    def __sub__(self, other):
+        return self.from_bits(self.bits ^ self._coerce(other).bits)
+
+    def __neg__(self):
+        return self
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return self if other % 2 else type(self).zero
+        return super().__mul__(other)
+
+    def inner_mul(self, other):
+        other = self._coerce(other)
+        if other is self:
+            return self.from_bits(_gf2_square(self.bits))
+        return self.from_bits(_gf2_mul(self.bits, other.bits))
+
+    def __divmod__(self, other):
+        b = self._coerce(other).bits
+        if b == 0:
+            raise ValueError("Can't divide polynomial by 0")
+        quot, rem = _gf2_divmod(self.bits, b)
+        return self.from_bits(quot), self.from_bits(rem)
+
+    def __eq__(self, other):
+        if isinstance(other, GF2PolynomialElement):
+            return self.bits == other.bits
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.bits))
+
+    def key(self):
+        return self.bits
+
+    def der(self):
+        # Only the odd powers survive, x^(2k+1) -> x^(2k)
+        b = self.bits >> 1
+        return self.from_bits(b & int("5" * (b.bit_length() // 4 + 1), 16))
+
+    def eval(self, elem):
+        x = int(type(self).coefRing(elem))
+        b = self.bits if x % 2 else self.bits & 1
+        return type(self).coefRing(bin(b).count("1"))
+
+    def is_unit(self):
+        return self.bits == 1
+
+    def monic(self):
+        assuming(self.bits != 0, "Can't invert non-unit")
+        return self
+
+    def normal(self):
+        return self
+
+    def croot(self):
+        # Keeps the coefficients of the even powers
+        b = self.bits
+        return self.from_bits(int(bin(b)[2:][::-1][::2][::-1], 2) if b else 0)
+
+
+# Sparse polynomials of at least this degree are built as dense polynomials
+# when more than a SPARSE_MAX_FILL fraction of their coefficients is nonzero
+SPARSE_MIN_DEGREE = 64
+SPARSE_MAX_FILL = 1/8
+
+
+class SparsePolynomialElement(PolynomialRingElement):
+    """
+        Polynomial stored as a dict {exponent: coefficient} of its nonzero
+        terms, for high degree polynomials with few terms, like x^(p^n) or
+        the trinomials used to build finite fields.
+        Each sparse ring subclasses the dense ring over the same coefficients
+        (cls.dense), so the dense methods still work on sparse polynomials,
+        and mixed operations go through the sparse side. Polynomials that
+        are too dense (see SPARSE_MAX_FILL) are built as elements of the
+        dense ring instead, both when constructing and in the results of
+        the operations.
+        val, coefs, ints and bits are the dense representations, built on demand
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *val):
+        if len(val) == 0:
+            return super().__new__(cls)
+        if len(val) == 1 and type(val[0]) is cls.dense:
+            return cls._from_dense(val[0])
+        return cls.from_terms(_sparse_terms(cls, val))
+
+    def __init__(self, *val):
+        # Built in __new__
+        pass
+
+    @classmethod
+    def from_terms(cls, terms):
+        """
+            Polynomial with the given {exponent: nonzero coefficient} terms.
+            terms is not copied
+        """
+        d = max(terms) if terms else -1
+        if d >= SPARSE_MIN_DEGREE and len(terms) > SPARSE_MAX_FILL*(d+1):
+            cs = [cls.coefRing.zero] * (d+1)
+            for e,c in terms.items():
+                cs[e] = c
+            return cls.dense(cs)
+        pol = object.__new__(cls)
+        pol.terms = terms
+        return pol
+
+    @classmethod
+    def from_ints(cls, cs):
+        return cls(list(cs))
+
+    @classmethod
+    def from_bits(cls, bits):
+        return cls.from_terms(_bit_terms(bits, cls.coefRing.one))
+
+    @classmethod
+    def _from_dense(cls, pol):
+        # Keeps the dense polynomial pol unless it is sparse enough
+        d = pol.deg()
+        if d >= SPARSE_MIN_DEGREE and _nonzero_terms(pol) > SPARSE_MAX_FILL*(d+1):
+            return pol
+        return cls.from_terms(_sparse_terms(cls, (pol,)))
+
+    def _terms(self, other):
+        if isinstance(other, SparsePolynomialElement):
+            return other.terms
+        return _sparse_terms(type(self), (other,))
+
+    @property
+    def val(self):
+        cs = [self.coefRing.zero] * (self.deg()+1)
+        for e,c in self.terms.items():
+            cs[e] = c
+        return tuple(cs)
+
+    @property
+    def ints(self):
+        return tuple(map(int, self.val))
+
+    @property
+    def bits(self):
+        b = 0
+        for e,c in self.terms.items():
+            if int(c) & 1:
+                b |= 1 << e
+        return b
+
+    def deg(self):
+        return max(self.terms) if self.terms else -1
+
+    def _add(self, other, sign):
+        terms = dict(self.terms)
+        zero = self.coefRing.zero
+        for e,c in self._terms(other).items():
+            v = terms.get(e)
+            if v is None:
+                terms[e] = c if sign > 0 else -c
+            else:
+                v = v + c if sign > 0 else v - c
+                if v == zero:
+                    del terms[e]
+                else:
+                    terms[e] = v
+        return type(self).from_terms(terms)
+
+    def __add__(self, other):
+        return self._add(other, 1)
+
+    def __radd__(self, other):
+        return self._add(other, 1)
+
+    def __sub__(self, other):
+        return self._add(other, -1)
+
+    def __rsub__(self, other):
+        return -self._add(other, -1)
+
+    def __neg__(self):
+        return type(self).from_terms({e: -c for e,c in self.terms.items()})
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            R = self.coefRing
+            k = R(other)
+            terms = {e: c*k for e,c in self.terms.items()}
+            return type(self).from_terms({e: c for e,c in terms.items() if c != R.zero})
+        return super().__mul__(other)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def inner_mul(self, other):
+        cls = type(self)
+        a, b = self.terms, self._terms(other)
+        if not a or not b:
+            return cls.zero
+        da, db = max(a), max(b)
+        if len(a)*len(b) > SPARSE_MAX_FILL*(da+1)*(db+1):
+            # The product is (probably) dense, use the dense algorithms
+            return cls._from_dense(cls.dense(self.val) * cls.dense(other))
+
+        zero = self.coefRing.zero
+        terms = {}
+        for i,c in a.items():
+            for j,d in b.items():
+                terms[i+j] = terms.get(i+j, zero) + c*d
+        return cls.from_terms({e: c for e,c in terms.items() if c != zero})
+
+    def __pow__(self, other):
+        if type(other) is not int or other < 0:
+            return RingElement.__pow__(self, other)
+        if len(self.terms) == 1:
+            # Monomials, c x^e
+            (e, c), = self.terms.items()
+            return type(self).from_terms({e*other: c**other})
+        # Square and multiply with the operators, as the powers may be dense
+        res, base = type(self).one, self
+        while other:
+            if other & 1:
+                res = res * base
+            other >>= 1
+            if other:
+                base = base * base
+        return res
+
+    def __divmod__(self, other):
+        cls = type(self)
+        quot, rem = _sparse_divmod(cls.coefRing, self.terms, self._terms(other))
+        return cls.from_terms(quot), cls.from_terms(rem)
+
+    def __rdivmod__(self, other):
+        cls = type(self)
+        if isinstance(other, ModularPolynomialElement) and not isinstance(other, SparsePolynomialElement):
+            # Dense dividend modulo n, fold it with the few terms of self
+            D = cls.dense
+            if isinstance(other, GF2PolynomialElement):
+                quot, rem = _fold_divmod_bits(other.bits, list(self.terms))
+                return cls._from_dense(D.from_bits(quot)), cls._from_dense(D.from_bits(rem))
+            lc = int(self.terms[self.deg()])
+            if int_gcd(lc, cls.modulus) == 1:
+                b = {e: int(c) for e,c in self.terms.items()}
+                quot, rem = _fold_divmod_ints(other.ints, b, cls.modulus)
+                return cls._from_dense(D.from_ints(quot)), cls._from_dense(D.from_ints(rem))
+        quot, rem = _sparse_divmod(cls.coefRing, self._terms(other), self.terms)
+        return cls.from_terms(quot), cls.from_terms(rem)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __rfloordiv__(self, other):
+        return self.__rdivmod__(other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def __rmod__(self, other):
+        return self.__rdivmod__(other)[1]
+
+    def __eq__(self, other):
+        if isinstance(other, SparsePolynomialElement):
+            return self.terms == other.terms
+        if isinstance(other, (int, PolynomialRingElement, self.coefRing)):
+            return self.terms == self._terms(other)
+        return False
+
+    # Equal sparse and dense polynomials must hash (and key) the same, so
+    # both go through the dense form, built for the occasion
+    def __hash__(self):
+        return type(self).dense.__hash__(self)
+
+    def key(self):
+        return type(self).dense.key(self)
+
+    def __str__(self):
+        var = type(self).var
+        terms = sorted(self.terms.items(), reverse=True)
+        if type(self).repr == "reduced":
+            if not terms:
+                return "0"
+            one = self.coefRing.one
+            reps = [f"{'' if c == one and e > 0 else repr(c)}{var if e > 0 else ''}{print_superscript(e) if e > 1 else ''}" for e,c in terms]
+            return " + ".join(reps)
+        else:
+            if not terms:
+                return "(0)"
+            reps = [f"{repr(c)}{'*' if e > 0 else ''}{var if e > 0 else ''}{'^' if e > 1 else ''}{e if e > 1 else ''}" for e,c in terms]
+            return "(" + " + ".join(reps) + ")"
+
+    def der(self):
+        zero = self.coefRing.zero
+        terms = {e-1: c*e for e,c in self.terms.items() if e > 0}
+        return type(self).from_terms({e: c for e,c in terms.items() if c != zero})
+
+    def eval(self, elem):
+        x = self.coefRing(elem)
+        res = self.coefRing.zero
+        for e,c in self.terms.items():
+            res = res + c * x**e
+        return res
+
+    def is_unit(self):
+        return self.deg() == 0 and self.terms[0].is_unit()
+
+    def monic(self):
+        """ Divides the polynomial by its leading coefficient """
+        inv = self.terms[self.deg()].inverse()
+        return type(self).from_terms({e: c*inv for e,c in self.terms.items()})
+
+    def normal(self):
+        if not self.terms:
+            return self
+        lc = self.terms[self.deg()]
+        nf = lc.normal()
+        if nf == lc:
+            return self
+        div = lc / nf
+        return type(self).from_terms({e: c / div for e,c in self.terms.items()})
+
+
+def _nonzero_terms(pol):
+    # Number of nonzero coefficients of the dense polynomial pol
+    if isinstance(pol, GF2PolynomialElement):
+        return bin(pol.bits).count("1")
+    if isinstance(pol, ModularPolynomialElement):
+        return len(pol.ints) - pol.ints.count(0)
+    zero = type(pol).coefRing.zero
+    return sum(c != zero for c in pol.coefs)
+
+
+def _bit_terms(bits, one):
+    # Terms of the polynomial over Z/2Z with the given bits
+    terms = {}
+    while bits:
+        low = bits & -bits
+        terms[low.bit_length() - 1] = one
+        bits ^= low
+    return terms
+
+
+def _sparse_terms(cls, val):
+    """
+        {exponent: nonzero coefficient} terms of the polynomial of the ring
+        cls given by val, as accepted by the polynomial constructors, or
+        by a dict of terms
+    """
+    R = cls.coefRing
+    if len(val) == 1:
+        val = val[0]
+        if isinstance(val, SparsePolynomialElement):
+            if val.coefRing is R:
+                return val.terms
+            items = val.terms.items()
+        elif isinstance(val, dict):
+            items = val.items()
+        elif isinstance(val, GF2PolynomialElement) and R.modulus == 2:
+            return _bit_terms(val.bits, R.one)
+        elif isinstance(val, ModularPolynomialElement):
+            items = enumerate(val.ints)
+        elif hasattr(val, "coefs"):
+            items = enumerate(val.coefs)
+        elif hasattr(val, "__iter__"):
+            items = enumerate(val)
+        else:
+            items = ((0, val),)
+    else:
+        items = enumerate(val)
+
+    terms = {}
+    for e,c in items:
+        if not isinstance(c, R):
+            c = R.constant(c) if type(c) is int else R(c)
+        if c != R.zero:
+            terms[e] = c
+    return terms
+
+
+def _fold_divmod_ints(a, b, n):
+    """
+        Division of the dense polynomial a (list of ints modulo n) by the
+        sparse b ({exponent: int}), with invertible leading coefficient.
+        Writing b/lc = x^d + g, a = hi*x^d + lo = hi*(b/lc) + (lo - hi*g),
+        and a is folded like that until its degree is below d.
+        Returns (quotient, remainder) as lists of reduced ints
+    """
+    d = max(b)
+    inv = int_modinv(b[d], n)
+    g = [(j, c*inv % n) for j,c in b.items() if j != d]
+
+    rem = list(a)
+    quot = [0] * max(len(a) - d, 0)
+    while len(rem) > d:
+        hi = rem[d:]
+        del rem[d:]
+        for i,h in enumerate(hi):
+            quot[i] += h
+        for j,c in g:
+            end = j + len(hi)
+            if end > len(rem):
+                rem += [0] * (end - len(rem))
+            rem[j:end] = [(r - c*h) % n for r,h in zip(rem[j:end], hi)]
+        while rem and rem[-1] == 0:
+            rem.pop()
+
+    return [q*inv % n for q in quot], rem
+
+
+def _fold_divmod_bits(a, b):
+    """
+        Same as _fold_divmod_ints over Z/2Z, for a given by its bits and
+        b by the list of its exponents
+    """
+    d = max(b)
+    g = [j for j in b if j != d]
+    mask = (1 << d) - 1
+    quot = 0
+    while a >> d:
+        hi = a >> d
+        a &= mask
+        quot ^= hi
+        for j in g:
+            a ^= hi << j
+    return quot, a
+
+
+def _sparse_divmod(R, a, b):
+    """
+        Long division of the polynomials with terms {exponent: coefficient}
+        a and b, over the ring R. Each step only goes through the nonzero
+        terms of b. Returns the terms of the quotient and the remainder
+    """
+
+    if not b:
+        raise ValueError("Can't divide polynomial by 0")
+
+    db = max(b)
+    lc = b[db]
+    inv = lc.inverse() if lc.is_unit() else None
+    tail = [(j, c) for j,c in b.items() if j != db]
+
+    rem = dict(a)
+    quot = {}
+    # Exponents of rem that can still be divided, lazily removed
+    heap = [-e for e in rem if e >= db]
+    heapify(heap)
+
+    while heap:
+        e = -heappop(heap)
+        c = rem.pop(e, None)
+        if c is None:
+            continue
+        if inv is not None:
+            t = c * inv
+        else:
+            t = c // lc
+            if t * lc != c:
+                raise ValueError(f"Division undefined in {R}")
+        k = e - db
+        quot[k] = t
+        for j,d in tail:
+            i = k + j
+            v = rem.get(i)
+            v = -(t*d) if v is None else v - t*d
+            if v == R.zero:
+                rem.pop(i, None)
+            else:
+                if i not in rem and i >= db:
+                    heappush(heap, -i)
+                rem[i] = v
+
+    return quot, rem
+
+
+# Operands of at least this many bits are multiplied with Karatsuba
+GF2_KARATSUBA_BITS = 2048
+
+# _SPREAD[b] has the bits of the byte b in the even positions
+_SPREAD = [int(bin(b)[2:].replace("", "0")[:-1] or "0", 2).to_bytes(2, "little") for b in range(256)]
+
+def _gf2_square(a):
+    """ Square of a polynomial over Z/2Z, spreading its bits """
+    if a == 0:
+        return 0
+    data = a.to_bytes((a.bit_length() + 7) // 8, "little")
+    return int.from_bytes(b"".join([_SPREAD[b] for b in data]), "little")
+
+
+def _gf2_mul(a, b):
+    """
+        Carry-less product of the bit representations a and b.
+        Uses a 4 bit window over the shortest operand, and Karatsuba
+        for long operands
+    """
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    if b == 0:
+        return 0
+
+    if b.bit_length() >= GF2_KARATSUBA_BITS:
+        k = a.bit_length() // 2
+        if b.bit_length() > k:
+            mask = (1 << k) - 1
+            a0, a1 = a & mask, a >> k
+            b0, b1 = b & mask, b >> k
+            z0 = _gf2_mul(a0, b0)
+            z2 = _gf2_mul(a1, b1)
+            z1 = _gf2_mul(a0 ^ a1, b0 ^ b1) ^ z0 ^ z2
+            return z0 ^ (z1 << k) ^ (z2 << 2*k)
+
+    # table[w] = a * w for all polynomials w of degree < 4
+    table = [0, a, a << 1, 0, a << 2, 0, 0, 0, a << 3, 0, 0, 0, 0, 0, 0, 0]
+    for w in (3, 5, 6, 7, 9, 10, 11, 12, 13, 14, 15):
+        table[w] = table[w & -w] ^ table[w & (w - 1)]
+
+    res = 0
+    shift = 0
+    while b:
+        res ^= table[b & 15] << shift
+        b >>= 4
+        shift += 4
+    return res
+
+
+def _gf2_divmod(a, b):
+    """ Quotient and remainder of the bit representations a and b """
+    db = b.bit_length()
+    quot = 0
+    while a.bit_length() >= db:
+        s = a.bit_length() - db
+        quot |= 1 << s
+        a ^= b << s
+    return quot, a
+
+
+KRONECKER_THRESHOLD = 8
+
+def _mul_ints(a, b):
+    """
+        Product of two polynomials given as lists of nonnegative ints, without
+        any modular reduction.
+        Small inputs use the schoolbook product. Larger ones are packed into a
+        single integer (Kronecker substitution), so the whole convolution is
+        done by one big integer multiplication.
+    """
+
+    if len(a) == 0 or len(b) == 0:
+        return []
+
+    if min(len(a), len(b)) < KRONECKER_THRESHOLD:
+        cs = [0] * (len(a) + len(b) - 1)
+        for i,x in enumerate(a):
+            if x:
+                for j,y in enumerate(b):
+                    cs[i+j] += x*y
+        return cs
+
+    # Each coefficient of the product is bounded by min(len)*max(a)*max(b)
+    bound = min(len(a), len(b)) * max(a) * max(b)
+    size = (bound.bit_length() + 8) // 8
+
+    A = int.from_bytes(b"".join(x.to_bytes(size, "little") for x in a), "little")
+    B = int.from_bytes(b"".join(y.to_bytes(size, "little") for y in b), "little")
+
+    l = len(a) + len(b) - 1
+    C = (A*B).to_bytes(l*size, "little")
+    return [int.from_bytes(C[i:i+size], "little") for i in range(0, l*size, size)]
+
+
+def _divmod_ints(a, b, n):
+    """
+        Long division of polynomials given as lists of ints modulo n.
+        The leading coefficient of b must be invertible modulo n.
+        Returns (quotient, remainder) as lists of reduced ints
+    """
+
+    db = len(b) - 1
+    if len(a) <= db:
+        return [], [c % n for c in a]
+
+    inv = int_modinv(b[-1], n)
+    rem = list(a)
+    quot = [0] * (len(a) - db)
+
+    for k in range(len(a) - 1 - db, -1, -1):
+        c = rem[k+db] % n * inv % n
+        if c:
+            quot[k] = c
+            for j in range(db):
+                rem[k+j] -= c*b[j]
+
+    return quot, [c % n for c in rem[:db]]
+
+
 def polynomial_division(a, b, pseudo = False):
     """ 
         Computes a // b, where a and b are polynomials.
@@ -320,7 +1155,12 @@ def polynomial_division(a, b, pseudo = False):
     return type(a)(quot), type(a)(rem)
 
 @external
-def GetPolynomials(ring, var = None):
+def GetPolynomials(ring, var = None, sparse = False):
+    """
+        Polynomials over ring in the variable var. With sparse, the
+        polynomials are stored as their nonzero terms, see
+        SparsePolynomialElement
+    """
     if var is None:
         if hasattr(ring, "chain"):
             var = VARS[ring.chain+1]
@@ -338,7 +1178,37 @@ def GetPolynomials(ring, var = None):
             vars = [ring.var]
         return externals.GetMultiPoly(ring.coefRing, vars+[var])
 
+    return _polynomials(ring, var, chain, sparse)
+
+def _polynomials(ring, var, chain, sparse):
+    # The coefficient ring itself (see _ideal_key), the polynomials keep it alive
+    key = ("poly", id(ring), var, chain, sparse)
+    if sparse:
+        def build():
+            # Subclass of the dense ring, see SparsePolynomialElement. The
+            # terms go in the first slot of the dense ring, that the sparse
+            # polynomials don't use otherwise
+            dense = _polynomials(ring, var, chain, False)
+            attrs = {"dense": dense, "terms": vars(dense)[dense.__slots__[0]]}
+            return type(dense)(dense.__name__, (SparsePolynomialElement, dense), attrs)
+        return cached_ring(key, build)
+    return cached_ring(key, lambda: _build_polynomials(ring, var, chain))
+
+def _build_polynomials(ring, var, chain):
     attrs = {"coefRing": ring, "var": var, "chain": chain}
+    if getattr(ring, "baseRing", None) is externals.Z and int(ring.ideal.generator) not in (-1, 0, 1):
+        # Z/nZ, coefficients are stored as machine integers
+        attrs["modulus"] = abs(int(ring.ideal.generator))
+        if attrs["modulus"] == 2:
+            # Z/2Z, coefficients are stored as the bits of an int
+            attrs["__slots__"] = ("bits", "_boxed")
+            return PolynomialED(f"{ring}[{var}]", (GF2PolynomialElement,), attrs)
+        attrs["__slots__"] = ("ints", "_boxed")
+        if ring.is_field():
+            return PolynomialED(f"{ring}[{var}]", (ModularPolynomialEDElement,), attrs)
+        else:
+            return PolynomialRing(f"{ring}[{var}]", (ModularPolynomialElement,), attrs)
+    attrs["__slots__"] = ("val",)
     if ring.is_field():
         return PolynomialED(f"{ring}[{var}]", (PolynomialEDElement,), attrs)
     else:
@@ -1,6 +1,7 @@
 from abc import abstractmethod
+from itertools import count
 from math import floor, sqrt
-import random
+from weakref import WeakValueDictionary
 
 from python_alcp.utils import (
         assuming,
@@ -10,17 +11,72 @@ from python_alcp.utils import (
         externals
 )
 
+# Ring.constant(n) interns the elements n in [-SMALL_INT_CACHE, SMALL_INT_CACHE)
+SMALL_INT_CACHE = 256
+
+# Rings built by the Get* constructors, by structural key. Entries are
+# dropped when the ring is no longer referenced
+_ring_registry = WeakValueDictionary()
+
+
+class _RingId():
+    # Shared by the rings with the same structure, while any of them lives
+    __slots__ = ("id", "__weakref__")
+
+    def __init__(self, id):
+        self.id = id
+
+
+# Structural id of each live ring structure, see Ring.structure. The ids
+# are never reused, so a structure seen again after its rings are gone
+# gets a new one
+_ring_ids = WeakValueDictionary()
+_next_ring_id = count()
+
+
+def cached_ring(key, build):
+    """
+        Returns the ring registered under key, calling build() to create
+        it the first time, so that equal constructions share the ring
+        (and its cached data)
+    """
+    R = _ring_registry.get(key)
+    if R is None:
+        R = build()
+        _ring_registry[key] = R
+    return R
+
+
 class Ring(type):
 
+    def __new__(mcs, name, bases, attrs):
+        # Elements only get the attributes declared in the __slots__ of
+        # their element class, unless the ring asks for something else
+        return super().__new__(mcs, name, bases, {"__slots__": (), **attrs})
+
     def __init__(cls, name, bases, attrs):
         super().__init__(name, (*bases, RingElement), attrs)
-        cls.zero = cls(0)
-        cls.one = cls(1)
+        structure = cls.structure()
+        ring_id = _ring_ids.get(structure)
+        if ring_id is None:
+            ring_id = _ring_ids[structure] = _RingId(next(_next_ring_id))
+        cls._id_ref = ring_id
+        cls._id = ring_id.id
+        cls._small = {}
+        cls.zero = cls.constant(0)
+        cls.one = cls.constant(1)
         cls.ring = cls
         cls.Element = cls
 
+    def structure(cls):
+        """
+            Hashable description of the ring, computed once at construction.
+            Rings with the same structure are equal
+        """
+        return ("ring", cls.__name__)
+
     def __eq__(cls, other):
-        return cls.__name__ == other.__name__
+        return cls is other or (isinstance(other, Ring) and cls._id == other._id)
     
     def __str__(cls):
         return cls.__name__
@@ -88,7 +144,7 @@ class Ring(type):
                 yield e
 
             while len(exploring) > 0:
-                e1 = random.sample(exploring, 1)[0]
+                e1 = next(iter(exploring))
                 if e1 not in visited:
                     yield e1
                 visited.add(e1)
@@ -110,8 +166,20 @@ class Ring(type):
     def build(cls, *args, **kwargs):
         return cls(*args, **kwargs)
 
+    def constant(cls, n):
+        """
+            The element n (a python int) of the ring. Small constants are
+            built once and shared, which is safe as elements are immutable
+        """
+        elem = cls._small.get(n)
+        if elem is None:
+            elem = cls(n)
+            if -SMALL_INT_CACHE <= n < SMALL_INT_CACHE:
+                cls._small[n] = elem
+        return elem
+
     def __hash__(cls):
-        return hash(cls.__name__)
+        return hash(cls._id)
 
 
 class IntegralDomain(Ring):
@@ -157,8 +225,20 @@ class Field(EuclideanDomain):
         return True
 
 
+def _val_key(val):
+    if isinstance(val, RingElement):
+        return val.key()
+    if isinstance(val, (list, tuple)):
+        return tuple(_val_key(v) for v in val)
+    return val
+
+
 class RingElement():
 
+    # Subclasses declare the attributes they store in __slots__, there is
+    # no per instance __dict__
+    __slots__ = ()
+
     val = None
 
     def __init__(self, val):
@@ -211,6 +291,13 @@ class RingElement():
     def __eq__(self,other):
         return hasattr(other, "val") and self.val == other.val
 
+    def key(self):
+        """
+            Hashable value identifying the element within its ring, to use
+            in dictionaries without going through the ring equality
+        """
+        return _val_key(self.val)
+
     @abstractmethod
     def __str__(self):
         pass
@@ -252,6 +339,8 @@ class RingElement():
 
 class IntegralDomainElement(RingElement):
 
+    __slots__ = ()
+
     @abstractmethod
     def __floordiv__(self,other):
         pass
@@ -279,18 +368,23 @@ class IntegralDomainElement(RingElement):
 
 class UniqueFactorizationDomainElement(IntegralDomainElement):
 
+    __slots__ = ()
+
     @abstractmethod
     def factors(self):
         pass
 
 
 class EuclideanDomainElement(UniqueFactorizationDomainElement):
-    pass
+
+    __slots__ = ()
 
 
 
 class FieldElement(EuclideanDomainElement):
 
+    __slots__ = ()
+
     @abstractmethod
     def inverse(self):
         pass
@@ -0,0 +1,268 @@
+from array import array
+
+from python_alcp.utils import assuming, external, int_modinv
+from python_alcp.structures.rings import Field, FieldElement, cached_ring
+
+
+"""
+    Table driven finite fields.
+    The nonzero elements of GF(q) = GF(p)[x]/(f) are stored as the
+    exponent i of the generator a = [x], with f primitive, so that
+    a^i * a^j = a^(i+j) is an index addition.
+    Additions use the Zech logarithm table, Z(n) = log(1 + a^n):
+        a^i + a^j = a^i * (1 + a^(j-i)) = a^(i + Z(j-i))
+    Usage:
+        F = FiniteField(2, [1,0,1,1,1,0,0,0,1], table=True)   # GF(2^8)
+        a = F.generator()
+        a**3 + a**200
+"""
+
+# Largest field order for which the tables are built
+ZECH_MAX_ORDER = 1 << 22
+
+
+def _encode(cs, p):
+    # Coefficient list (in [0, p)) to an int in [0, p^k)
+    v = 0
+    for c in reversed(cs):
+        v = v*p + c
+    return v
+
+
+def _decode(v, p, k):
+    cs = []
+    for _ in range(k):
+        v, c = divmod(v, p)
+        cs.append(c)
+    return cs
+
+
+def zech_tables(p, f):
+    """
+        exp, log and Zech logarithm tables of GF(p)[x]/(f), for f monic
+        of degree k with coefficients given as ints in [0, p).
+        Elements are encoded as ints sum(c_i p^i), and the logarithm
+        of 0 is q-1. Raises AssertionError if x is not primitive
+    """
+    k = len(f) - 1
+    q = p**k
+    n = q - 1
+
+    exp = array('I', [0]) * n
+    log = array('I', [0]) * q
+    log[0] = n
+
+    if p == 2:
+        fenc = _encode(f, 2)
+        top = 1 << k
+        v = 1
+        for i in range(n):
+            assuming(i == 0 or v != 1, f"x is not primitive modulo {f}")
+            exp[i] = v
+            log[v] = i
+            v <<= 1
+            if v & top:
+                v ^= fenc
+    else:
+        d = [1] + [0]*(k-1)
+        for i in range(n):
+            v = _encode(d, p)
+            assuming(i == 0 or v != 1, f"x is not primitive modulo {f}")
+            exp[i] = v
+            log[v] = i
+            # Multiply by x and reduce by f
+            t = d[-1]
+            d = [0] + d[:-1]
+            if t:
+                d = [(c - t*fc) % p for c,fc in zip(d, f)]
+
+    zech = array('I', [0]) * n
+    for i in range(n):
+        v = exp[i]
+        c = v % p
+        zech[i] = log[v - c + (c + 1) % p]
+
+    return exp, log, zech
+
+
+class ZechField(Field):
+
+    """ Finite field GF(q) whose elements are stored as logarithms """
+
+    def structure(cls):
+        return ("zech", cls.quotient._id)
+
+    def char(cls):
+        return cls.p
+
+    def order(cls):
+        return cls.q
+
+    def is_finite(cls):
+        return True
+
+    def generator(cls):
+        return cls.from_log(1 % (cls.q - 1))
+
+    def generators(cls):
+        return {cls.generator()}
+
+    def units(cls):
+        return {cls.from_log(i) for i in range(cls.q - 1)}
+
+    def elements(cls):
+        yield cls.zero
+        for i in range(cls.q - 1):
+            yield cls.from_log(i)
+
+
+class ZechFieldElement(FieldElement):
+
+    """
+        Element of a ZechField, stored as its logarithm to the base of the
+        generator, in [0, q-1). q-1 represents 0
+    """
+
+    __slots__ = ("log",)
+
+    def __init__(self, val):
+        cls = type(self)
+        if type(val) is cls:
+            self.log = val.log
+            return
+        if isinstance(val, ZechFieldElement):
+            val = val.val
+
+        if type(val) is int:
+            self.log = cls._log[val % cls.p]
+        else:
+            # Anything that the polynomial quotient accepts
+            e = cls.quotient(val)
+            self.log = cls._log[_encode(e.val.ints, cls.p)]
+
+    @classmethod
+    def from_log(cls, log):
+        elem = cls.__new__(cls)
+        elem.log = log
+        return elem
+
+    @property
+    def val(self):
+        cls = type(self)
+        if self.log == cls.q - 1:
+            return cls.baseRing.zero
+        return cls.baseRing(_decode(cls._exp[self.log], cls.p, cls.degree))
+
+    def _other_log(self, other):
+        if type(other) is type(self):
+            return other.log
+        return type(self)(other).log
+
+    def _add_logs(self, i, j):
+        n = self.q - 1
+        if i == n:
+            return j
+        if j == n:
+            return i
+        z = self._zech[(j - i) % n]
+        return n if z == n else (i + z) % n
+
+    def _neg_log(self, i):
+        n = self.q - 1
+        if self.p == 2 or i == n:
+            return i
+        return (i + n // 2) % n
+
+    def __add__(self, other):
+        return self.from_log(self._add_logs(self.log, self._other_log(other)))
+
+    def __sub__(self, other):
+        return self.from_log(self._add_logs(self.log, self._neg_log(self._other_log(other))))
+
+    def __neg__(self):
+        return self.from_log(self._neg_log(self.log))
+
+    def __mul__(self, other):
+        if type(other) is int:
+            other = type(self)(other)
+        return super().__mul__(other)
+
+    def inner_mul(self, other):
+        n = self.q - 1
+        j = self._other_log(other)
+        if self.log == n or j == n:
+            return self.from_log(n)
+        return self.from_log((self.log + j) % n)
+
+    def __pow__(self, other):
+        n = self.q - 1
+        if self.log == n:
+            assuming(other >= 0, "Can't invert non-unit")
+            return self.from_log(n if other > 0 else 0)
+        return self.from_log(self.log * other % n)
+
+    def inverse(self):
+        n = self.q - 1
+        assuming(self.log != n, "Can't invert non-unit")
+        return self.from_log(-self.log % n)
+
+    def __truediv__(self, other):
+        return self * type(self)(other).inverse()
+
+    def is_unit(self):
+        return self.log != self.q - 1
+
+    def croot(self):
+        """ p-th root, the inverse of the Frobenius map """
+        n = self.q - 1
+        if self.log == n or n == 1:
+            return self
+        return self.from_log(self.log * int_modinv(self.p, n) % n)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.log == other.log
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.log))
+
+    def key(self):
+        return self.log
+
+    def __lt__(self, other):
+        return self._exp_value() < type(self)(other)._exp_value()
+
+    def _exp_value(self):
+        return 0 if self.log == self.q - 1 else self._exp[self.log]
+
+    def __str__(self):
+        if self.ring.repr == "reduced":
+            return str(self.val)
+        else:
+            return f"[{self.val}]"
+
+
+@external
+def GetZechField(F):
+    """
+        Table driven version of the finite field F = GF(p)[x]/(f),
+        f must be primitive
+    """
+    assuming(F.order() <= ZECH_MAX_ORDER, f"{F} is too big for Zech logarithm tables")
+
+    def build():
+        f = F.ideal.generator.monic()
+        p = F.char()
+        exp, log, zech = zech_tables(p, list(f.ints))
+        attrs = {
+            'p': p,
+            'q': F.order(),
+            'degree': f.deg(),
+            'baseRing': F.baseRing,
+            'quotient': F,
+            '_exp': exp,
+            '_log': log,
+            '_zech': zech,
+            '__slots__': ()
+        }
+        return ZechField(f"Zech({F})", (ZechFieldElement,), attrs)
+    return cached_ring(("zech", id(F)), build)
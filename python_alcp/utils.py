@@ -1,6 +1,11 @@
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
-from itertools import chain, combinations
+from itertools import chain, combinations, compress
 from functools import reduce
+from math import gcd, isqrt, log
+import random
+import threading
 
 ######## Error checking #########
 
@@ -65,49 +70,364 @@ def print_superscript(n: int):
 
 ######## Primes and int factorization #########
 
-curprimes = [2,3]
+"""
+    Primes are found with a segmented sieve of Eratosthenes and kept in a
+    shared table, which is extended in chunks when larger primes are needed.
+    The table only grows and is extended under a lock, so it can be read
+    from several threads.
+    Usage:
+        for p in primes(): ...     # all primes, in increasing order
+        primes_up_to(100)          # [2, 3, 5, ..., 97]
+        nth_prime(1), next_prime(7)    # 2, 11
+"""
+
+# Minimum size of the interval sieved each time the table is extended
+SIEVE_CHUNK = 1 << 16
+# Maximum size of a sieve segment
+SIEVE_SEGMENT = 1 << 20
+# next_prime sieves up to its argument below this bound
+NEXT_PRIME_SIEVE_LIMIT = 1 << 24
+
+_prime_table = array('I', [2, 3, 5, 7])
+_sieved_to = 11         # _prime_table has all the primes below this number
+_prime_lock = threading.Lock()
+
+
+def _sieve_segment(lo, hi):
+    """ Primes in [lo, hi), needs all the primes up to sqrt(hi) in the table """
+    seg = bytearray([1]) * (hi - lo)
+    for p in _prime_table:
+        if p*p >= hi:
+            break
+        start = max(p*p, (lo + p - 1) // p * p)
+        if start < hi:
+            seg[start-lo::p] = bytes((hi - 1 - start) // p + 1)
+    return compress(range(lo, hi), seg)
+
+
+def _extend_primes(limit: int):
+    """ Makes sure that the table has all the primes below limit """
+    global _sieved_to
+    if limit <= _sieved_to:
+        return
+    with _prime_lock:
+        limit = max(limit, _sieved_to + SIEVE_CHUNK)
+        while _sieved_to < limit:
+            lo = _sieved_to
+            hi = min(limit, lo + SIEVE_SEGMENT, lo*lo)
+            _prime_table.extend(_sieve_segment(lo, hi))
+            _sieved_to = hi
+
+
 def primes():
+    """ Generator of all the primes, in increasing order """
 
     def _p():
-        # Generator that returns primes
-        
-        count = 0
-        while count < len(curprimes):
-            yield curprimes[count]
-            count += 1
-
-        i = curprimes[-1] + 2
+        i = 0
         while True:
-            prime = True
-            for p in curprimes:
-                if i % p == 0:
-                    prime = False
-                    break
+            if i == len(_prime_table):
+                _extend_primes(2*_sieved_to)
+            yield _prime_table[i]
+            i += 1
 
-            if prime:
-                curprimes.append(i)
-                yield i
+    return _p()
 
-            i += 2
 
-    return _p()
+def primes_up_to(n: int):
+    """ List of the primes p <= n """
+    _extend_primes(n + 1)
+    return _prime_table[:bisect_right(_prime_table, n)].tolist()
+
+
+def nth_prime(n: int):
+    """ n-th prime, starting with nth_prime(1) = 2 """
+    assuming(n >= 1, "There is no prime before the first one")
+    if n >= 6:
+        # Rosser's bound, p_n < n (log n + log log n)
+        _extend_primes(int(n * (log(n) + log(log(n)))) + 1)
+    while len(_prime_table) < n:
+        _extend_primes(2*_sieved_to)
+    return _prime_table[n-1]
+
+
+def next_prime(n: int):
+    """ Smallest prime p > n """
+    if n < 2:
+        return 2
+    if n < NEXT_PRIME_SIEVE_LIMIT:
+        while n + 1 >= _sieved_to:
+            _extend_primes(2*(n + 1))
+        return _prime_table[bisect_right(_prime_table, n)]
+
+    n += 1 + n % 2
+    while not is_probable_prime(n):
+        n += 2
+    return n
+
+
+# Miller-Rabin bases that make the test deterministic below each bound
+MR_WITNESSES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (9080191, (31, 73)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+MR_DETERMINISTIC_BOUND, MR_BASES = MR_WITNESSES[-1]
+
+
+def mr_bases(n: int):
+    """
+        Smallest known set of Miller-Rabin bases that proves the primality
+        of n, or None if n >= MR_DETERMINISTIC_BOUND
+    """
+    for bound, bases in MR_WITNESSES:
+        if n < bound:
+            return bases
+    return None
+
+
+def miller_rabin(n: int, bases):
+    """
+        Strong probable prime test of the odd integer n > 3
+        to each of the given bases
+    """
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d, r = d // 2, r + 1
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_probable_prime(n: int):
+    """
+        Primality test for python ints, exact below MR_DETERMINISTIC_BOUND.
+        Larger numbers are checked with the Baillie-PSW test
+    """
+    if n < _sieved_to:
+        return n > 1 and _prime_table[bisect_right(_prime_table, n) - 1] == n
+    for p in MR_BASES:
+        if n % p == 0:
+            return n == p
+    bases = mr_bases(n)
+    if bases is None:
+        return externals.is_prime_bpsw(n)
+    return miller_rabin(n, bases)
 
 
+"""
+    Integer factorization.
+    prime_factors removes the small factors by trial division, and splits
+    the remaining composite cofactors with Pollard's rho (Brent's variant),
+    switching to Lenstra's elliptic curve method (ECM) for the cofactors
+    that rho does not split quickly.
+"""
+
+# Primes below this bound are removed by trial division
+TRIAL_DIVISION_BOUND = 1 << 12
+# Maximum number of iterations of each rho attempt
+RHO_ITERATIONS = 1 << 16
+# ECM (B1, number of curves) for each round, B2 = 100*B1.
+# The last round is repeated until a factor is found
+ECM_ROUNDS = [(2000, 25), (11000, 90), (50000, 300), (250000, 700)]
+
+
+def pollard_brent(n: int, c: int = 1, limit: int = None):
+    """
+        Pollard's rho with Brent's cycle detection on x -> x^2 + c.
+        Returns a proper factor of the composite n, or None if it was not
+        found in limit iterations
+    """
+    if limit is None:
+        limit = RHO_ITERATIONS
+    if n % 2 == 0:
+        return 2
+
+    m = 128
+    y, r, q, g = 2, 1, 1, 1
+    x = ys = y
+    while g == 1:
+        x = y
+        for _ in range(r):
+            y = (y*y + c) % n
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for _ in range(min(m, r - k)):
+                y = (y*y + c) % n
+                q = q * (x - y) % n
+            g = gcd(q, n)
+            k += m
+        r *= 2
+        if g == 1 and r > limit:
+            return None
+
+    if g == n:
+        # The batched product hit 0 mod n, redo the last batch step by step
+        while True:
+            ys = (ys*ys + c) % n
+            g = gcd(x - ys, n)
+            if g > 1:
+                break
+
+    return g if g != n else None
+
+
+def _ecm_curve(n: int, B1: int, B2: int, sigma: int):
+    """
+        One curve of ECM with Suyama's parametrization of Montgomery curves.
+        Returns a proper factor of n or None
+    """
+
+    u = (sigma*sigma - 5) % n
+    v = 4*sigma % n
+    den = 16 * pow(u, 3, n) * v % n
+    g = gcd(den, n)
+    if g != 1:
+        return g if g != n else None
+    a24 = pow(v - u, 3, n) * (3*u + v) * int_modinv(den, n) % n
+
+    def dbl(P):
+        X, Z = P
+        s = (X + Z) * (X + Z) % n
+        d = (X - Z) * (X - Z) % n
+        t = s - d
+        return s * d % n, t * (d + a24*t) % n
+
+    def add(P, Q, D):
+        # P + Q given D = P - Q
+        a = (P[0] - P[1]) * (Q[0] + Q[1]) % n
+        b = (P[0] + P[1]) * (Q[0] - Q[1]) % n
+        return D[1] * (a + b) * (a + b) % n, D[0] * (a - b) * (a - b) % n
+
+    def mul(k, P):
+        # Montgomery ladder
+        R0, R1 = P, dbl(P)
+        for bit in bin(k)[3:]:
+            if bit == '1':
+                R0, R1 = add(R1, R0, P), dbl(R1)
+            else:
+                R0, R1 = dbl(R0), add(R1, R0, P)
+        return R0
+
+    # Stage 1: multiply by all the prime powers up to B1
+    Q = (pow(u, 3, n), pow(v, 3, n))
+    for p in primes_up_to(B1):
+        pk = p
+        while pk * p <= B1:
+            pk *= p
+        Q = mul(pk, Q)
+
+    g = gcd(Q[1], n)
+    if g != 1:
+        return g if g != n else None
+
+    # Stage 2: one prime q in (B1, B2] at a time, as q = m*D +- j
+    D = 210
+    S = {1: Q, 2: dbl(Q)}
+    for j in range(3, D // 2, 2):
+        S[j] = add(S[j-2], S[2], S[j-4] if j > 3 else Q)
+    S = {j: P for j,P in S.items() if j % 2 == 1 and gcd(j, D) == 1}
+
+    _extend_primes(B2 + 1)
+    i = bisect_right(_prime_table, B1)
+    m = (B1 + D // 2) // D
+    T = mul(D, Q)
+    R = mul(m * D, Q) if m > 0 else None
+    R_prev = mul((m - 1) * D, Q) if m > 1 else None
+
+    end = bisect_right(_prime_table, B2)
+    acc = 1
+    while i < end:
+        if R is not None:
+            while i < end and _prime_table[i] <= m*D + D // 2:
+                Sj = S[abs(_prime_table[i] - m*D)]
+                acc = acc * (R[0]*Sj[1] - Sj[0]*R[1]) % n
+                i += 1
+        if R is None:
+            R_prev, R = None, T
+        elif R_prev is None:
+            R_prev, R = R, dbl(R)
+        else:
+            R_prev, R = R, add(R, T, R_prev)
+        m += 1
+
+    g = gcd(acc, n)
+    return g if g not in (1, n) else None
+
+
+def ecm(n: int, B1: int, curves: int):
+    """
+        Lenstra's elliptic curve factorization of the composite n.
+        Returns a proper factor of n, or None if none of the curves found one
+    """
+    for _ in range(curves):
+        d = _ecm_curve(n, B1, 100*B1, random.randrange(6, n - 1))
+        if d is not None:
+            return d
+    return None
+
+
+def _find_factor(n: int):
+    """ Proper factor of the composite n """
+    r = isqrt(n)
+    if r*r == n:
+        return r
+    for c in (1, 3, 5):
+        d = pollard_brent(n, c)
+        if d is not None:
+            return d
+    i = 0
+    while True:
+        B1, curves = ECM_ROUNDS[min(i, len(ECM_ROUNDS) - 1)]
+        d = ecm(n, B1, curves)
+        if d is not None:
+            return d
+        i += 1
+
 
 def prime_factors(n: int):
-    # Crude factorization
-    n = abs(n)
+    """ Factorization of n, as a dictionary {prime: multiplicity} """
+    n = abs(int(n))
+    assuming(n != 0, "Can't factor 0")
     res = defaultdict(lambda: 0)
-    for p in primes():
-        if n == 1:
-            return res
-        elif p**2 > n:
-            res[n] += 1
-            return res
+
+    for p in primes_up_to(TRIAL_DIVISION_BOUND):
+        if p*p > n:
+            break
         while n % p == 0:
             res[p] += 1
             n //= p
 
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_probable_prime(m):
+            res[m] += 1
+        else:
+            d = _find_factor(m)
+            pending += [d, m // d]
+
+    return res
+
 def all_factors(n: int):
     facts = sum([[f]*mul for f,mul in prime_factors(n).items()], [])
     def mul(nums):
@@ -117,6 +437,18 @@ def all_factors(n: int):
 def int_gcd(a: int, b: int):
     return a if b == 0 else int_gcd(b, a%b)
 
+def int_modinv(a: int, n: int):
+    """ Inverse of a modulo n, raises ValueError if it does not exist """
+    r0, r1 = a % n, n
+    s0, s1 = 1, 0
+    while r1 != 0:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q*r1
+        s0, s1 = s1, s0 - q*s1
+    if r0 != 1:
+        raise ValueError(f"{a} has no inverse modulo {n}")
+    return s0 % n
+
 
 
 ######## Double-add algorithm #########
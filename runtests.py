@@ -1,11 +1,11 @@
 from unittest import TestSuite, TextTestRunner, defaultTestLoader
-from test.z import TestZ, TestZModRing, TestZModField, TestZX
+from test.z import TestZ, TestZModRing, TestZModField, TestZX, TestZ17X
 import os
 
 
 def testAll():
     
-    test_cases = [TestZ, TestZModRing, TestZModField, TestZX]
+    test_cases = [TestZ, TestZModRing, TestZModField, TestZX, TestZ17X]
 
     suite = TestSuite()
     for case in test_cases:
@@ -0,0 +1,79 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms import linear_algebra
+from python_alcp.algorithms.composition import (
+        CompositionTable,
+        compose_mod,
+        compose_mod_many
+)
+from python_alcp.algorithms.fast_division import ModulusContext
+from python_alcp.algorithms.powmod import powmod
+from python_alcp.examples.rings import Z
+from python_alcp.examples.finite_fields import FiniteField
+from python_alcp.structures.polynomials import GetPolynomials
+
+
+def horner_mod(g, h, f):
+    ctx = ModulusContext(f)
+    R = type(f)
+    h = ctx.reduce(h)
+    res = ctx.reduce(R.zero)
+    for c in reversed(g.coefs):
+        res = ctx.mulmod(res, h) + R([c])
+    return res
+
+
+class TestComposition(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def rings(self):
+        F9 = FiniteField(3, [2,1,1])
+        elems9 = [F9([a, b]) for a in range(3) for b in range(3)]
+        return [
+            ((Z/(2*Z))["x"], lambda: random.randrange(2)),
+            ((Z/(7*Z))["x"], lambda: random.randrange(7)),
+            ((Z/((2**61-1)*Z))["x"], lambda: random.randrange(2**61-1)),
+            (GetPolynomials(Z/(3*Z), sparse=True), lambda: random.randrange(3)),
+            (F9["x"], lambda: random.choice(elems9)),
+        ]
+
+    def random_pol(self, R, coef, n):
+        return R([coef() for _ in range(n)] + [R.coefRing.one])
+
+    def testComposeMod(self):
+        for R, coef in self.rings():
+            for n, d in ((1, 4), (8, 3), (20, 19), (20, 70)):
+                f, g, h = (self.random_pol(R, coef, k) for k in (n, d, n+3))
+                self.assertTrue(compose_mod(g, h, f) == horner_mod(g, h, f))
+                self.assertTrue(compose_mod(R.zero, h, f) == R.zero)
+                # g(x) = g
+                self.assertTrue(compose_mod(g, R([0, 1]), f) == g % f)
+
+    def testComposeMany(self):
+        for R, coef in self.rings():
+            f, h = self.random_pol(R, coef, 15), self.random_pol(R, coef, 30)
+            gs = [self.random_pol(R, coef, d) for d in (0, 5, 14, 40)] + [R.zero]
+            expected = [horner_mod(g, h, f) for g in gs]
+            self.assertTrue(compose_mod_many(gs, h, f) == expected)
+            for m in (1, 3, 15, 40):
+                self.assertTrue(CompositionTable(h, f, m).compose_many(gs) == expected)
+
+    def testFrobenius(self):
+        # Over Z/pZ, g(x^p) = g^p
+        for p in (2, 5, 10007):
+            R = (Z/(p*Z))["x"]
+            f = self.random_pol(R, lambda: random.randrange(p), 60)
+            g = self.random_pol(R, lambda: random.randrange(p), 59)
+            xp = powmod(R([0, 1]), p, f)
+            self.assertTrue(compose_mod(g, xp, f) == powmod(g, p, f))
+
+    def testWithoutNumpy(self):
+        np = linear_algebra.np
+        linear_algebra.np = None
+        try:
+            self.testComposeMany()
+        finally:
+            linear_algebra.np = np
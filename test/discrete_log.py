@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from python_alcp.algorithms.discrete_log import discrete_log
+from python_alcp.examples.finite_fields import FiniteField
+
+
+class TestDiscreteLog(TestCase):
+
+    methods = ["bsgs", "rho", "pohlig_hellman", "auto"]
+
+    def testPrimeField(self):
+        F = FiniteField(10007)
+        g = F(5)
+        for method in self.methods:
+            for k in (0, 1, 777, 10005):
+                self.assertEqual(discrete_log(g, g**k, method=method), k)
+
+    def testExtensionField(self):
+        # x^16 + x^12 + x^3 + x + 1 is primitive
+        F = FiniteField(2, [1,1,0,1,0,0,0,0,0,0,0,0,1,0,0,0,1])
+        a = F.generator()
+        for k in (1, 2, 12345, 40000, 65534):
+            self.assertEqual(discrete_log(a, a**k), k)
+
+    def testLargeSmoothOrder(self):
+        # x^40 + x^5 + x^4 + x^3 + 1 is primitive, 2^40 - 1 has no factor over 61681
+        F = FiniteField(2, [1,0,0,1,1,1] + [0]*34 + [1])
+        a = F.generator()
+        for k in (123456789, 2**40 - 2):
+            self.assertEqual(discrete_log(a, a**k), k)
+
+    def testRho(self):
+        F = FiniteField(1000000007)
+        self.assertEqual(discrete_log(F(5), F(5)**123456789, method="rho"), 123456789)
+
+    def testSmallestSolution(self):
+        F = FiniteField(13)
+        # 3 has order 3
+        for method in self.methods:
+            self.assertEqual(discrete_log(F(3), F(3)**5, method=method), 2)
+            self.assertEqual(discrete_log(F(3), F(1), method=method), 0)
+
+    def testNotFound(self):
+        F = FiniteField(13)
+        for method in self.methods:
+            self.assertIsNone(discrete_log(F(3), F(2), method=method))
+            self.assertIsNone(discrete_log(F(3), F.zero, method=method))
+        self.assertRaises(ValueError, discrete_log, F(3), F(2), method="unknown")
@@ -0,0 +1,84 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.divisibility import gcd
+from python_alcp.algorithms.factorization import (
+        distinct_degree_factorization,
+        equal_degree_factorization,
+        kaltofen_shoup_ddf,
+        multistage_factorization
+)
+from python_alcp.examples.rings import Z
+from python_alcp.examples.finite_fields import FiniteField
+
+
+def frobenius_pol(R, k):
+    """ x^(q^k) - x, the product of the irreducibles of degree dividing k """
+    q = R.coefRing.order()
+    one = R.coefRing.one
+    return R([R.coefRing.zero, -one] + [R.coefRing.zero]*(q**k - 2) + [one])
+
+
+class TestEqualDegree(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def assertSplits(self, g, e, factors):
+        prod = g.ring.one
+        for h in factors:
+            self.assertEqual(h.deg(), e)
+            self.assertTrue(h.is_prime())
+            prod *= h
+        self.assertTrue(prod == g.normal())
+        self.assertEqual(len(set(h.key() for h in factors)), len(factors))
+
+    def testEqualDegree(self):
+        F4 = FiniteField(2, [1,1,1])
+        for R, e in (((Z/(2*Z))["x"], 10), ((Z/(3*Z))["x"], 6), ((Z/(11*Z))["x"], 2), (F4["x"], 3)):
+            g = distinct_degree_factorization(frobenius_pol(R, e))[e]
+            self.assertSplits(g, e, equal_degree_factorization(g, e))
+
+    def testMultistage(self):
+        for p in (2, 3, 7):
+            R = (Z/(p*Z))["x"]
+            f = R([random.randrange(p) for _ in range(300)] + [1])
+            for ddf in (None, "naive", "kaltofen_shoup"):
+                factors = multistage_factorization(f, ddf)
+                prod = R.one
+                for g,k in factors.items():
+                    self.assertTrue(g.is_prime())
+                    prod *= g**k
+                self.assertTrue(prod == f)
+
+
+class TestDistinctDegree(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def testStrategiesAgree(self):
+        F9 = FiniteField(3, [2,1,1])
+        elems9 = [F9([a, b]) for a in range(3) for b in range(3)]
+        # Arithmetic over F9 is generic and slow, it gets smaller degrees
+        cases = [
+            ((Z/(2*Z))["x"], lambda: random.randrange(2), (1, 2, 5, 30, 150)),
+            ((Z/(3*Z))["x"], lambda: random.randrange(3), (1, 2, 5, 30, 150)),
+            ((Z/(10007*Z))["x"], lambda: random.randrange(10007), (1, 2, 5, 30, 150)),
+            (F9["x"], lambda: random.choice(elems9), (1, 2, 5, 20)),
+        ]
+        for R, coef, degrees in cases:
+            for n in degrees:
+                f = R([coef() for _ in range(n)] + [R.coefRing.one])
+                f = f // gcd(f, f.der()).normal()
+                naive = distinct_degree_factorization(f)
+                ks = kaltofen_shoup_ddf(f)
+                self.assertEqual({d: g.normal().key() for d,g in naive.items()},
+                        {d: g.key() for d,g in ks.items()})
+
+    def testAllDegrees(self):
+        # x^(2^12) - x has factors of every degree dividing 12
+        R = (Z/(2*Z))["x"]
+        res = kaltofen_shoup_ddf(frobenius_pol(R, 12))
+        self.assertEqual(sorted(res), [1, 2, 3, 4, 6, 12])
+        self.assertEqual(res[12].deg(), 335*12)
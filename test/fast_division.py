@@ -0,0 +1,65 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.fast_division import ModulusContext, NEWTON_DIVISION_THRESHOLD
+from python_alcp.examples.rings import Z
+from python_alcp.examples.more_rings import Q
+from python_alcp.examples.finite_fields import FiniteField
+from python_alcp.structures.polynomials import GetPolynomials, polynomial_division
+
+
+class TestModulusContext(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def rings(self):
+        F9 = FiniteField(3, [2,1,1])
+        elems9 = [F9([a, b]) for a in range(3) for b in range(3)]
+        return [
+            ((Z/(2*Z))["x"], lambda: random.randrange(2)),
+            ((Z/(10007*Z))["x"], lambda: random.randrange(10007)),
+            ((Z/((2**61-1)*Z))["x"], lambda: random.randrange(2**61-1)),
+            (Q["x"], lambda: Q(random.randrange(-9, 10))),
+            (F9["x"], lambda: random.choice(elems9)),
+            (GetPolynomials(Z/(3*Z), sparse=True), lambda: random.randrange(3)),
+        ]
+
+    def random_pol(self, R, coef, n, lc):
+        return R([coef() for _ in range(n)] + [lc])
+
+    def testDivmod(self):
+        for R, coef in self.rings():
+            two = R.coefRing.one + R.coefRing.one
+            # The last size is above NEWTON_DIVISION_THRESHOLD
+            for n, m in ((1, 5), (5, 40), (30, 100)):
+                # Monic and not monic moduli, except over Z/2Z
+                for lc in {R.coefRing.one, two if two != R.coefRing.zero else R.coefRing.one}:
+                    f = self.random_pol(R, coef, n, lc)
+                    ctx = ModulusContext(f)
+                    for k in (n - 1, m, 2*m):
+                        a = self.random_pol(R, coef, k, R.coefRing.one)
+                        q, r = ctx.divmod(a)
+                        eq, er = polynomial_division(a, f)
+                        self.assertTrue(q == eq)
+                        self.assertTrue(r == er)
+                        self.assertTrue(ctx.reduce(a) == er)
+                    b = self.random_pol(R, coef, n, lc)
+                    self.assertTrue(ctx.mulmod(a, b) == polynomial_division(a*b, f)[1])
+
+    def testNewton(self):
+        # Above the threshold the quotient comes from the inverse of rev(f)
+        for R, coef in self.rings()[1:5]:
+            f = self.random_pol(R, coef, 30, R.coefRing.one + R.coefRing.one)
+            a = self.random_pol(R, coef, 200, R.coefRing.one)
+            self.assertGreater((a.deg() - f.deg() + 1) * f.deg(), NEWTON_DIVISION_THRESHOLD)
+            ctx = ModulusContext(f)
+            self.assertTrue(ctx.divmod(a) == polynomial_division(a, f))
+            self.assertGreater(ctx._prec, 1)
+
+    def testErrors(self):
+        R = (Z/(6*Z))["x"]
+        with self.assertRaises(AssertionError):
+            ModulusContext(R([1, 2]))
+        with self.assertRaises(AssertionError):
+            ModulusContext(R.zero)
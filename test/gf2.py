@@ -0,0 +1,66 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.factorization import multistage_factorization
+from python_alcp.examples.finite_fields import FiniteField
+from python_alcp.examples.rings import Z
+from python_alcp.structures.polynomials import GF2PolynomialElement
+
+
+def naive_mul(a, b):
+    res = [0] * (len(a) + len(b) - 1)
+    for i,x in enumerate(a):
+        for j,y in enumerate(b):
+            res[i+j] ^= x & y
+    while len(res) > 0 and res[-1] == 0:
+        res.pop()
+    return res
+
+
+class TestGF2Polynomials(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.R = (Z/(2*Z))["x"]
+
+    def random_pol(self, n):
+        return self.R([random.randint(0, 1) for _ in range(n)] + [1])
+
+    def testRepresentation(self):
+        R = self.R
+        self.assertTrue(isinstance(R.one, GF2PolynomialElement))
+        f = R([1, 0, 3, 1])
+        self.assertEqual(f.bits, 0b1101)
+        self.assertEqual(f.ints, (1, 0, 1, 1))
+        self.assertEqual(f.deg(), 3)
+        self.assertTrue(R(f.coefs) == f)
+
+    def testArithmetic(self):
+        for n in (1, 7, 60, 300, 3000):
+            a, b = self.random_pol(n), self.random_pol(n // 3 + 1)
+            if n < 500:
+                self.assertEqual(list((a*b).ints), naive_mul(list(a.ints), list(b.ints)))
+            self.assertTrue(a + a == self.R.zero)
+            self.assertTrue(a*a == a**2)
+            self.assertTrue(a*(b + a) == a*b + a*a)
+            q, r = divmod(a, b)
+            self.assertTrue(q*b + r == a)
+            self.assertLess(r.deg(), b.deg())
+
+    def testDerivativeAndRoot(self):
+        a = self.random_pol(40)
+        self.assertTrue((a*a).der() == self.R.zero)
+        self.assertTrue((a*a).croot() == a)
+        self.assertTrue(self.R([1, 1, 1, 1]).der() == self.R([1, 0, 1]))
+
+    def testFiniteField(self):
+        F = FiniteField(2, [1,1,0,1,1] + [0]*59 + [1])
+        a = F.generator()
+        self.assertTrue(a**(2**64 - 1) == F.one)
+        self.assertTrue(a**100 * a**(-100) == F.one)
+
+    def testFactorization(self):
+        R = self.R
+        f = R([1,1,0,0,1]) * R([1,1,1]) * R([1,0,1,1])**2
+        self.assertTrue(multistage_factorization(f) ==
+                        {R([1,1,0,0,1]): 1, R([1,1,1]): 1, R([1,0,1,1]): 2})
@@ -0,0 +1,140 @@
+from unittest import TestCase, mock
+from itertools import product
+import json
+import os
+import random
+import tempfile
+
+from python_alcp.algorithms import irreducibility
+from python_alcp.algorithms.irreducibility import rabin_test, ben_or_test, find_irreducible
+from python_alcp.structures import polynomials
+from python_alcp.structures.polynomials import GF2PolynomialElement, SparsePolynomialElement
+from python_alcp.examples.rings import Z
+from python_alcp.examples.finite_fields import FiniteField
+
+
+def mobius(n):
+    res, d = 1, 2
+    while d*d <= n:
+        if n % d == 0:
+            n //= d
+            if n % d == 0:
+                return 0
+            res = -res
+        d += 1
+    return -res if n > 1 else res
+
+
+def count_irreducible(q, n):
+    """ Number of monic irreducible polynomials of degree n in Fq[x] """
+    return sum(mobius(d) * q**(n//d) for d in range(1, n+1) if n % d == 0) // n
+
+
+class TestIrreducibility(TestCase):
+
+    tests = [rabin_test, ben_or_test]
+
+    def testCount(self):
+        for p, N in ((2, 8), (3, 5), (5, 3)):
+            R = (Z/(p*Z))["x"]
+            for n in range(1, N+1):
+                pols = [R(list(cs) + [1]) for cs in product(range(p), repeat=n)]
+                for test in self.tests:
+                    self.assertEqual(sum(map(test, pols)), count_irreducible(p, n))
+
+    def testExtensionField(self):
+        F = FiniteField(3, [2,1,1])
+        R = F["x"]
+        elems = [F([a, b]) for a in range(3) for b in range(3)]
+        pols = [R(list(cs) + [F.one]) for cs in product(elems, repeat=2)]
+        for test in self.tests:
+            self.assertEqual(sum(map(test, pols)), count_irreducible(9, 2))
+
+    def testAgree(self):
+        random.seed(0)
+        R = (Z/(2*Z))["x"]
+        for _ in range(50):
+            f = R([random.randrange(2) for _ in range(64)] + [1])
+            self.assertEqual(rabin_test(f), ben_or_test(f))
+        self.assertTrue(rabin_test(R([1, 1] + [0]*125 + [1])))
+        self.assertTrue(ben_or_test(R([1, 1] + [0]*125 + [1])))
+        self.assertFalse(rabin_test(R([1, 1] + [0]*125 + [1])**2))
+        self.assertFalse(rabin_test(R.one))
+
+
+class TestFindIrreducible(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.saved = irreducibility.IRREDUCIBLE_CACHE, irreducibility._irreducible_cache
+        irreducibility.IRREDUCIBLE_CACHE = os.path.join(self.dir.name, "irreducible.json")
+        irreducibility._irreducible_cache = None
+
+    def tearDown(self):
+        irreducibility.IRREDUCIBLE_CACHE, irreducibility._irreducible_cache = self.saved
+        self.dir.cleanup()
+
+    def testFind(self):
+        for p, n in ((2, 1), (2, 8), (2, 127), (3, 1), (3, 20), (7, 5), (10007, 3)):
+            for primitive in (False, True):
+                for sparse in (False, True):
+                    if not sparse and p**n > 10**6:
+                        continue
+                    f = find_irreducible(p, n, primitive, sparse)
+                    self.assertEqual(f.deg(), n)
+                    self.assertTrue(f.coefs[-1] == f.ring.coefRing.one)
+                    self.assertTrue(rabin_test(f))
+                    if primitive:
+                        self.assertTrue(f.is_primitive_field())
+
+    def testLowWeight(self):
+        # x^127 + x + 1 is the first trinomial of degree 127 over Z/2Z
+        f = find_irreducible(2, 127)
+        self.assertEqual(sorted(f.terms), [0, 1, 127])
+        self.assertTrue(find_irreducible(2, 8, sparse=False) == f.ring([1, 1, 0, 1, 1, 0, 0, 0, 1]))
+
+    def testCache(self):
+        f = find_irreducible(3, 6, primitive=True)
+        self.assertTrue(os.path.exists(irreducibility.IRREDUCIBLE_CACHE))
+        irreducibility._irreducible_cache = None
+        self.assertTrue(find_irreducible(3, 6, primitive=True) == f)
+        self.assertIn("3,6,1,1", irreducibility._irreducible_cache)
+        # Entries read from the file are not checked to be primitive again
+        irreducibility._irreducible_cache = None
+        with mock.patch.object(polynomials, "prime_factors", side_effect=AssertionError):
+            self.assertTrue(find_irreducible(3, 6, primitive=True) == f)
+
+    def testDisabledByDefault(self):
+        with mock.patch.dict(os.environ, {"PYTHON_ALCP_CACHE": self.dir.name}):
+            self.assertEqual(irreducibility._default_cache(), os.path.join(self.dir.name, "irreducible.json"))
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertIsNone(irreducibility._default_cache())
+        irreducibility.IRREDUCIBLE_CACHE = None
+        find_irreducible(3, 7)
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+    def testBadEntry(self):
+        # (x^2 + 1)^2 and malformed entries are searched again and replaced
+        bad = {"3,4,0,1": [[0, 1], [2, 2], [4, 1]], "5,3,0,1": [[7, 1]], "7,2,0,1": "x"}
+        with open(irreducibility.IRREDUCIBLE_CACHE, "w") as fh:
+            json.dump(bad, fh)
+        for p, n in ((3, 4), (5, 3), (7, 2)):
+            f = find_irreducible(p, n)
+            self.assertEqual(f.deg(), n)
+            self.assertTrue(rabin_test(f))
+        with open(irreducibility.IRREDUCIBLE_CACHE) as fh:
+            saved = json.load(fh)
+        for key in bad:
+            self.assertNotEqual(saved[key], bad[key])
+
+    def testFiniteField(self):
+        F = FiniteField(2, degree=163)
+        x = F.generator()
+        self.assertTrue(x**(2**163 - 1) == F.one)
+        # Elements use the dense backends, not the sparse ring of the search
+        for y in (x, FiniteField(3, degree=101).generator()):
+            self.assertFalse(isinstance(y.val, SparsePolynomialElement))
+            self.assertFalse(isinstance((y*y).val, SparsePolynomialElement))
+        self.assertTrue(isinstance(x.val, GF2PolynomialElement))
+        G = FiniteField(3, degree=4, table=True)
+        self.assertEqual(G.order(), 81)
@@ -0,0 +1,124 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms import linear_algebra
+from python_alcp.algorithms.linear_algebra import FqMatrix
+from python_alcp.algorithms.divisibility import gcd
+from python_alcp.algorithms.factorization import (
+        berlekamp_factorization,
+        berlekamp_cantor_zassenhaus,
+        ker_phi_basis
+)
+from python_alcp.examples.rings import Z
+from python_alcp.examples.finite_fields import FiniteField
+
+
+class TestFqMatrix(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def fields(self):
+        F9 = FiniteField(3, [2,1,1])
+        elems9 = [F9([a, b]) for a in range(3) for b in range(3)]
+        return [
+            (Z/(2*Z), lambda: random.randrange(2)),
+            (Z/(7*Z), lambda: random.randrange(7)),
+            (Z/((2**61-1)*Z), lambda: random.randrange(2**61-1)),
+            (F9, lambda: random.choice(elems9)),
+        ]
+
+    def random_matrix(self, F, coef, n, m):
+        return FqMatrix(F, [[coef() for _ in range(m)] for _ in range(n)], m)
+
+    def testProduct(self):
+        for F, coef in self.fields():
+            A, B = self.random_matrix(F, coef, 3, 4), self.random_matrix(F, coef, 4, 2)
+            AB = A*B
+            for i in range(3):
+                for j in range(2):
+                    self.assertTrue(AB[i, j] == sum((A[i, k]*B[k, j] for k in range(4)), F.zero))
+            self.assertEqual(A.transpose().transpose(), A)
+            self.assertEqual(A - A, FqMatrix(F, [[0]*4]*3))
+            I = FqMatrix.identity(F, 4)
+            self.assertEqual(A*I, A)
+
+    def testRankNullspace(self):
+        for F, coef in self.fields():
+            # Rank 3 matrix of size 5x6
+            A = self.random_matrix(F, coef, 5, 3) * self.random_matrix(F, coef, 3, 6)
+            self.assertLessEqual(A.rank(), 3)
+            K = A.nullspace()
+            self.assertEqual(K.nrows, 6 - A.rank())
+            self.assertEqual(K.rank(), K.nrows)
+            self.assertEqual(A*K.transpose(), FqMatrix(F, [[0]*K.nrows]*5))
+
+    def testSolveDet(self):
+        for F, coef in self.fields():
+            A = self.random_matrix(F, coef, 6, 6)
+            x = [F.constant(c) if type(c) is int else c for c in (coef() for _ in range(6))]
+            b = (A * FqMatrix(F, [[c] for c in x])).transpose().rows()[0]
+            if A.det() != F.zero:
+                self.assertEqual(A.rank(), 6)
+                self.assertTrue(A.solve(b) == x)
+            y = A.solve(b)
+            self.assertEqual((A * FqMatrix(F, [[c] for c in y])).transpose().rows()[0], b)
+
+            # det is multiplicative and changes sign with a swap
+            B = self.random_matrix(F, coef, 6, 6)
+            self.assertTrue((A*B).det() == A.det()*B.det())
+            S = FqMatrix(F, A.rows()[1:2] + A.rows()[0:1] + A.rows()[2:])
+            self.assertTrue(S.det() == -A.det())
+
+            singular = FqMatrix(F, [[1, 2], [1, 2]])
+            self.assertTrue(singular.det() == F.zero)
+            with self.assertRaises(ValueError):
+                singular.solve([0, 1])
+
+    def testWithoutNumpy(self):
+        np = linear_algebra.np
+        linear_algebra.np = None
+        try:
+            self.testRankNullspace()
+            self.testSolveDet()
+        finally:
+            linear_algebra.np = np
+
+
+class TestBerlekamp(TestCase):
+
+    def setUp(self):
+        random.seed(1)
+
+    def assertFactors(self, f, factors):
+        prod = f.ring.one
+        for g in factors:
+            self.assertTrue(g.is_prime())
+            prod *= g
+        self.assertTrue(prod.normal() == f.normal())
+
+    def testKernel(self):
+        R = (Z/(5*Z))["x"]
+        f = R([1, 1]) * R([2, 0, 1]) * R([1, 1, 0, 1])
+        basis = ker_phi_basis(f)
+        self.assertEqual(len(basis), 3)
+        for h in basis:
+            self.assertTrue(h**5 % f == h % f)
+
+    def squarefree(self, R, coef, n):
+        f = R([coef() for _ in range(n)] + [R.coefRing.one])
+        return f // gcd(f, f.der()).normal()
+
+    def testFactorization(self):
+        F9 = FiniteField(3, [2,1,1])
+        elems9 = [F9([a, b]) for a in range(3) for b in range(3)]
+        cases = [
+            ((Z/(2*Z))["x"], lambda: random.randrange(2), 300),
+            ((Z/(3*Z))["x"], lambda: random.randrange(3), 200),
+            ((Z/(101*Z))["x"], lambda: random.randrange(101), 40),
+            (F9["x"], lambda: random.choice(elems9), 20),
+        ]
+        for R, coef, n in cases:
+            f = self.squarefree(R, coef, n)
+            for alg in (berlekamp_factorization, berlekamp_cantor_zassenhaus):
+                self.assertFactors(f, alg(f))
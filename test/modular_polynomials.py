@@ -0,0 +1,74 @@
+from unittest import TestCase
+import random
+from math import gcd
+
+from python_alcp.examples.rings import Z
+from python_alcp.structures.polynomials import (
+        KRONECKER_THRESHOLD,
+        ModularPolynomialElement,
+        PolynomialED,
+        PolynomialEDElement,
+        PolynomialRing,
+        PolynomialRingElement
+)
+
+
+def generic_polynomials(C):
+    """ C[x] with the generic element class, for reference """
+    if C.is_field():
+        return PolynomialED(f"{C}[x]", (PolynomialEDElement,), {"coefRing": C, "var": "x", "chain": 0, "__slots__": ("val",)})
+    return PolynomialRing(f"{C}[x]", (PolynomialRingElement,), {"coefRing": C, "var": "x", "chain": 0, "__slots__": ("val",)})
+
+
+class TestModularPolynomials(TestCase):
+
+    # Primes, a composite and a modulus beyond machine words
+    moduli = [3, 17, 12, 2**61-1, 10**30]
+
+    def setUp(self):
+        random.seed(0)
+
+    def ints(self, pol):
+        return tuple(int(c) for c in pol.coefs)
+
+    def pairs(self, C, G, M, n, deg):
+        for _ in range(n):
+            cs = [random.randrange(C.modulus) for _ in range(deg+1)]
+            yield G(cs), M(cs)
+
+    def testBackend(self):
+        for n in self.moduli:
+            C = Z/(n*Z)
+            self.assertTrue(isinstance(C["x"].one, ModularPolynomialElement))
+
+    def testArithmetic(self):
+        for n in self.moduli:
+            C = Z/(n*Z)
+            G, M = generic_polynomials(C), C["x"]
+            # Degrees below and above the Kronecker substitution threshold
+            for deg in (0, 3, KRONECKER_THRESHOLD + 5, 60):
+                (ga, ma), (gb, mb) = self.pairs(C, G, M, 2, deg)
+                self.assertEqual(self.ints(ma), self.ints(ga))
+                self.assertEqual(self.ints(ma + mb), self.ints(ga + gb))
+                self.assertEqual(self.ints(ma - mb), self.ints(ga - gb))
+                self.assertEqual(self.ints(-ma), self.ints(-ga))
+                self.assertEqual(self.ints(ma * mb), self.ints(ga * gb))
+                self.assertEqual(self.ints(ma * ma), self.ints(ga * ga))
+                for a in (0, 1, random.randrange(n)):
+                    self.assertEqual(int(ma.eval(C(a))), int(ga.eval(C(a))))
+
+    def testDivmod(self):
+        for n in self.moduli:
+            C = Z/(n*Z)
+            G, M = generic_polynomials(C), C["x"]
+            # The leading coefficient of the divisor must be a unit
+            lc = 5 if gcd(5, n) == 1 else 1
+            for deg, ddeg in ((10, 3), (40, 17), (3, 5)):
+                (ga, ma), = self.pairs(C, G, M, 1, deg)
+                cs = [random.randrange(n) for _ in range(ddeg)] + [lc]
+                gb, mb = G(cs), M(cs)
+                gq, gr = divmod(ga, gb)
+                mq, mr = divmod(ma, mb)
+                self.assertEqual(self.ints(mq), self.ints(gq))
+                self.assertEqual(self.ints(mr), self.ints(gr))
+                self.assertTrue(mq*mb + mr == ma)
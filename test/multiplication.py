@@ -0,0 +1,47 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.multiplication import (
+        schoolbook_mul,
+        karatsuba_mul,
+        toom3_mul
+)
+from python_alcp.algorithms.ntt import ntt_mul
+from python_alcp.examples.rings import Z
+
+
+class TestMultiplication(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.pairs = []
+        for _ in range(20):
+            a = [random.randint(-1000, 1000) for _ in range(random.randrange(1, 120))]
+            b = [random.randint(-1000, 1000) for _ in range(random.randrange(1, 120))]
+            self.pairs.append((a, b))
+
+    def testKaratsuba(self):
+        for a,b in self.pairs:
+            self.assertEqual(karatsuba_mul(a, b, 0, threshold=4), schoolbook_mul(a, b, 0))
+
+    def testKaratsubaRingElements(self):
+        Z7 = Z/(7*Z)
+        for a,b in self.pairs[:5]:
+            a = [Z7(x) for x in a]
+            b = [Z7(x) for x in b]
+            self.assertEqual(karatsuba_mul(a, b, Z7.zero, threshold=4), schoolbook_mul(a, b, Z7.zero))
+
+    def testToom3(self):
+        for a,b in self.pairs:
+            self.assertEqual(toom3_mul(a, b, threshold=6), schoolbook_mul(a, b, 0))
+
+    def testNTTIntegers(self):
+        for a,b in self.pairs:
+            self.assertEqual(ntt_mul(a, b), schoolbook_mul(a, b, 0))
+
+    def testNTTModular(self):
+        p = 2**61 - 1
+        for a,b in self.pairs:
+            a = [x % p for x in a]
+            b = [x % p for x in b]
+            self.assertEqual(ntt_mul(a, b, p), [x % p for x in schoolbook_mul(a, b, 0)])
@@ -0,0 +1,67 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.powmod import powmod, frobenius_map, has_frobenius_map, FrobeniusMap
+from python_alcp.algorithms.factorization import distinct_degree_factorization
+from python_alcp.algorithms.irreducibility import rabin_test
+from python_alcp.examples.rings import Z
+from python_alcp.examples.more_rings import Q
+from python_alcp.examples.finite_fields import FiniteField
+
+
+class TestPowmod(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def rings(self):
+        F = FiniteField(3, [2,1,1])
+        return [
+            ((Z/(2*Z))["x"], lambda: random.randrange(2)),
+            ((Z/(7*Z))["x"], lambda: random.randrange(7)),
+            (F["x"], lambda: F([random.randrange(3), random.randrange(3)])),
+            (Q["x"], lambda: Q(random.randint(-5, 5), random.randint(1, 5))),
+        ]
+
+    def random_pol(self, R, coef, n):
+        return R([coef() for _ in range(n)] + [R.coefRing.one])
+
+    def testNaive(self):
+        for R, coef in self.rings():
+            f = self.random_pol(R, coef, 6)
+            a = self.random_pol(R, coef, 9)
+            r = R.one
+            for e in range(101):
+                self.assertTrue(powmod(a, e, f) == r % f)
+                r = r*a % f
+
+    def testFrobenius(self):
+        for R, coef in self.rings()[:3]:
+            q = R.coefRing.order()
+            f = self.random_pol(R, coef, 10)
+            a = self.random_pol(R, coef, 7)
+            self.assertFalse(has_frobenius_map(f))
+            frob = FrobeniusMap(f)
+            self.assertTrue(frob(a) == a**q % f)
+            self.assertTrue(frob.power(a, 3) == powmod(a, q**3, f))
+            self.assertTrue(powmod(a, q**3, f) == ((a**q % f)**q % f)**q % f)
+            self.assertIs(frobenius_map(f), frobenius_map(f))
+            self.assertTrue(has_frobenius_map(f))
+
+    def testLargeExponent(self):
+        R = (Z/(2*Z))["x"]
+        # x^127 + x + 1 is irreducible, so x^(2^127) = x mod f
+        f = R([1, 1] + [0]*125 + [1])
+        x = R([0, 1])
+        self.assertTrue(powmod(x, 2**127, f) == x)
+        self.assertTrue(powmod(x, 2**127 - 1, f) == R.one)
+        self.assertTrue(rabin_test(f))
+
+    def testDistinctDegree(self):
+        R = (Z/(5*Z))["x"]
+        f = R([1, 0, 1]) * R([2, 0, 0, 1]) * R([1, 1])
+        factors = distinct_degree_factorization(f)
+        prod = R.one
+        for d, g in factors.items():
+            prod *= g
+        self.assertTrue(prod == f.normal())
@@ -0,0 +1,134 @@
+from unittest import TestCase
+import random
+import threading
+
+from python_alcp.utils import (
+        primes,
+        primes_up_to,
+        nth_prime,
+        next_prime,
+        is_probable_prime,
+        prime_factors,
+        pollard_brent,
+        ecm
+)
+from python_alcp.algorithms.primality import (
+        is_prime_miller_rabin,
+        is_prime_bpsw,
+        is_strong_lucas_prp,
+        is_prime_many
+)
+
+
+def naive_is_prime(n):
+    return n > 1 and all(n % d for d in range(2, int(n**0.5) + 1))
+
+
+class TestPrimes(TestCase):
+
+    def testPrimesUpTo(self):
+        self.assertEqual(primes_up_to(1), [])
+        self.assertEqual(primes_up_to(2), [2])
+        self.assertEqual(primes_up_to(30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(primes_up_to(20000), [n for n in range(20001) if naive_is_prime(n)])
+
+    def testGenerator(self):
+        gen = primes()
+        ps = [next(gen) for _ in range(10000)]
+        self.assertEqual(ps, primes_up_to(ps[-1]))
+        self.assertEqual(ps[-1], 104729)
+
+    def testNthPrime(self):
+        self.assertEqual(nth_prime(1), 2)
+        self.assertEqual(nth_prime(6), 13)
+        self.assertEqual(nth_prime(100000), 1299709)
+
+    def testNextPrime(self):
+        self.assertEqual(next_prime(-5), 2)
+        self.assertEqual(next_prime(2), 3)
+        self.assertEqual(next_prime(13), 17)
+        self.assertEqual(next_prime(1299700), 1299709)
+        self.assertEqual(next_prime(2**31), 2**31 + 11)
+
+    def testThreads(self):
+        results = []
+        def worker():
+            results.append(primes_up_to(3000000)[-1])
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [2999999] * 4)
+
+
+class TestPrimeFactors(TestCase):
+
+    def assertFactorization(self, n, factors):
+        self.assertEqual(dict(prime_factors(n)), factors)
+
+    def testSmall(self):
+        for n in range(1, 2000):
+            res = 1
+            for p,e in prime_factors(n).items():
+                self.assertTrue(naive_is_prime(p))
+                res *= p**e
+            self.assertEqual(res, n)
+
+    def testIsProbablePrime(self):
+        self.assertEqual([n for n in range(-5, 5000) if is_probable_prime(n)],
+                         [n for n in range(-5, 5000) if naive_is_prime(n)])
+        # Strong pseudoprime to the bases 2, 3, 5, 7, 11, 13 and 17
+        self.assertFalse(is_probable_prime(341550071728321))
+        self.assertTrue(is_probable_prime(2**89 - 1))
+
+    def testLarge(self):
+        self.assertFactorization(2**64 - 1, {3: 1, 5: 1, 17: 1, 257: 1, 641: 1, 65537: 1, 6700417: 1})
+        self.assertFactorization(2**67 - 1, {193707721: 1, 761838257287: 1})
+        self.assertFactorization(-1000003**3 * 999983, {1000003: 3, 999983: 1})
+
+    def testRho(self):
+        self.assertIn(pollard_brent(1000003 * 999983), (1000003, 999983))
+
+    def testECM(self):
+        random.seed(0)
+        p, q = 1000000007, 998244353
+        self.assertIn(ecm(p * q * 1000000009, 2000, 100), (p, q, 1000000009, p*q, p*1000000009, q*1000000009))
+
+
+class TestPrimality(TestCase):
+
+    # Strong pseudoprimes to the first bases, and Carmichael numbers
+    pseudoprimes = [2047, 1373653, 25326001, 3215031751, 341550071728321,
+                    3825123056546413051, 318665857834031151167461,
+                    3317044064679887385961981, 561, 1105]
+
+    # Strong Lucas pseudoprimes
+    lucas_pseudoprimes = [5459, 5777, 10877, 16109, 18971]
+
+    large_primes = [2**89 - 1, 2**127 - 1, 2**521 - 1, 10**100 + 267]
+
+    def testMillerRabin(self):
+        self.assertEqual([n for n in range(2, 5000) if is_prime_miller_rabin(n)],
+                         [n for n in range(2, 5000) if naive_is_prime(n)])
+        for n in self.pseudoprimes:
+            self.assertFalse(is_prime_miller_rabin(n))
+        for p in self.large_primes:
+            self.assertTrue(is_prime_miller_rabin(p))
+            self.assertFalse(is_prime_miller_rabin(p * self.large_primes[0]))
+        self.assertTrue(is_prime_miller_rabin(2**61 - 1, k=20))
+
+    def testBPSW(self):
+        self.assertEqual([n for n in range(5000) if is_prime_bpsw(n)],
+                         [n for n in range(5000) if naive_is_prime(n)])
+        for n in self.pseudoprimes:
+            self.assertFalse(is_prime_bpsw(n))
+        for n in self.lucas_pseudoprimes:
+            self.assertTrue(is_strong_lucas_prp(n))
+            self.assertFalse(is_prime_bpsw(n))
+        for p in self.large_primes:
+            self.assertTrue(is_prime_bpsw(p))
+
+    def testMany(self):
+        ns = list(range(5000)) + self.pseudoprimes + self.large_primes
+        self.assertEqual(is_prime_many(ns), [is_prime_bpsw(n) for n in ns])
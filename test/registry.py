@@ -0,0 +1,105 @@
+from unittest import TestCase
+import gc
+
+from python_alcp.examples.rings import Z
+from python_alcp.examples.finite_fields import FiniteField
+from python_alcp.structures.polynomials import GetPolynomials
+from python_alcp.structures.rings import _ring_ids, _ring_registry
+
+
+class TestRingRegistry(TestCase):
+
+    def testSameRing(self):
+        self.assertIs(Z/(Z*5), Z/(Z*5))
+        self.assertIs(Z["x"], Z["x"])
+        self.assertIs((Z/(Z*7))["x"], (Z/(Z*7))["x"])
+        self.assertIs(Z["x"]["y"], Z["x"]["y"])
+        F = FiniteField(3, [2,1,0,0,1])
+        self.assertIs(F, FiniteField(3, [2,1,0,0,1]))
+        self.assertIs(FiniteField(3, [2,1,0,0,1], table=True), FiniteField(3, [2,1,0,0,1], table=True))
+
+    def testDifferentRings(self):
+        self.assertIsNot(Z/(Z*5), Z/(Z*7))
+        self.assertIsNot(Z["x"], Z["y"])
+        self.assertIsNot((Z/(Z*5))["x"], (Z/(Z*7))["x"])
+
+    def testQuotientVariables(self):
+        # Structurally equal, but each quotient keeps its own variable
+        A, B = (Z/(Z*5))["t"], (Z/(Z*5))["x"]
+        QA, QB = A/(A*A([1,0,1])), B/(B*B([1,0,1]))
+        self.assertIsNot(QA, QB)
+        self.assertEqual(QA, QB)
+        self.assertEqual(str(QA.baseRing.var), "t")
+        self.assertEqual(str(QB.baseRing.var), "x")
+        self.assertIs(QA, A/(A*A([1,0,1])))
+        F, G = FiniteField(3, degree=2, var="a"), FiniteField(3, degree=2)
+        self.assertIsNot(F, G)
+        self.assertIn("[a]", str(F))
+        self.assertNotIn("[a]", str(G))
+
+    def testWeak(self):
+        R = Z/(Z*1000003)
+        self.assertIn(R, list(_ring_registry.values()))
+        name = str(R)
+        del R
+        gc.collect()
+        self.assertNotIn(name, map(str, _ring_registry.values()))
+
+    def testWeakIds(self):
+        gc.collect()
+        n = len(_ring_ids)
+        for p in range(1000033, 1000133, 2):
+            R = (Z/(Z*p))["x"]
+        self.assertGreater(len(_ring_ids), n)
+        old = R._id
+        del R
+        gc.collect()
+        self.assertEqual(len(_ring_ids), n)
+        # Equal structures still share the id while they live
+        self.assertEqual(Z["x"]._id, Z["y"]._id)
+        self.assertNotEqual((Z/(Z*1000131))["x"]._id, old)
+
+    def testSlots(self):
+        def slots(x):
+            return [name for c in type(x).__mro__ for name in vars(c).get("__slots__", ())]
+        P = (Z/(Z*7))["x"]
+        self.assertEqual(slots(P.one), ["ints", "_boxed"])
+        self.assertEqual(slots((Z/(Z*2))["x"].one), ["bits", "_boxed"])
+        self.assertEqual(slots(Z["x"].one), ["val"])
+        self.assertEqual(slots(P.one.val[0]), ["rep"])
+        self.assertEqual(slots((P/(P*P([1,0,1]))).one), ["val"])
+        S = GetPolynomials(Z, "x", sparse=True)
+        x = S([0, 1])**1000
+        self.assertEqual(slots(x), ["val"])
+        self.assertEqual(x.terms, {1000: Z(1)})
+        for y in (P.one, x, P.one.val[0]):
+            self.assertFalse(hasattr(y, "__dict__"))
+
+    def testConstants(self):
+        R = Z/(Z*7)
+        P = R["x"]
+        self.assertIs(R.constant(3), R.constant(3))
+        self.assertIs(R.constant(0), R.zero)
+        self.assertIs(P.constant(1), P.one)
+        self.assertTrue(R.constant(10) == R(3))
+        f = P([1,2,3])
+        self.assertIs(f.val[1], R.constant(2))
+
+
+class TestRingEquality(TestCase):
+
+    def testStructuralEquality(self):
+        self.assertEqual(Z["x"], Z["y"])
+        self.assertEqual(hash(Z["x"]), hash(Z["y"]))
+        self.assertNotEqual(Z["x"], (Z/(Z*5))["x"])
+        self.assertNotEqual(Z/(Z*5), Z/(Z*7))
+        self.assertNotEqual(Z, Z["x"])
+        self.assertNotEqual(Z, 5)
+
+    def testHashable(self):
+        F = FiniteField(2, [1,1,0,0,1])
+        P = (Z/(Z*7))["x"]
+        rings = {Z, F, P, P/(P*P([1,0,1])), Z["x"]["y"]}
+        self.assertIn(FiniteField(2, [1,1,0,0,1]), rings)
+        self.assertEqual(F.one + F.one, F.zero)
+        self.assertEqual(P([1,2]) * P([1,2]), P([1,4,4]))
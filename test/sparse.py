@@ -0,0 +1,90 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.primality import is_prime_aks
+from python_alcp.examples.rings import Z
+from python_alcp.examples.more_rings import Q
+from python_alcp.structures.ideals import GetRingQuotient
+from python_alcp.structures.polynomials import GetPolynomials, SparsePolynomialElement
+
+
+class TestSparsePolynomials(TestCase):
+
+    rings = [Z, Q, Z/(2*Z), Z/(7*Z), Z/(6*Z)]
+
+    def setUp(self):
+        random.seed(0)
+
+    def random_pol(self, S, n, terms):
+        return S({random.randrange(n): random.randint(1, 5) for _ in range(terms)} | {n: 1})
+
+    def testRepresentation(self):
+        for C in self.rings:
+            S = GetPolynomials(C, "x", sparse=True)
+            D = C["x"]
+            x = S([0, 1])
+            f = x**100000 + 3*x + 1
+            self.assertTrue(isinstance(f, SparsePolynomialElement))
+            self.assertEqual(len(f.terms), 3)
+            self.assertEqual(f.deg(), 100000)
+            self.assertEqual(S, D)
+            # Dense enough polynomials are built in the dense ring
+            g = S([1]*100)
+            self.assertFalse(isinstance(g, SparsePolynomialElement))
+            self.assertTrue(isinstance(g, D))
+            self.assertTrue(S(D([0, 0, 1])) == x*x)
+            self.assertTrue(D([0, 0, 1]) == x*x)
+
+    def testArithmetic(self):
+        for C in self.rings:
+            S = GetPolynomials(C, "x", sparse=True)
+            D = C["x"]
+            for n in (10, 100, 300):
+                a, b = self.random_pol(S, n, 5), self.random_pol(S, n // 3, 3)
+                A, B = D(a.coefs), D(b.coefs)
+                self.assertTrue(a + b == A + B)
+                self.assertTrue(a - b == A - B)
+                self.assertTrue(-a == -A)
+                self.assertTrue(a*b == A*B)
+                self.assertTrue(A*b == A*B)
+                self.assertTrue(a**3 == A**3)
+                self.assertTrue((a*b).der() == (A*B).der())
+                self.assertEqual(a.eval(2), A.eval(2))
+                q, r = divmod(a, b)
+                self.assertTrue(q*b + r == a)
+                self.assertLess(r.deg(), b.deg())
+                q, r = divmod(A*A, b)
+                self.assertTrue(q*b + r == A*A)
+                self.assertLess(r.deg(), b.deg())
+
+    def testHashing(self):
+        for C in self.rings:
+            S = GetPolynomials(C, "x", sparse=True)
+            D = C["x"]
+            pols = [[1, 1], [0, 2, 0, 1], [C.zero], [1] + [0]*99 + [1]]
+            table = {D(cs): i for i,cs in enumerate(pols)}
+            for i,cs in enumerate(pols):
+                self.assertTrue(S(cs) == D(cs))
+                self.assertEqual(hash(S(cs)), hash(D(cs)))
+                self.assertEqual(S(cs).key(), D(cs).key())
+                self.assertEqual(table[S(cs)], i)
+            self.assertEqual(len(set(table) | {S(cs) for cs in pols}), len(pols))
+
+    def testQuotient(self):
+        n = 2000
+        for p in (2, 3):
+            S = GetPolynomials(Z/(p*Z), "x", sparse=True)
+            D = (Z/(p*Z))["x"]
+            f = S({n: 1, 3: 1, 0: p-1})
+            FS, FD = GetRingQuotient(S, S*f), GetRingQuotient(D, D*D(f))
+            a = [random.randrange(p) for _ in range(n)]
+            b = [random.randrange(p) for _ in range(n)]
+            self.assertEqual((FS(S(a))*FS(S(b))).val.ints, (FD(D(a))*FD(D(b))).val.ints)
+            x = FS(S([0, 1]))
+            self.assertEqual((x**(p**5)).val.ints, (FD(D([0, 1]))**(p**5)).val.ints)
+
+    def testAKS(self):
+        self.assertEqual([n for n in range(2, 60) if is_prime_aks(n)],
+                [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59])
+        self.assertTrue(is_prime_aks(1009))
+        self.assertFalse(is_prime_aks(1009*1013))
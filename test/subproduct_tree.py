@@ -0,0 +1,81 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.chinese_remainder import chinese_remainder
+from python_alcp.algorithms.subproduct_tree import (
+        SubproductTree,
+        fast_chinese_remainder,
+        interpolate,
+        multi_eval
+)
+from python_alcp.algorithms.zx_factorization import kronecker
+from python_alcp.examples.rings import Z
+from python_alcp.examples.more_rings import Q
+from python_alcp.examples.finite_fields import FiniteField
+
+
+class TestSubproductTree(TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def fields(self):
+        F9 = FiniteField(3, [2,1,1])
+        elems9 = [F9([a, b]) for a in range(3) for b in range(3)]
+        return [
+            (Z/(10007*Z), lambda: random.randrange(10007), [(Z/(10007*Z))(a) for a in range(300)]),
+            (Z/((2**61-1)*Z), lambda: random.randrange(2**61-1), [(Z/((2**61-1)*Z))(a) for a in range(40)]),
+            (Q, lambda: Q(random.randrange(-20, 20)), [Q(a) for a in range(-6, 7)]),
+            (F9, lambda: random.choice(elems9), elems9),
+        ]
+
+    def testMultiEval(self):
+        for K, coef, points in self.fields():
+            R = K["x"]
+            for k in (1, 2, 7, len(points)):
+                pts = random.sample(points, k)
+                for d in (1, 5, 2*k):
+                    f = R([coef() for _ in range(d)])
+                    if f != R.zero:
+                        self.assertEqual(multi_eval(f, pts), [f(a) for a in pts])
+                self.assertEqual(multi_eval(R.zero, pts), [K.zero]*k)
+            self.assertEqual(multi_eval(R.one, []), [])
+
+    def testInterpolate(self):
+        for K, coef, points in self.fields():
+            R = K["x"]
+            for k in (1, 2, 7, len(points)):
+                pts = random.sample(points, k)
+                f = R([coef() for _ in range(k)])
+                g = interpolate(pts, multi_eval(f, pts), R)
+                self.assertTrue(g == f)
+            tree = SubproductTree.from_points(points, R)
+            values = [K(coef()) for _ in points]
+            g = tree.interpolate(values)
+            self.assertLess(g.deg(), len(points))
+            self.assertEqual(tree.evaluate(g), values)
+        with self.assertRaises(AssertionError):
+            interpolate([Q(1), Q(1)], [Q(0), Q(1)])
+
+    def testChineseRemainder(self):
+        for K, coef, points in self.fields():
+            R = K["x"]
+            # Powers of distinct x - a are pairwise coprime
+            mods = [R([-a, K.one])**k for a,k in zip(points, (1, 1, 2, 1, 3, 2))]
+            eqs = [R([coef() for _ in range(7)]) for _ in mods]
+            x = fast_chinese_remainder(eqs, mods)
+            self.assertLess(x.deg(), 10)
+            for e,m in zip(eqs, mods):
+                self.assertTrue((x - e) % m == R.zero)
+            self.assertTrue(x == chinese_remainder(eqs, mods) % SubproductTree(mods).root)
+
+        R = (Z/(7*Z))["x"]
+        with self.assertRaises(ValueError):
+            fast_chinese_remainder([R.one, R.zero], [R([1, 1]), R([1, 2, 1])])
+
+    def testKronecker(self):
+        ZX = Z["x"]
+        f = ZX([1, 0, 1]) * ZX([-2, 0, 0, 1])
+        g = kronecker(f)
+        self.assertEqual(g.deg(), 2)
+        self.assertTrue(Q["x"](f) % g == Q["x"].zero)
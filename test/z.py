@@ -1,5 +1,5 @@
 from test.structures import TestRing, TestEuclideanDomain, TestField
-from test.polynomials import PolyTest
+from test.polynomials import PolyTest, PolyTestED
 from examples.rings import Z
 from structures.polynomials import GetPolynomials
 
@@ -49,3 +49,17 @@ class TestZX(PolyTest):
     buildOne = [[1]]
     buildTwo = [[2]]
     buildX = [[0,1]]
+
+class TestZ17X(PolyTestED):
+
+    ring = GetPolynomials(Z17)
+
+    buildZero = [[0]]
+    buildOne = [[1]]
+    buildTwo = [[2]]
+    buildX = [[0,1]]
+
+    x = ring.build([5,2,1,1])
+    q = ring.build([1,1])
+    d = ring.build([2,0,1])
+    r = ring.build([3])
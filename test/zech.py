@@ -0,0 +1,43 @@
+from unittest import TestCase
+import random
+
+from python_alcp.algorithms.discrete_log import discrete_log
+from python_alcp.examples.finite_fields import FiniteField
+
+
+class TestZechField(TestCase):
+
+    # Primitive polynomials
+    fields = [(2, [1,0,1,1,1,0,0,0,1]), (3, [2,1,0,0,1]), (5, [2,1,1])]
+
+    def testAgainstQuotient(self):
+        random.seed(0)
+        for p,pol in self.fields:
+            F = FiniteField(p, pol)
+            G = FiniteField(p, pol, table=True)
+            elems = list(G.elements())
+            self.assertEqual(len(set(elems)), G.order())
+            for _ in range(100):
+                a, b = random.choice(elems), random.choice(elems)
+                A, B = F(a.val), F(b.val)
+                self.assertEqual((a + b).val, (A + B).val)
+                self.assertEqual((a - b).val, (A - B).val)
+                self.assertEqual((a * b).val, (A * B).val)
+                self.assertEqual((-a).val, (-A).val)
+                self.assertEqual((a**5).val, (A**5).val)
+                self.assertEqual(G(A), a)
+                if a != G.zero:
+                    self.assertEqual((b / a).val, (B / A).val)
+                self.assertEqual(a.croot()**p, a)
+
+    def testConstants(self):
+        G = FiniteField(3, [2,1,0,0,1], table=True)
+        self.assertEqual(G(4), G.one)
+        self.assertEqual(G(3), G.zero)
+        self.assertEqual(G.one + G.one + G.one, G.zero)
+        self.assertEqual(G.generator()**80, G.one)
+        self.assertEqual(discrete_log(G.generator(), G.generator()**57), 57)
+
+    def testNotPrimitive(self):
+        # x^4 + x^3 + x^2 + x + 1 is irreducible, but x has order 5
+        self.assertRaises(AssertionError, FiniteField, 2, [1,1,1,1,1], table=True)